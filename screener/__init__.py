@@ -0,0 +1 @@
+# Shared building blocks for the sma*.py stock screeners
@@ -0,0 +1,149 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from screener.cache import fetch_panel_cached
+from screener.cli import read_universe
+from screener.crossover import cross_masks
+from screener.engine import align_right_order, sma
+
+# Backtest of the "buy on a golden cross" rule from the purchase log: buy at
+# the close of the session the 50DMA crosses above the 200DMA, sell at the
+# close of the next death cross, or mark the trade open at the last bar.
+# Signals come from the same sma() and cross_masks() the screener uses,
+# computed over the whole history of every ticker at once.
+
+TRADE_COLUMNS = ["Ticker", "Entry Date", "Entry Price", "Exit Date", "Exit Price", "Sessions",
+                 "Return", "Max Drawdown", "Open"]
+
+
+def _trade_drawdowns(prices, entry, exit_, col):
+    # Worst close-to-peak drop inside each trade.  All trades are laid end to
+    # end in one array and their log prices lifted by a per-trade step larger
+    # than any price range, so one running maximum restarts at every trade.
+    lengths = exit_ - entry + 1
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    trade = np.repeat(np.arange(len(entry)), lengths)
+    rows = np.arange(lengths.sum()) - starts[trade] + entry[trade]
+    logs = np.log(prices[rows, col[trade]])
+    step = np.ptp(logs) + 1.0
+    peaks = np.maximum.accumulate(logs + trade * step) - trade * step
+    return np.minimum.reduceat(np.expm1(logs - peaks), starts)
+
+
+def backtest(panel, field="Adj Close", fast=50, slow=200):
+    # Run the golden-cross rule over every ticker of a fetch_panel result.
+    # field falls back to Close when the panel has no adjusted closes; using
+    # adjusted closes keeps splits from showing up as crosses and losses.
+    # Returns (trades, tickers): one row per trade, and per-ticker counts,
+    # hit rate, average and compounded return, the worst drawdown of the
+    # strategy's equity and the buy-and-hold return for comparison.
+    if field not in panel.columns.get_level_values(0):
+        field = "Close"
+    close = panel[field]
+    prices, order = align_right_order(close.to_numpy(dtype=float))
+    n, k = prices.shape
+
+    masks = cross_masks(prices, sma(prices, fast), sma(prices, slow))
+    # Row t of a mask is a cross between bars t and t + 1; trade on bar t + 1
+    buys = np.zeros((n, k), dtype=bool)
+    sells = np.zeros((n, k), dtype=bool)
+    buys[1:] = masks["golden_cross"]
+    sells[1:] = masks["death_cross"]
+
+    # Index of the next death cross at or after every bar, n where none follows
+    rows = np.arange(n)[:, None]
+    next_sell = np.minimum.accumulate(np.where(sells, rows, n)[::-1], axis=0)[::-1]
+
+    col, entry = np.nonzero(buys.T)
+    exit_ = next_sell[entry, col]
+    still_open = exit_ == n
+    exit_ = np.where(still_open, n - 1, exit_)
+    # A golden cross while already holding (the averages touched and parted
+    # again) does not open a second position
+    first = np.ones(len(entry), dtype=bool)
+    first[1:] = (col[1:] != col[:-1]) | (exit_[1:] != exit_[:-1])
+    entry, exit_, col, still_open = entry[first], exit_[first], col[first], still_open[first]
+
+    entry_price = prices[entry, col]
+    exit_price = prices[exit_, col]
+    returns = exit_price / entry_price - 1
+    drawdowns = _trade_drawdowns(prices, entry, exit_, col) if len(entry) else np.array([])
+
+    dates = close.index
+    trades = pd.DataFrame({
+        "Ticker": close.columns[col],
+        "Entry Date": dates[order[entry, col]],
+        "Entry Price": entry_price,
+        "Exit Date": dates[order[exit_, col]],
+        "Exit Price": exit_price,
+        "Sessions": exit_ - entry,
+        "Return": returns,
+        "Max Drawdown": drawdowns,
+        "Open": still_open,
+    }, columns=TRADE_COLUMNS)
+
+    # Strategy equity: daily log returns while a position is held
+    held = np.zeros((n + 1, k), dtype=np.int64)
+    np.add.at(held, (entry + 1, col), 1)
+    np.add.at(held, (exit_ + 1, col), -1)
+    held = np.cumsum(held, axis=0)[:n] > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        daily = np.diff(np.log(prices), axis=0, prepend=np.nan)
+    equity = np.cumsum(np.where(held & ~np.isnan(daily), daily, 0.0), axis=0)
+    equity_drawdown = np.expm1(equity - np.maximum.accumulate(equity, axis=0)).min(axis=0)
+    first_price = prices[np.argmax(~np.isnan(prices), axis=0), np.arange(k)]
+
+    grouped = trades.assign(Win=returns > 0, Growth=np.log1p(returns)).groupby("Ticker", sort=False)
+    tickers = pd.DataFrame({
+        "Trades": grouped.size(),
+        "Hit Rate": grouped["Win"].mean(),
+        "Average Return": grouped["Return"].mean(),
+        "Total Return": np.expm1(grouped["Growth"].sum()),
+        "Worst Trade Drawdown": grouped["Max Drawdown"].min(),
+    }).reindex(close.columns)
+    tickers["Trades"] = tickers["Trades"].fillna(0).astype(int)
+    tickers["Max Drawdown"] = equity_drawdown
+    tickers["Buy and Hold Return"] = prices[-1] / first_price - 1
+    tickers.index.name = "Ticker"
+    return trades, tickers
+
+
+def summarize_trades(trades):
+    # Headline numbers over every closed trade
+    closed = trades[~trades["Open"]]
+    return {
+        "trades": len(trades),
+        "closed": len(closed),
+        "hit_rate": float((closed["Return"] > 0).mean()) if len(closed) else None,
+        "average_return": float(closed["Return"].mean()) if len(closed) else None,
+        "median_return": float(closed["Return"].median()) if len(closed) else None,
+        "worst_drawdown": float(trades["Max Drawdown"].min()) if len(trades) else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest buying on golden crosses")
+    parser.add_argument("--universe", default="stocks.txt", help="file with one ticker per line")
+    parser.add_argument("--period", default="max", help="history to test over (default: max)")
+    parser.add_argument("--fast", type=int, default=50, help="fast moving average (default: 50)")
+    parser.add_argument("--slow", type=int, default=200, help="slow moving average (default: 200)")
+    parser.add_argument("--trades", default="golden_cross_trades.csv", help="per-trade CSV output")
+    parser.add_argument("--tickers", default="golden_cross_tickers.csv", help="per-ticker CSV output")
+    args = parser.parse_args(argv)
+
+    panel = fetch_panel_cached(read_universe(args.universe), period=args.period)
+    if panel.empty:
+        print("Warning: no price data to backtest.")
+        return
+    trades, tickers = backtest(panel, fast=args.fast, slow=args.slow)
+    trades.to_csv(args.trades, index=False)
+    tickers.to_csv(args.tickers)
+    for name, value in summarize_trades(trades).items():
+        print(f"{name}: {value}")
+    print(f"Trades saved as {args.trades}, per-ticker results as {args.tickers}")
+
+
+if __name__ == "__main__":
+    main()
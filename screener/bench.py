@@ -0,0 +1,190 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from screener.cache import PriceCache, refresh_cache
+from screener.calendars import PUBLISH_DELAY, session_close
+from screener.cli import print_categories
+from screener.crossover import crossover_arrays
+from screener.engine import align_right, compute_indicators
+from screener.fetch import fetch_panel
+from screener.profiles import PROFILES
+from screener.summary import INDICATORS, SummaryBuffer, write_csv, write_xlsx
+from screener.synthetic import SyntheticProvider, generate_panel
+
+
+def _version():
+    # Commit the benchmark ran against, so reports from different versions can be compared
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _timed(func, repeat):
+    # Best wall time over repeat runs, and the result of the last one
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(tickers=100, years=1, repeat=3, seed=0, chunk_size=50, xlsx=True):
+    # Time each stage of the screening pipeline on a synthetic universe and
+    # return a JSON-serialisable report with seconds per stage
+    source = generate_panel(tickers, years, seed=seed)
+    stocks = list(dict.fromkeys(source.columns.get_level_values(1)))
+    stages = {}
+
+    stages["fetch"], panel = _timed(lambda: fetch_panel(stocks, provider=SyntheticProvider(source),
+                                                        chunk_size=chunk_size), repeat)
+
+    def indicators():
+        values = align_right(panel["Close"].reindex(columns=stocks).to_numpy(dtype=float))
+        return values, compute_indicators(values)
+    stages["indicators"], (values, computed) = _timed(indicators, repeat)
+
+    stages["crossovers"], crosses = _timed(
+        lambda: crossover_arrays(values, computed["50dma"], computed["200dma"]), repeat)
+
+    def rows():
+        records = SummaryBuffer(len(stocks))
+        records.extend(stocks, {name: computed[name][-1] for name in INDICATORS}, crosses)
+        return records
+    stages["rows"], records = _timed(rows, repeat)
+
+    def categorize():
+        with contextlib.redirect_stdout(io.StringIO()):
+            print_categories(records, PROFILES["sma11"])
+    stages["categorize"], _ = _timed(categorize, repeat)
+
+    rendered = records.rows()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        stages["csv"], _ = _timed(lambda: write_csv(rendered, os.path.join(tmp, "bench.csv")), repeat)
+        if xlsx:
+            stages["xlsx"], _ = _timed(lambda: write_xlsx(rendered, os.path.join(tmp, "bench.xlsx")), repeat)
+
+    return {
+        "version": _version(),
+        "timestamp": pd.Timestamp.now(tz="UTC").isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "tickers": len(stocks),
+        "years": years,
+        "sessions": len(source),
+        "repeat": repeat,
+        "stages": stages,
+        "total": sum(stages.values()),
+    }
+
+
+# Run in a fresh interpreter by startup_benchmark: a cached-only CSV run of
+# the sma23 profile, reporting how long the imports took and which of the
+# optional heavy modules got loaded
+_STARTUP_SCRIPT = """
+import contextlib, io, json, sys, time
+started = time.perf_counter()
+from screener.cli import run
+imported = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    run("sma23", "stocks.txt", formats=["csv"])
+print(json.dumps({"import": imported - started, "run": time.perf_counter() - imported,
+                  "loaded": [m for m in sys.argv[1:] if m in sys.modules]}))
+"""
+
+# Modules a cached-only CSV run should never import
+LAZY_MODULES = ["openpyxl", "yfinance", "pyarrow.parquet", "multiprocessing.shared_memory"]
+
+
+def startup_benchmark(tickers=100, repeat=5, seed=0):
+    # Time a cached-only CSV run from interpreter start, in a subprocess so
+    # every run pays for its imports.  The price cache is filled beforehand
+    # with synthetic bars ending today, so nothing is downloaded (no halts,
+    # since a ticker without today's bar would be requested again).
+    source = generate_panel(tickers, 1, seed=seed, halt_prob=0.0)
+    today = pd.Timestamp.today().normalize()
+    source.index = source.index + (today - source.index[-1])
+    stocks = list(dict.fromkeys(source.columns.get_level_values(1)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        [os.path.dirname(os.path.dirname(os.path.abspath(__file__))), os.environ.get("PYTHONPATH", "")]))
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "stocks.txt"), "w") as f:
+            f.write("".join(f"{t}\n" for t in stocks))
+        cache = PriceCache(os.path.join(tmp, "price_cache.sqlite"))
+        # As if fetched after today's close, so today's bar counts as final
+        fetched = (session_close(today) + PUBLISH_DELAY).tz_localize(None)
+        refresh_cache(stocks, cache=cache, provider=SyntheticProvider(source), today=fetched)
+        cache.close()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            out = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT, *LAZY_MODULES], cwd=tmp, env=env,
+                                 capture_output=True, text=True, check=True).stdout
+            runs.append(dict(json.loads(out.splitlines()[-1]), wall=time.perf_counter() - start))
+    best = min(runs, key=lambda r: r["wall"])
+    return {
+        "version": _version(),
+        "timestamp": pd.Timestamp.now(tz="UTC").isoformat(),
+        "python": platform.python_version(),
+        "tickers": len(stocks),
+        "repeat": repeat,
+        "wall": best["wall"],
+        "import": best["import"],
+        "run": best["run"],
+        "loaded": sorted({m for r in runs for m in r["loaded"]}),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the screener stages on synthetic data")
+    parser.add_argument("--tickers", type=int, nargs="+", default=[100], help="universe sizes to run")
+    parser.add_argument("--years", type=float, nargs="+", default=[1], help="history lengths to run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-xlsx", action="store_true", help="skip the (slow) Excel stage")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--startup", action="store_true",
+                        help="time a cached-only CSV run from interpreter start instead of the stages")
+    parser.add_argument("--startup-limit", type=float, default=2.0,
+                        help="with --startup, fail if the run takes longer than this many seconds")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        reports = [startup_benchmark(tickers, repeat=args.repeat, seed=args.seed) for tickers in args.tickers]
+    else:
+        reports = [run_benchmark(tickers, years, repeat=args.repeat, seed=args.seed, xlsx=not args.no_xlsx)
+                   for tickers in args.tickers for years in args.years]
+    text = json.dumps(reports, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    # Fail the run (for CI) when startup regressed: too slow, or a module
+    # that should load lazily was imported
+    if args.startup:
+        for report in reports:
+            if report["wall"] > args.startup_limit:
+                sys.exit(f"Startup took {report['wall']:.2f}s, over the {args.startup_limit}s limit")
+            if report["loaded"]:
+                sys.exit(f"Cached-only CSV run imported {', '.join(report['loaded'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import contextlib
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from screener.calendars import exchange_time, settled
+from screener.fetch import FIELDS, _combine, fetch_chunks, ticker_frames
+
+# Maps yfinance period strings to how far back from the latest bar they reach
+PERIOD_OFFSETS = {
+    "d": lambda n: pd.DateOffset(days=n),
+    "wk": lambda n: pd.DateOffset(weeks=n),
+    "mo": lambda n: pd.DateOffset(months=n),
+    "y": lambda n: pd.DateOffset(years=n),
+}
+
+COLUMNS = ["open", "high", "low", "close", "adj_close", "volume"]
+
+# Length of one bar for the intraday intervals Yahoo serves
+INTRADAY_STEPS = {
+    "1m": pd.Timedelta(minutes=1),
+    "2m": pd.Timedelta(minutes=2),
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+    "30m": pd.Timedelta(minutes=30),
+    "60m": pd.Timedelta(hours=1),
+    "90m": pd.Timedelta(minutes=90),
+    "1h": pd.Timedelta(hours=1),
+}
+
+
+def period_start(period, end):
+    # First date covered by a yfinance-style period ("1y", "6mo", ...) ending at end
+    if period == "max":
+        return None
+    for suffix, offset in PERIOD_OFFSETS.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return pd.Timestamp(end) - offset(int(period[:-len(suffix)]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def same_clock(now, stamp):
+    # now in a form that compares with stamp: naive bars are taken as UTC,
+    # and a naive now as being in the bars' own time zone
+    if stamp.tzinfo is None:
+        return now.tz_convert(None) if now.tzinfo is not None else now
+    return now.tz_localize(stamp.tzinfo) if now.tzinfo is None else now
+
+
+class PriceCache:
+    # SQLite store of OHLCV bars keyed by (ticker, interval, date)
+
+    def __init__(self, path="price_cache.sqlite"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS bars ("
+            " ticker TEXT NOT NULL, interval TEXT NOT NULL, date TEXT NOT NULL,"
+            " open REAL, high REAL, low REAL, close REAL, adj_close REAL, volume REAL,"
+            " PRIMARY KEY (ticker, interval, date))"
+        )
+        # Earliest date each ticker's history was requested from, so a
+        # longer lookback than the cache holds triggers a backfill
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS coverage ("
+            " ticker TEXT NOT NULL, interval TEXT NOT NULL, since TEXT NOT NULL,"
+            " PRIMARY KEY (ticker, interval))"
+        )
+        # When each ticker's bars were last downloaded, which tells whether
+        # its newest daily bar was taken before or after the session closed
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS fetches ("
+            " ticker TEXT NOT NULL, interval TEXT NOT NULL, fetched TEXT NOT NULL,"
+            " PRIMARY KEY (ticker, interval))"
+        )
+        self.batching = False
+
+    def close(self):
+        self.conn.close()
+
+    def _commit(self):
+        if not self.batching:
+            self.conn.commit()
+
+    @contextlib.contextmanager
+    def batch(self):
+        # Commit the writes made inside the block once, at the end, instead
+        # of after every store(); each commit is a sync to disk
+        outer = self.batching
+        self.batching = True
+        try:
+            yield self
+        finally:
+            self.batching = outer
+            self._commit()
+
+    def last_date(self, ticker, interval="1d"):
+        row = self.conn.execute(
+            "SELECT MAX(date) FROM bars WHERE ticker = ? AND interval = ?",
+            (ticker, interval),
+        ).fetchone()
+        return pd.Timestamp(row[0]) if row[0] else None
+
+    def dates(self, tickers, interval="1d"):
+        # Every date any of tickers has a bar on, in order
+        found = set()
+        tickers = list(tickers)
+        # SQLite limits the number of parameters per statement
+        for offset in range(0, len(tickers), 500):
+            chunk = tickers[offset:offset + 500]
+            found.update(r[0] for r in self.conn.execute(
+                f"SELECT DISTINCT date FROM bars WHERE interval = ? AND ticker IN ({', '.join('?' * len(chunk))})",
+                [interval, *chunk]))
+        return pd.DatetimeIndex(sorted(found), name="Date")
+
+    def covered_since(self, ticker, interval="1d"):
+        row = self.conn.execute(
+            "SELECT since FROM coverage WHERE ticker = ? AND interval = ?", (ticker, interval)
+        ).fetchone()
+        return pd.Timestamp(row[0]) if row else None
+
+    def set_coverage(self, ticker, interval, since):
+        self.conn.execute("INSERT OR REPLACE INTO coverage VALUES (?, ?, ?)",
+                          (ticker, interval, pd.Timestamp(since).isoformat()))
+        self._commit()
+
+    def fetched_at(self, ticker, interval="1d"):
+        row = self.conn.execute(
+            "SELECT fetched FROM fetches WHERE ticker = ? AND interval = ?", (ticker, interval)
+        ).fetchone()
+        return pd.Timestamp(row[0]) if row else None
+
+    def set_fetched(self, ticker, interval, fetched):
+        self.conn.execute("INSERT OR REPLACE INTO fetches VALUES (?, ?, ?)",
+                          (ticker, interval, exchange_time(fetched).isoformat()))
+        self._commit()
+
+    def settled_date(self, ticker, interval="1d"):
+        # Newest cached daily bar that is its session's final bar: the last
+        # one when it was fetched after the close (see calendars.settled),
+        # else the one before it.  None when there is no such bar.
+        last = self.last_date(ticker, interval)
+        if last is None or settled(last, self.fetched_at(ticker, interval)):
+            return last
+        row = self.conn.execute(
+            "SELECT MAX(date) FROM bars WHERE ticker = ? AND interval = ? AND date < ?",
+            (ticker, interval, last.isoformat()),
+        ).fetchone()
+        return pd.Timestamp(row[0]) if row[0] else None
+
+    def load(self, ticker, interval="1d", start=None):
+        query = f"SELECT date, {', '.join(COLUMNS)} FROM bars WHERE ticker = ? AND interval = ?"
+        params = [ticker, interval]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(pd.Timestamp(start).isoformat())
+        rows = self.conn.execute(query + " ORDER BY date", params).fetchall()
+        if not rows:
+            return pd.DataFrame()
+        dates = [r[0] for r in rows]
+        # Intraday bars carry their exchange's UTC offset, which changes with
+        # daylight saving, so those are read back in UTC
+        index = pd.DatetimeIndex(pd.to_datetime(dates, utc=len(dates[0]) > 19, format="ISO8601"), name="Date")
+        data = pd.DataFrame(np.array([r[1:] for r in rows], dtype=float), columns=FIELDS, index=index)
+        return data
+
+    def store(self, ticker, interval, data):
+        # Insert or overwrite the given bars; the newest cached bar may have
+        # been captured mid-session, so re-fetched dates replace what is stored
+        if data.empty:
+            return
+        values = data.reindex(columns=FIELDS).to_numpy(dtype=float)
+        cells = values.astype(object)
+        cells[np.isnan(values)] = None
+        rows = [(ticker, interval, date.isoformat(), *row) for date, row in zip(data.index, cells.tolist())]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self._commit()
+
+
+def refresh_cache(tickers, period="1y", interval="1d", cache=None, chunk_size=50,
+                  provider=None, today=None, start=None, session=None):
+    # Bring the cache up to date for tickers without downloading bars it
+    # already holds.  Uncached tickers get the full period (or everything
+    # from start, which replaces period); cached ones only request bars from
+    # their last stored date onwards, grouped so that tickers sharing a last
+    # date still go out in one batch.  A ticker whose cached history does not
+    # reach back far enough is downloaded in full again.  For intraday
+    # intervals today is the current time, and a ticker is stale once a bar
+    # after its last cached one could have started.  session is the date of
+    # the newest daily bar that can exist (see screener.calendars); when
+    # given, daily tickers that already hold it are not requested again.
+    # A daily bar downloaded before its session closed is only a snapshot,
+    # so it is requested again until a copy fetched after the close (and
+    # the publishing delay) is stored.
+    cache = cache or PriceCache()
+    fetched = exchange_time(today)
+    now = pd.Timestamp(today or pd.Timestamp.today())
+    step = INTRADAY_STEPS.get(interval)
+    today = now.normalize()
+    due = today if session is None else pd.Timestamp(session).normalize()
+    tickers = list(dict.fromkeys(tickers))
+    wanted = pd.Timestamp(start) if start is not None else period_start(period, today)
+    since = wanted if wanted is not None else pd.Timestamp.min
+
+    fresh = []
+    stale = {}
+    for ticker in tickers:
+        last = cache.last_date(ticker, interval)
+        covered = cache.covered_since(ticker, interval)
+        if last is None or covered is None or covered > since:
+            fresh.append(ticker)
+            continue
+        day = last.normalize()
+        if step is not None:
+            due_now = last + step <= same_clock(now, last)
+        else:
+            due_now = day < due or (day == due and not settled(day, cache.fetched_at(ticker, interval)))
+        if due_now:
+            # Requests start on a day boundary, so group by the day
+            stale.setdefault(day, []).append(ticker)
+
+    requests = []
+    if fresh:
+        requests.append((fresh, None if start is None else wanted.strftime("%Y-%m-%d")))
+    requests.extend((group, last.strftime("%Y-%m-%d")) for last, group in stale.items())
+    with cache.batch():
+        for ticker in fresh:
+            cache.set_coverage(ticker, interval, since)
+    # Each chunk is stored (and committed) as it arrives, so a first fill of
+    # a large universe never holds more than one chunk of bars in memory
+    for group, first in requests:
+        for panel in fetch_chunks(group, period=period, interval=interval, chunk_size=chunk_size,
+                                  provider=provider, start=first):
+            with cache.batch():
+                for ticker, data in ticker_frames(panel):
+                    cache.store(ticker, interval, data)
+                    cache.set_fetched(ticker, interval, fetched)
+    return cache
+
+
+def window_mask(dates, period="1y", start=None, end=None):
+    # Which of dates fall in the requested window: from start when given,
+    # else the period counted back from end (the newest bar)
+    if start is not None:
+        return dates >= pd.Timestamp(start)
+    first = period_start(period, end)
+    return dates > first if first is not None else np.ones(len(dates), dtype=bool)
+
+
+def fetch_panel_cached(tickers, period="1y", interval="1d", cache=None, chunk_size=50,
+                       provider=None, today=None, start=None, session=None):
+    # Same result as fetch_panel, but bars already in the cache are not
+    # downloaded again (see refresh_cache)
+    tickers = list(dict.fromkeys(tickers))
+    cache = refresh_cache(tickers, period, interval, cache, chunk_size, provider, today, start, session)
+
+    # Rebuild the requested window from the cache, anchored at the newest bar
+    frames = {t: cache.load(t, interval) for t in tickers}
+    frames = {t: f for t, f in frames.items() if not f.empty}
+    if not frames:
+        return pd.DataFrame()
+    end = max(f.index[-1] for f in frames.values())
+    pieces = [pd.concat({t: f[window_mask(f.index, period, start, end)]}, axis=1).swaplevel(axis=1)
+              for t, f in frames.items()]
+    return _combine(pieces, tickers)
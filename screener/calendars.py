@@ -0,0 +1,141 @@
+import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+# Offline NYSE/Nasdaq trading calendar: the exchange holiday rules and
+# early closes, so the screener can tell without asking the network whether
+# a new daily bar can exist yet.  Rules follow the NYSE holiday schedule
+# (Juneteenth from 2022; a Saturday holiday is observed on the Friday before
+# and a Sunday one on the Monday after, except that New Year's Day on a
+# Saturday is not made up).  One-off closures (national days of mourning,
+# 2012's Hurricane Sandy) are listed in CLOSURES.
+
+EXCHANGE_TZ = ZoneInfo("America/New_York")
+CLOSE = datetime.time(16, 0)
+EARLY_CLOSE = datetime.time(13, 0)
+# How long after the close a session's final daily bar can be relied on
+PUBLISH_DELAY = pd.Timedelta(minutes=30)
+
+# Unscheduled full-day closures since 2000
+CLOSURES = {
+    datetime.date(2001, 9, 11), datetime.date(2001, 9, 12), datetime.date(2001, 9, 13),
+    datetime.date(2001, 9, 14), datetime.date(2004, 6, 11), datetime.date(2007, 1, 2),
+    datetime.date(2012, 10, 29), datetime.date(2012, 10, 30), datetime.date(2018, 12, 5),
+    datetime.date(2025, 1, 9),
+}
+
+
+def _easter(year):
+    # Gregorian Easter Sunday (anonymous Gregorian algorithm)
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def _weekday(year, month, weekday, n):
+    # The n-th given weekday of a month (n=-1 for the last one)
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day):
+    if day.weekday() == 5:
+        return day - datetime.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + datetime.timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def holidays(year):
+    # Full-day exchange holidays of a year, as observed
+    days = {
+        _weekday(year, 1, 0, 3),                    # Martin Luther King Jr. Day
+        _weekday(year, 2, 0, 3),                    # Washington's Birthday
+        _easter(year) - datetime.timedelta(days=2),  # Good Friday
+        _weekday(year, 5, 0, -1),                   # Memorial Day
+        _observed(datetime.date(year, 7, 4)),       # Independence Day
+        _weekday(year, 9, 0, 1),                    # Labor Day
+        _weekday(year, 11, 3, 4),                   # Thanksgiving
+        _observed(datetime.date(year, 12, 25)),     # Christmas
+    }
+    if year >= 2022:
+        days.add(_observed(datetime.date(year, 6, 19)))  # Juneteenth
+    new_year = datetime.date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed(new_year))
+    return frozenset(days | {d for d in CLOSURES if d.year == year})
+
+
+@lru_cache(maxsize=None)
+def early_closes(year):
+    # 13:00 closes: the day before Independence Day, the day after
+    # Thanksgiving and Christmas Eve, when those are sessions
+    days = {_weekday(year, 11, 3, 4) + datetime.timedelta(days=1)}
+    july3, eve = datetime.date(year, 7, 3), datetime.date(year, 12, 24)
+    for day in (july3, eve):
+        if day.weekday() < 5:
+            days.add(day)
+    return frozenset(d for d in days if is_session(d))
+
+
+def is_session(day):
+    day = pd.Timestamp(day).date()
+    return day.weekday() < 5 and day not in holidays(day.year)
+
+
+def session_close(day):
+    # Closing time of a session, in the exchange's time zone
+    day = pd.Timestamp(day).date()
+    close = EARLY_CLOSE if day in early_closes(day.year) else CLOSE
+    return pd.Timestamp(datetime.datetime.combine(day, close), tz=EXCHANGE_TZ)
+
+
+def previous_session(day):
+    # The last session strictly before day
+    day = pd.Timestamp(day).date() - datetime.timedelta(days=1)
+    while not is_session(day):
+        day -= datetime.timedelta(days=1)
+    return pd.Timestamp(day)
+
+
+def exchange_time(now=None):
+    # now as an aware timestamp in exchange time, the current time when None;
+    # a naive now is taken as exchange time
+    now = pd.Timestamp.now(tz=EXCHANGE_TZ) if now is None else pd.Timestamp(now)
+    return now.tz_localize(EXCHANGE_TZ) if now.tzinfo is None else now.tz_convert(EXCHANGE_TZ)
+
+
+def settled(day, fetched, delay=PUBLISH_DELAY):
+    # Whether a daily bar for day that was fetched at fetched is the
+    # session's final bar rather than a snapshot taken while it traded
+    return fetched is not None and exchange_time(fetched) >= session_close(day) + delay
+
+
+def last_closed_session(now=None, delay=PUBLISH_DELAY):
+    # Date of the newest daily bar that can exist at now: today's once the
+    # session closed (plus delay for the final bar to be published), else
+    # the previous session's.  A naive now is taken as exchange time.
+    now = exchange_time(now)
+    today = pd.Timestamp(now.date())
+    if is_session(today) and now >= session_close(today) + delay:
+        return today
+    return previous_session(today)
+
+
+def sessions(start, end):
+    # Every session from start to end, inclusive
+    days = pd.bdate_range(start, end)
+    return days[[is_session(d) for d in days]]
@@ -0,0 +1,267 @@
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from screener.cache import fetch_panel_cached, refresh_cache
+from screener.fetch import fetch_panel
+from screener.instrument import RunStats, profiled, stage
+from screener.memo import MEMO_FILE, ResultCache
+from screener.planner import EMA_TOLERANCE, plan_bars, plan_start, trim_bars
+from screener.profiles import CATEGORIES, CROSSED_CATEGORIES, DERIVED_COLUMNS, PROFILES
+from screener.query import Screen, evaluate, load_screens
+from screener.store import ColumnStore, store_from_cache, summarize_store
+from screener.state import STATE_FILE, advance_states, summarize_states
+from screener.summary import (COLUMNS, SummaryBuffer, _blank_uncomputed, summarize_panel, write_columnar,
+                              write_csv, write_xlsx)
+
+# Output file used for a format the profile does not write itself
+DEFAULT_FILES = {
+    "csv": "stocks_summary.csv",
+    "xlsx": "stocks_summary.xlsx",
+    "parquet": "stocks_summary.parquet",
+}
+
+
+def read_universe(stocks_file):
+    # Read stock tickers from the provided file, one per line
+    with open(stocks_file, 'r') as f:
+        return [line.strip() for line in f.read().splitlines() if line.strip()]
+
+
+def categorize(records, profile, window=15, screens=None):
+    # The profile's categories, then any extra screens ({title: expression}),
+    # as a list of (title, lines).  Every mask is evaluated over the
+    # SummaryBuffer in one pass.
+    screens = screens or {}
+    keys = [key for key in profile["categories"] if key in CATEGORIES]
+    masks = evaluate({**{key: CATEGORIES[key][1] for key in keys},
+                      **{("screen", title): screen for title, screen in screens.items()}}, records, window)
+    symbols = records["Symbol"]
+    placed = set()
+    categories = []
+    for key in profile["categories"]:
+        if key in CATEGORIES:
+            title = CATEGORIES[key][0]
+            stocks = [s for s, hit in zip(symbols, masks[key]) if hit and s not in placed]
+            if profile["exclusive"]:
+                placed.update(stocks)
+            if profile["reverse_symbols"]:
+                stocks = sorted(stocks, reverse=True)
+            lines = stocks
+        else:
+            title, column, label = CROSSED_CATEGORIES[key]
+            title = title.format(window=window)
+            crossed = [(s, n) for s, n in zip(symbols, records[column].tolist()) if n >= 0]
+            if profile["crossed_order"]:
+                crossed.sort(key=lambda x: x[1], reverse=profile["crossed_order"] == "desc")
+            lines = [s if key in profile["bare_crossed"] else f"{s} - {label} {n} trading sessions ago"
+                     for s, n in crossed]
+        categories.append((title, lines))
+
+    for title in screens:
+        categories.append((title, [s for s, hit in zip(symbols, masks[("screen", title)]) if hit]))
+    return categories
+
+
+def print_categories(records, profile, window=15, screens=None):
+    # Output the categorized stocks to the console (screen)
+    categories = categorize(records, profile, window, screens)
+    for k, (title, lines) in enumerate(categories):
+        # Extra screens are always printed, even when empty
+        if not lines and profile["empty_message"] and k < len(categories) - len(screens or {}):
+            print(f"No stocks are {title[len('Stocks '):]}.")
+            continue
+        print(f"\n{title}:")
+        for line in lines:
+            print(line)
+
+
+def write_outputs(records, profile, formats=None, window=15):
+    # Write each output file of the profile, or the given formats, from a
+    # SummaryBuffer
+    outputs = dict(profile["outputs"])
+    if formats is not None:
+        outputs = {fmt: outputs.get(fmt, (DEFAULT_FILES[fmt], None)) for fmt in formats}
+
+    def header(columns):
+        return [c.replace("Last 15 Sessions", f"Last {window} Sessions") for c in columns]
+
+    for fmt, (path, columns) in outputs.items():
+        columns = columns or COLUMNS
+        derived = evaluate({name: DERIVED_COLUMNS[name] for name in columns if name in DERIVED_COLUMNS},
+                           records, window)
+        extra = {name: np.where(mask, "Yes", "No").tolist() for name, mask in derived.items()}
+        if fmt == "parquet":
+            table = records.table()
+            for name, values in extra.items():
+                table[name] = values
+            write_columnar(table[columns].set_axis(header(columns), axis=1), path)
+        elif fmt == "csv":
+            write_csv(records.rows(columns, extra), path, header(columns))
+        elif fmt == "xlsx":
+            write_xlsx(records.rows(columns, extra), path, header(columns))
+
+
+def eligible(stocks, counts, min_bars):
+    # Skip tickers without data, or with fewer bars than the profile needs
+    screened = []
+    for stock in stocks:
+        bars = int(counts.get(stock, 0))
+        if bars == 0:
+            print(f"Warning: No data available for {stock}. Skipping...")
+        elif bars < min_bars:
+            print(f"Skipping stock {stock} due to insufficient data.")
+        else:
+            screened.append(stock)
+    return screened
+
+
+def _fill_store(directory, stocks, period, interval, start, cache, provider):
+    # Download into a ColumnStore; through the price cache this goes one
+    # ticker at a time, so the universe is never one in-memory panel, and a
+    # store left by an earlier run only takes the bars added since
+    start = None if start is None else start.strftime("%Y-%m-%d")
+    if cache:
+        prices = refresh_cache(stocks, period=period, interval=interval, provider=provider, start=start)
+        return store_from_cache(prices, stocks, directory, period=period, interval=interval, start=start)
+    panel = fetch_panel(stocks, period=period, interval=interval, provider=provider, start=start)
+    return ColumnStore.write(directory, panel)
+
+
+def run(profile="sma23", universe="stocks.txt", period=None, interval="1d", window=15,
+        indicators=None, formats=None, cache=True, provider=None, stats=None, ema_tol=EMA_TOLERANCE,
+        workers=1, store=None, screens=None, memo=None, state=None):
+    # Run one screener profile end to end and return its typed summary table.
+    # period="auto" fetches just the bars the indicators need (see
+    # screener.planner) instead of a fixed lookback.  store is a directory
+    # for a screener.store.ColumnStore: the history is written there and
+    # screened in blocks instead of being held as one panel.  stats is an
+    # optional screener.instrument.RunStats that records the time spent in
+    # each stage.  screens is an optional {title: expression} mapping of
+    # extra screens (see screener.query) printed after the categories.
+    # memo is a screener.memo.ResultCache or the path of one: rows of
+    # tickers whose bars and settings a run already saw are reused from it
+    # (panel runs only, not store ones).  state is the path of a saved
+    # screener.state file: each ticker's indicators are advanced with only
+    # the daily bars that closed since the last run instead of being
+    # recomputed from the whole period.
+    settings = PROFILES[profile]
+    period = period or settings["period"]
+    indicators = settings["indicators"] if indicators is None else indicators
+    stocks = read_universe(universe)
+    # Compile the screens first so a typo fails before anything is downloaded
+    screens = {title: Screen(e) if isinstance(e, str) else e for title, e in (screens or {}).items()}
+    if state is not None and (interval != "1d" or period == "auto" or store is not None):
+        raise ValueError("Saved indicator state needs daily bars, a fixed --period and no --store")
+
+    if state is not None:
+        with stage(stats, "download"):
+            states = advance_states(stocks, period, state, window, provider=provider)
+        screened = eligible(stocks, {s: states[s].sma50.count for s in states}, settings["min_bars"])
+        with stage(stats, "rows"):
+            records = SummaryBuffer.from_rows(summarize_states(states, screened, window))
+            if indicators is not None:
+                _blank_uncomputed(records.records, set(indicators) | {'50dma', '200dma'})
+        return _finish(records, settings, formats, window, screens, stats)
+
+    planned = start = None
+    if period == "auto":
+        planned, needs = plan_bars(indicators, window, ema_tol, settings["min_bars"])
+        start = plan_start(planned)
+        print(f"Fetching {planned} bars per ticker from {start:%Y-%m-%d} "
+              f"({', '.join(f'{k}: {v}' for k, v in needs.items())})")
+
+    if store is not None:
+        with stage(stats, "download"):
+            history = _fill_store(store, stocks, period, interval, start, cache, provider)
+        counts = history.counts([s for s in stocks if s in history.index])
+        if planned is not None:
+            counts = counts.clip(upper=planned)
+    else:
+        fetch = fetch_panel_cached if cache else fetch_panel
+        with stage(stats, "download"):
+            if start is None:
+                panel = fetch(stocks, period=period, interval=interval, provider=provider)
+            else:
+                panel = trim_bars(fetch(stocks, interval=interval, provider=provider,
+                                        start=start.strftime("%Y-%m-%d")), planned)
+        counts = panel["Close"].notna().sum() if not panel.empty else {}
+
+    screened = eligible(stocks, counts, settings["min_bars"])
+
+    if store is not None:
+        records = summarize_store(history, screened, window=window, indicators=indicators, bars=planned,
+                                  stats=stats)
+    else:
+        results = ResultCache(memo) if isinstance(memo, str) else memo
+        records = summarize_panel(panel, screened, window=window, indicators=indicators, stats=stats,
+                                  workers=workers, memo=results)
+        if results is not None:
+            results.report("summary rows")
+            if results is not memo:
+                results.close()
+    return _finish(records, settings, formats, window, screens, stats)
+
+
+def _finish(records, settings, formats, window, screens, stats):
+    # Print and write a run's summary and return its typed table
+    table = records.table()
+    with stage(stats, "categorize"):
+        print_categories(records, settings, window, screens)
+    with stage(stats, "export"):
+        write_outputs(records, settings, formats, window)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen stocks against their moving averages")
+    parser.add_argument("--profile", default="sma23", choices=sorted(PROFILES),
+                        help="which historical sma*.py script to reproduce (default: sma23)")
+    parser.add_argument("--universe", default="stocks.txt", help="file with one ticker per line")
+    parser.add_argument("--period", help="lookback such as 1y or 2y, or auto to fetch only the bars "
+                                         "the indicators need (default: the profile's)")
+    parser.add_argument("--interval", default="1d", help="bar interval (default: 1d)")
+    parser.add_argument("--window", type=int, default=15, help="crossover lookback in sessions")
+    parser.add_argument("--ema-tol", type=float, default=EMA_TOLERANCE,
+                        help="with --period auto, weight an EMA's seed bar may keep (default: 1e-3)")
+    parser.add_argument("--indicators", help="comma-separated indicators, e.g. 50dma,200dma,RSI")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for the indicator stages on large universes (default: 1)")
+    parser.add_argument("--store", metavar="DIR",
+                        help="keep the history in a memory-mapped column store in DIR and screen it in blocks")
+    parser.add_argument("--screen", action="append", default=[], metavar="EXPR",
+                        help='extra screen to print, e.g. "oversold: price > 50dma & rsi < 30"; repeatable')
+    parser.add_argument("--screens", metavar="FILE", help='file of "name: expression" screens, one per line')
+    parser.add_argument("--memo", nargs="?", const=MEMO_FILE, metavar="PATH",
+                        help=f"reuse summary rows of unchanged tickers from a result cache (default: {MEMO_FILE})")
+    parser.add_argument("--state", nargs="?", const=STATE_FILE, metavar="PATH",
+                        help="advance saved per-ticker indicator state with only the new daily bars "
+                             f"(default: {STATE_FILE})")
+    parser.add_argument("--formats", help="comma-separated outputs: csv,xlsx,parquet")
+    parser.add_argument("--no-cache", action="store_true", help="download everything, skip the price cache")
+    parser.add_argument("--stats", nargs="?", const="-", metavar="JSON",
+                        help="print per-stage timings, and write them to JSON if a path is given")
+    parser.add_argument("--trace-memory", action="store_true", help="also record peak memory per stage")
+    parser.add_argument("--cprofile", metavar="PATH", help="dump cProfile/pstats data for the run to PATH")
+    args = parser.parse_args(argv)
+
+    screens = load_screens(args.screens) if args.screens else {}
+    for line in args.screen:
+        title, _, expression = line.partition(":") if ":" in line else (line, "", line)
+        screens[title.strip()] = Screen(expression.strip())
+
+    stats = RunStats(trace_memory=args.trace_memory) if args.stats or args.trace_memory else None
+    with profiled(args.cprofile):
+        run(profile=args.profile, universe=args.universe, period=args.period, interval=args.interval,
+            window=args.window, ema_tol=args.ema_tol,
+            indicators=args.indicators.split(",") if args.indicators else None,
+            formats=args.formats.split(",") if args.formats else None,
+            cache=not args.no_cache, stats=stats, workers=args.workers,
+            store=args.store, screens=screens, memo=args.memo, state=args.state)
+    if stats is not None:
+        if args.trace_memory:
+            tracemalloc.stop()
+        stats.report()
+        if args.stats and args.stats != "-":
+            stats.write_json(args.stats)
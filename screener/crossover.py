@@ -0,0 +1,64 @@
+import numpy as np
+
+
+def _sessions_ago(mask, first=False):
+    # mask is (sessions, tickers) with True where a cross happened between a
+    # bar and the one before it; the last row is the latest session.  Returns
+    # how many sessions ago the most recent cross happened (or the earliest
+    # one in the window when first=True), and -1 where there was none.
+    m = mask.shape[0]
+    if first:
+        ago = m - 1 - np.argmax(mask, axis=0)
+    else:
+        ago = np.argmax(mask[::-1], axis=0)
+    return np.where(mask.any(axis=0), ago, -1)
+
+
+def sign_crosses(a, b, inclusive=False):
+    # Row t of each mask is True when a crossed above (up) or below (down) b
+    # between bars t and t + 1.  inclusive also counts leaving a tie, as the
+    # golden/death cross checks always have.
+    #
+    # Comparisons are done on the sign of the differences, which matches the
+    # original pairwise < / > / <= checks exactly: a - b is negative, zero or
+    # positive exactly when a < b, a == b or a > b, and NaN compares False.
+    s = np.sign(np.asarray(a, dtype=float) - np.asarray(b, dtype=float))
+    before, after = s[:-1], s[1:]
+    if inclusive:
+        return (before <= 0) & (after > 0), (before >= 0) & (after < 0)
+    return (before < 0) & (after > 0), (before > 0) & (after < 0)
+
+
+def cross_masks(close, dma50, dma200):
+    # Where each kind of cross happened over 2-D (dates, tickers) arrays:
+    # row t is True when the cross happened between bar t and bar t + 1
+    golden, death = sign_crosses(dma50, dma200, inclusive=True)
+    above_50, below_50 = sign_crosses(close, dma50)
+    above_200, below_200 = sign_crosses(close, dma200)
+    return {
+        "golden_cross": golden,
+        "death_cross": death,
+        "above_50dma": above_50,
+        "above_200dma": above_200,
+        "below_50dma": below_50,
+        "below_200dma": below_200,
+    }
+
+
+def crossover_arrays(close, dma50, dma200, window=15):
+    # Vectorized scan of the last `window` sessions over 2-D (dates, tickers)
+    # arrays.  Each result is an int array of sessions-ago per ticker, -1 when
+    # no cross happened in the window.
+    masks = cross_masks(*(np.asarray(a, dtype=float)[-(window + 1):] for a in (close, dma50, dma200)))
+    # The golden and death cross report the earliest cross in the window,
+    # the price crosses the most recent one, as the sma*.py loops always have
+    return {name: _sessions_ago(mask, first=name in ("golden_cross", "death_cross"))
+            for name, mask in masks.items()}
+
+
+def crossovers(close, dma50, dma200, window=15):
+    # Single-ticker form of crossover_arrays: takes 1-D series and returns
+    # sessions-ago as an int, or None when there was no cross in the window
+    columns = [np.asarray(a, dtype=float).reshape(len(a), -1)[:, :1] for a in (close, dma50, dma200)]
+    result = crossover_arrays(*columns, window=window)
+    return {name: int(ago[0]) if ago[0] >= 0 else None for name, ago in result.items()}
@@ -0,0 +1,239 @@
+import argparse
+import json
+import math
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from screener.cache import PriceCache, fetch_panel_cached, refresh_cache, window_mask
+from screener.cli import categorize, eligible, read_universe, write_outputs
+from screener.fetch import _combine, ticker_frames
+from screener.profiles import PROFILES
+from screener.query import Screen
+from screener.summary import COLUMNS, summarize_panel
+
+# Resident screener: the price panel and the latest summary stay in memory,
+# a background thread refreshes them on a schedule (downloading only new
+# bars through the price cache), and a small HTTP server on localhost
+# answers queries against the current summary without any startup cost:
+#
+#   GET  /status                 profile, tickers, last bar and refresh time
+#   GET  /summary                the stocks_summary rows as JSON
+#   GET  /categories             the profile's categories
+#   GET  /screen?q=<expression>  tickers matching a screener.query expression
+#   POST /refresh                refresh now instead of waiting for the schedule
+
+DEFAULT_PORT = 8023
+
+
+@lru_cache(maxsize=256)
+def _compiled(expression):
+    # Repeated queries skip parsing and checking the expression again
+    return Screen(expression)
+
+
+def _json_value(value):
+    # JSON has no NaN; missing values go out as null
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class ScreenerService:
+
+    def __init__(self, profile="sma23", universe="stocks.txt", period=None, interval="1d", window=15,
+                 cache_path="price_cache.sqlite", provider=None, write=True):
+        self.settings = PROFILES[profile]
+        self.profile = profile
+        self.universe = universe
+        self.period = period or self.settings["period"]
+        if self.period == "auto":
+            raise ValueError("The service needs a fixed --period, not auto")
+        self.interval = interval
+        self.window = window
+        self.cache_path = cache_path
+        self.provider = provider
+        self.write = write
+        self.panel = None
+        self.stocks = []
+        # Everything a query reads, replaced as a whole by each refresh so
+        # readers never see a half-updated summary
+        self.snapshot = None
+        self.lock = threading.Lock()
+
+    def _extend(self, cache, stocks):
+        # Append to each ticker's bars in the panel the ones cached from its
+        # own last bar on; that bar is read again since it may have been
+        # mid-session.  Tickers the panel does not hold yet (no data at the
+        # last load) are read from the cache in full.
+        held = dict(ticker_frames(self.panel))
+        pieces = []
+        for ticker in stocks:
+            frame = held.get(ticker)
+            if frame is None or frame.empty:
+                frame = cache.load(ticker, self.interval)
+            else:
+                last = frame.index[-1]
+                tail = cache.load(ticker, self.interval, start=last)
+                if not tail.empty:
+                    frame = pd.concat([frame[frame.index < last], tail])
+            if not frame.empty:
+                pieces.append(pd.concat({ticker: frame}, axis=1).swaplevel(axis=1))
+        panel = _combine(pieces, stocks)
+        if panel.empty:
+            return panel
+        return panel[window_mask(panel.index, self.period, None, panel.index[-1])]
+
+    def refresh(self):
+        # Bring the panel up to date and recompute the summary.  The universe
+        # file is read again, so tickers can be added without a restart.
+        with self.lock:
+            started = time.perf_counter()
+            stocks = read_universe(self.universe)
+            cache = PriceCache(self.cache_path)
+            try:
+                if self.panel is None or self.panel.empty or stocks != self.stocks:
+                    panel = fetch_panel_cached(stocks, period=self.period, interval=self.interval,
+                                               cache=cache, provider=self.provider)
+                else:
+                    refresh_cache(stocks, period=self.period, interval=self.interval, cache=cache,
+                                  provider=self.provider)
+                    panel = self._extend(cache, stocks)
+            finally:
+                cache.close()
+            self.panel, self.stocks = panel, stocks
+
+            counts = panel["Close"].notna().sum() if not panel.empty else {}
+            screened = eligible(stocks, counts, self.settings["min_bars"])
+            records = summarize_panel(panel, screened, window=self.window, indicators=self.settings["indicators"])
+            if self.write:
+                write_outputs(records, self.settings, window=self.window)
+            self.snapshot = {
+                "records": records,
+                "categories": categorize(records, self.settings, self.window),
+                "last_bar": None if panel.empty else panel.index[-1].isoformat(),
+                "refreshed": pd.Timestamp.now(tz="UTC").isoformat(),
+                "seconds": time.perf_counter() - started,
+            }
+            return self.status()
+
+    def status(self):
+        snapshot = self.snapshot or {}
+        return {
+            "profile": self.profile,
+            "tickers": len(snapshot["records"]) if snapshot else 0,
+            "last_bar": snapshot.get("last_bar"),
+            "refreshed": snapshot.get("refreshed"),
+            "refresh_seconds": snapshot.get("seconds"),
+        }
+
+    def summary(self, columns=COLUMNS):
+        records = self.snapshot["records"]
+        return {"columns": list(columns),
+                "rows": [[_json_value(v) for v in row] for row in records.rows(columns)]}
+
+    def categories(self):
+        return [{"title": title, "stocks": lines} for title, lines in self.snapshot["categories"]]
+
+    def screen(self, expression):
+        records = self.snapshot["records"]
+        mask = _compiled(expression)(records, self.window)
+        return {"screen": expression, "stocks": [s for s, hit in zip(records["Symbol"], mask) if hit]}
+
+    def run_schedule(self, every, stop):
+        # Refresh every `every` seconds until stop is set
+        while not stop.wait(every):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Warning: scheduled refresh failed: {e}")
+
+
+def _handler(service):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _send(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            try:
+                if url.path == "/status":
+                    self._send(200, service.status())
+                elif service.snapshot is None:
+                    self._send(503, {"error": "no data yet"})
+                elif url.path == "/summary":
+                    self._send(200, service.summary())
+                elif url.path == "/categories":
+                    self._send(200, service.categories())
+                elif url.path == "/screen" and "q" in query:
+                    self._send(200, service.screen(query["q"][0]))
+                else:
+                    self._send(404, {"error": f"unknown request {url.path}"})
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/refresh":
+                self._send(404, {"error": f"unknown request {self.path}"})
+                return
+            try:
+                self._send(200, service.refresh())
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(service, host="127.0.0.1", port=DEFAULT_PORT, every=900):
+    # Load the universe once, then answer queries until interrupted
+    service.refresh()
+    stop = threading.Event()
+    threading.Thread(target=service.run_schedule, args=(every, stop), daemon=True).start()
+    server = ThreadingHTTPServer((host, port), _handler(service))
+    print(f"Serving {service.profile} on http://{host}:{server.server_address[1]}, refreshing every {every}s")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep the screener warm and answer queries over HTTP")
+    parser.add_argument("--profile", default="sma23", choices=sorted(PROFILES),
+                        help="categories, columns and outputs to use (default: sma23)")
+    parser.add_argument("--universe", default="stocks.txt", help="file with one ticker per line")
+    parser.add_argument("--period", help="lookback such as 1y (default: the profile's)")
+    parser.add_argument("--interval", default="1d", help="bar interval (default: 1d)")
+    parser.add_argument("--window", type=int, default=15, help="crossover lookback in sessions")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--every", type=float, default=900, help="seconds between refreshes (default: 900)")
+    parser.add_argument("--no-write", action="store_true", help="do not rewrite the output files on refresh")
+    args = parser.parse_args(argv)
+    service = ScreenerService(args.profile, args.universe, args.period, args.interval, args.window,
+                              write=not args.no_write)
+    serve(service, args.host, args.port, args.every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import numpy as np
+
+
+def align_right(values):
+    # Pack each column's valid values against the bottom of the matrix, so
+    # that the last row holds every ticker's latest bar and gaps (halts,
+    # tickers listed later, the union of trading calendars) only appear as
+    # leading NaNs.  This gives every column the same bar sequence the
+    # per-ticker code sees after dropna().
+    return align_right_order(values)[0]
+
+
+def align_right_order(values):
+    # align_right, also returning which row of values each aligned bar came
+    # from, for mapping aligned rows back to dates
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    # Stable sort moves the NaNs to the top and keeps bar order
+    order = np.argsort(valid, axis=0, kind="stable")
+    return np.take_along_axis(values, order, axis=0), order
+
+
+def _first_valid(values, fallback=np.nan):
+    valid = ~np.isnan(values)
+    first = values[np.argmax(valid, axis=0), np.arange(values.shape[1])]
+    return np.where(valid.any(axis=0), first, fallback)
+
+
+def prefix_sums(values):
+    # Prefix sums and counts of the non-NaN values, which every SMA window
+    # over the same matrix can share.  Each column is shifted by its first
+    # value before summing, which keeps the sums small and the means within
+    # a few ulps of pandas; the sweep uses them to try many windows at once,
+    # while sma() and rsi() follow pandas exactly.
+    values = np.asarray(values, dtype=float)
+    offset = _first_valid(values, fallback=0.0)
+    shifted = values - offset
+    valid = ~np.isnan(shifted)
+    return np.cumsum(np.where(valid, shifted, 0.0), axis=0), np.cumsum(valid, axis=0), offset
+
+
+def sma_from_prefix(prefix, window, min_periods=None):
+    # sma() for one window from the result of prefix_sums()
+    min_periods = window if min_periods is None else min_periods
+    sums, counts, offset = prefix
+    sums, counts = sums.copy(), counts.copy()
+    sums[window:] = sums[window:] - prefix[0][:-window]
+    counts[window:] = counts[window:] - prefix[1][:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / counts + offset
+    return np.where(counts >= min_periods, mean, np.nan)
+
+
+def rolling_mean(values, window, min_periods=None):
+    # Series.rolling(window, min_periods).mean() on each column, digit for
+    # digit: one pass over the dates, vectorized across tickers, keeping
+    # pandas' running sum with its separate Kahan compensations for the
+    # values entering and leaving the window, its count of negatives and
+    # its run of repeated values.
+    values = np.asarray(values, dtype=float)
+    min_periods = window if min_periods is None else min_periods
+    n, k = values.shape
+    valid = ~np.isnan(values)
+    negative = valid & np.signbit(values)
+    out = np.empty_like(values)
+    total, added, removed = np.zeros(k), np.zeros(k), np.zeros(k)
+    count, negatives, repeats = np.zeros(k, dtype=np.int64), np.zeros(k, dtype=np.int64), np.zeros(k, dtype=np.int64)
+    previous = values[0].copy() if n else np.zeros(k)
+    for t in range(n):
+        if t >= window:
+            leaving, mask = values[t - window], valid[t - window]
+            y = -leaving - removed
+            s = total + y
+            removed = np.where(mask, s - total - y, removed)
+            total = np.where(mask, s, total)
+            count -= mask
+            negatives -= negative[t - window]
+        value, mask = values[t], valid[t]
+        y = value - added
+        s = total + y
+        added = np.where(mask, s - total - y, added)
+        total = np.where(mask, s, total)
+        count += mask
+        negatives += negative[t]
+        repeats = np.where(mask, np.where(value == previous, repeats + 1, 1), repeats)
+        previous = np.where(mask, value, previous)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+        # A run of one value gives that value back; an all-positive or
+        # all-negative window cannot round to the other sign
+        wrong_sign = ((negatives == 0) & (mean < 0)) | ((negatives == count) & (mean > 0))
+        mean = np.where(repeats >= count, previous, np.where(wrong_sign, 0.0, mean))
+        out[t] = np.where((count >= min_periods) & (count > 0), mean, np.nan)
+    return out
+
+
+def sma(values, window, min_periods=None):
+    # Same as Series.rolling(window, min_periods).mean() on each column
+    return rolling_mean(values, window, min_periods)
+
+
+def ema(values, span):
+    # Same as Series.ewm(span=span, adjust=False).mean() on each column: one
+    # recursion over the dates, vectorized across tickers.  The update is
+    # written the way pandas computes it so results match it exactly.
+    values = np.asarray(values, dtype=float)
+    alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+    old_wt = 1.0 - alpha
+    norm = old_wt + alpha
+    out = np.empty_like(values)
+    weighted = values[0].copy()
+    out[0] = weighted
+    for t in range(1, len(values)):
+        cur = values[t]
+        update = (old_wt * weighted + alpha * cur) / norm
+        weighted = np.where(np.isnan(weighted), cur,
+                            np.where(np.isnan(cur) | (weighted == cur), weighted, update))
+        out[t] = weighted
+    return out
+
+
+def macd(values, fastperiod=12, slowperiod=26, signalperiod=9):
+    line = ema(values, fastperiod) - ema(values, slowperiod)
+    return line, ema(line, signalperiod)
+
+
+def rsi_prefix(values):
+    # Prefix sums of the gains and losses, shared by every RSI period
+    values = np.asarray(values, dtype=float)
+    delta = np.diff(values, axis=0, prepend=np.nan)
+    valid = ~np.isnan(values)
+    gain = np.where(valid, np.where(delta > 0, delta, 0.0), np.nan)
+    loss = np.where(valid, np.where(delta < 0, -delta, 0.0), np.nan)
+    return prefix_sums(gain), prefix_sums(loss)
+
+
+def rsi_from_prefix(prefix, period=14):
+    avg_gain = sma_from_prefix(prefix[0], period, min_periods=1)
+    avg_loss = sma_from_prefix(prefix[1], period, min_periods=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def rsi(values, period=14):
+    # Same as calculate_rsi: rolling means of gains and losses with
+    # min_periods=1, skipping the NaN padding in front of each column.
+    # Losses are negated the way calculate_rsi does it, so a bar that did
+    # not fall has a loss of -0.0 and the rolling means count the same signs.
+    values = np.asarray(values, dtype=float)
+    delta = np.diff(values, axis=0, prepend=np.nan)
+    valid = ~np.isnan(values)
+    gain = np.where(valid, np.where(delta > 0, delta, 0.0), np.nan)
+    loss = np.where(valid, -np.where(delta < 0, delta, 0.0), np.nan)
+    avg_gain = rolling_mean(gain, period, min_periods=1)
+    avg_loss = rolling_mean(loss, period, min_periods=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def compute_indicators(close, names=None):
+    # Every column the summary needs, for a right-aligned (dates, tickers)
+    # close matrix, in a handful of whole-matrix operations.  names limits
+    # the result to a subset of the columns and skips the work for the rest.
+    builders = {
+        "50dma": lambda: sma(close, 50),
+        "200dma": lambda: sma(close, 200),
+        "50EMA": lambda: ema(close, 50),
+        "200EMA": lambda: ema(close, 200),
+        "RSI": lambda: rsi(close),
+    }
+    names = list(builders) + ["MACD", "Signal"] if names is None else names
+    result = {"Close": close}
+    if "MACD" in names or "Signal" in names:
+        result["MACD"], result["Signal"] = macd(close)
+    for name in names:
+        if name in builders:
+            result[name] = builders[name]()
+    return result
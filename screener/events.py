@@ -0,0 +1,248 @@
+import argparse
+import json
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from screener.cache import INTRADAY_STEPS, fetch_panel_cached
+from screener.cli import read_universe
+from screener.crossover import cross_masks, sign_crosses
+from screener.engine import align_right_order, ema, sma
+from screener.state import IndicatorState, bar_key
+
+# Index of every crossover in each ticker's full history: price vs 50DMA and
+# 200DMA, golden/death crosses and MACD vs its signal line, with the date and
+# session it happened on.  It is built once from the cached history with the
+# same whole-matrix sma()/ema() and cross_masks() the screener uses, then kept
+# up to date bar by bar from a saved IndicatorState per ticker, so questions
+# like "every golden cross in the last 60 sessions" or "sessions since the
+# last death cross" are one indexed query instead of a rescan of the history.
+#
+# A ticker's sessions are numbered from 0 at its first bar; an event on
+# session s is a cross between bars s - 1 and s, the same convention as the
+# screener's "N trading sessions ago".  Bars are keyed by state.bar_key, so
+# intraday intervals keep every bar of a day and the time of each event.
+
+EVENTS_FILE = "crossover_events.sqlite"
+
+KINDS = ["golden_cross", "death_cross", "above_50dma", "below_50dma", "above_200dma", "below_200dma",
+         "macd_above_signal", "macd_below_signal"]
+
+
+def _keys(index):
+    # bar_key of every date in a panel index
+    return np.array([bar_key(d) for d in index.astype(str)], dtype=object)
+
+
+def _dates(column):
+    # Event dates back as timestamps; intraday ones carry a UTC offset
+    utc = bool(column.dropna().astype(str).str.len().gt(19).any())
+    return pd.to_datetime(column, utc=utc, format="ISO8601")
+
+
+def event_masks(close, dma50, dma200, macd, signal):
+    # Every kind of cross over 2-D (dates, tickers) arrays; row t is a cross
+    # between bars t and t + 1, as in cross_masks
+    masks = cross_masks(close, dma50, dma200)
+    masks["macd_above_signal"], masks["macd_below_signal"] = sign_crosses(macd, signal)
+    return masks
+
+
+def _step_events(state, date, close):
+    # Advance a state by one bar and return the kinds of cross it made
+    before = state.latest()
+    if not state.update(date, close):
+        return []
+    after = state.latest()
+    pair = {name: np.array([[before[name]], [after[name]]]) for name in before}
+    masks = event_masks(pair["Close"], pair["50dma"], pair["200dma"], pair["MACD"], pair["Signal"])
+    return [kind for kind in KINDS if masks[kind][0, 0]]
+
+
+class EventIndex:
+    # SQLite store of crossover events keyed by (ticker, interval, kind,
+    # session), plus the state each ticker's index was last advanced to
+
+    def __init__(self, path=EVENTS_FILE, interval="1d"):
+        self.path = path
+        self.interval = interval
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " ticker TEXT NOT NULL, interval TEXT NOT NULL, kind TEXT NOT NULL,"
+            " session INTEGER NOT NULL, date TEXT NOT NULL,"
+            " PRIMARY KEY (ticker, interval, kind, session))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS events_by_kind ON events (interval, kind, date)")
+        # sessions is the number of bars indexed; state is IndicatorState.to_dict()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tickers ("
+            " ticker TEXT NOT NULL, interval TEXT NOT NULL, sessions INTEGER NOT NULL,"
+            " last_date TEXT NOT NULL, state TEXT NOT NULL,"
+            " PRIMARY KEY (ticker, interval))"
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def known(self):
+        return [r[0] for r in self.conn.execute(
+            "SELECT ticker FROM tickers WHERE interval = ? ORDER BY ticker", (self.interval,))]
+
+    def _forget(self, tickers):
+        for table in ("events", "tickers"):
+            self.conn.executemany(f"DELETE FROM {table} WHERE ticker = ? AND interval = ?",
+                                  [(t, self.interval) for t in tickers])
+
+    def build(self, panel, tickers=None):
+        # (Re)index tickers from their full history in a fetch_panel result.
+        # Indicators are computed over every ticker at once on right-aligned
+        # closes, then each ticker's IndicatorState is seeded from the tails.
+        if panel.empty:
+            return []
+        close = panel["Close"]
+        tickers = [t for t in (close.columns if tickers is None else tickers) if t in close.columns]
+        if not tickers:
+            return []
+        close = close[tickers]
+        values, order = align_right_order(close.to_numpy(dtype=float))
+        n, k = values.shape
+        dma50, dma200 = sma(values, 50), sma(values, 200)
+        emas = {span: ema(values, span) for span in IndicatorState.EMA_SPANS}
+        macd = emas[12] - emas[26]
+        signal = ema(macd, IndicatorState.SIGNAL_SPAN)
+        masks = event_masks(values, dma50, dma200, macd, signal)
+
+        # Each ticker's first valid row; its session s is aligned row first + s
+        first = n - (~np.isnan(values)).sum(axis=0)
+        dates = _keys(close.index)
+        rows = []
+        for kind in KINDS:
+            t, col = np.nonzero(masks[kind])
+            rows.extend(zip(close.columns[col], [self.interval] * len(t), [kind] * len(t),
+                            (t + 1 - first[col]).tolist(), dates[order[t + 1, col]]))
+
+        states = []
+        for j, ticker in enumerate(tickers):
+            if first[j] == n:
+                continue
+            valid = slice(first[j], n)
+            state = IndicatorState.from_history(
+                dates[order[valid, j]], values[valid, j], dma50[valid, j], dma200[valid, j],
+                {span: emas[span][-1, j] for span in IndicatorState.EMA_SPANS}, signal[-1, j])
+            states.append((ticker, self.interval, int(n - first[j]), state.last_date,
+                           json.dumps(state.to_dict())))
+
+        self._forget(tickers)
+        self.conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?)", rows)
+        self.conn.executemany("INSERT INTO tickers VALUES (?, ?, ?, ?, ?)", states)
+        self.conn.commit()
+        return [s[0] for s in states]
+
+    def update(self, panel, tickers=None):
+        # Index the bars in panel that are newer than each ticker's last
+        # indexed date.  Tickers not indexed yet are built from panel, which
+        # should then hold their full history.  Returns the tickers that
+        # changed.
+        if panel.empty:
+            return []
+        close = panel["Close"]
+        tickers = [t for t in (close.columns if tickers is None else tickers) if t in close.columns]
+        saved = {r[0]: (r[1], r[2]) for r in self.conn.execute(
+            "SELECT ticker, sessions, state FROM tickers WHERE interval = ?", (self.interval,))}
+        changed = self.build(panel, [t for t in tickers if t not in saved])
+
+        keys = _keys(close.index)
+        rows, states = [], []
+        for ticker in (t for t in tickers if t in saved):
+            sessions, state = saved[ticker]
+            state = IndicatorState.from_dict(json.loads(state))
+            values = close[ticker].to_numpy(dtype=float)
+            new = ~np.isnan(values) & (keys > state.last_date)
+            if not new.any():
+                continue
+            for date, value in zip(keys[new], values[new]):
+                rows.extend((ticker, self.interval, kind, sessions, date)
+                            for kind in _step_events(state, date, value))
+                sessions += 1
+            states.append((sessions, state.last_date, json.dumps(state.to_dict()), ticker, self.interval))
+            changed.append(ticker)
+
+        self.conn.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?)", rows)
+        self.conn.executemany("UPDATE tickers SET sessions = ?, last_date = ?, state = ?"
+                              " WHERE ticker = ? AND interval = ?", states)
+        self.conn.commit()
+        return changed
+
+    def events(self, kind=None, within=None, tickers=None):
+        # Events newest first, optionally of one kind, for some tickers, or
+        # only the ones at most within sessions ago.  Sessions Ago counts
+        # back from each ticker's latest indexed bar.
+        query = ("SELECT e.ticker, e.kind, e.date, t.sessions - 1 - e.session FROM events e"
+                 " JOIN tickers t ON t.ticker = e.ticker AND t.interval = e.interval WHERE e.interval = ?")
+        params = [self.interval]
+        if kind is not None:
+            query += " AND e.kind = ?"
+            params.append(kind)
+        if within is not None:
+            query += " AND e.session >= t.sessions - 1 - ?"
+            params.append(int(within))
+        rows = self.conn.execute(query + " ORDER BY e.date DESC, e.ticker", params).fetchall()
+        frame = pd.DataFrame(rows, columns=["Ticker", "Kind", "Date", "Sessions Ago"])
+        if tickers is not None:
+            frame = frame[frame["Ticker"].isin(list(tickers))].reset_index(drop=True)
+        frame["Date"] = _dates(frame["Date"])
+        return frame
+
+    def sessions_since(self, kind, tickers=None):
+        # Sessions since each ticker's last event of kind, and its date; -1
+        # and NaT for tickers that never had one
+        rows = self.conn.execute(
+            "SELECT t.ticker, t.sessions - 1 - MAX(e.session), MAX(e.date) FROM tickers t"
+            " LEFT JOIN events e ON e.ticker = t.ticker AND e.interval = t.interval AND e.kind = ?"
+            " WHERE t.interval = ? GROUP BY t.ticker ORDER BY t.ticker", (kind, self.interval)).fetchall()
+        frame = pd.DataFrame(rows, columns=["Ticker", "Sessions Ago", "Date"]).set_index("Ticker")
+        if tickers is not None:
+            frame = frame.reindex([t for t in tickers if t in frame.index])
+        frame["Sessions Ago"] = frame["Sessions Ago"].fillna(-1).astype(int)
+        frame["Date"] = _dates(frame["Date"])
+        return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index and look up crossovers across full history")
+    parser.add_argument("--universe", default="stocks.txt", help="file with one ticker per line")
+    parser.add_argument("--period", default="max", help="history to index new tickers over (default: max)")
+    parser.add_argument("--interval", default="1d", help="bar interval (default: 1d)")
+    parser.add_argument("--index", default=EVENTS_FILE, help=f"event index file (default: {EVENTS_FILE})")
+    parser.add_argument("--kind", default="golden_cross", choices=KINDS, help="cross to look up")
+    parser.add_argument("--within", type=int, metavar="N", help="list every cross of kind in the last N sessions")
+    parser.add_argument("--rebuild", action="store_true", help="re-index every ticker from its full history")
+    args = parser.parse_args(argv)
+
+    stocks = read_universe(args.universe)
+    panel = fetch_panel_cached(stocks, period=args.period, interval=args.interval)
+    if panel.empty:
+        print("Warning: no price data to index.")
+        return
+    index = EventIndex(args.index, args.interval)
+    changed = index.build(panel, stocks) if args.rebuild else index.update(panel, stocks)
+    print(f"Indexed {len(changed)} tickers")
+    title = args.kind.replace("_", " ")
+    when = "%Y-%m-%d %H:%M" if args.interval in INTRADAY_STEPS else "%Y-%m-%d"
+    if args.within is not None:
+        found = index.events(args.kind, within=args.within, tickers=stocks)
+        print(f"\nStocks with a {title} in the last {args.within} sessions:")
+        for row in found.itertuples(index=False):
+            print(f"{row.Ticker} - {row.Date:{when}} ({row[3]} trading sessions ago)")
+    else:
+        print(f"\nSessions since the last {title}:")
+        for ticker, row in index.sessions_since(args.kind, stocks).iterrows():
+            print(f"{ticker} - never" if row["Sessions Ago"] < 0 else
+                  f"{ticker} - {row['Sessions Ago']} trading sessions ago ({row['Date']:{when}})")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
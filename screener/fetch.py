@@ -0,0 +1,238 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from screener.workers import run_concurrent
+
+# Columns returned by yf.download for daily bars
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+class YahooProvider:
+    # Pulls bars from Yahoo Finance; yfinance is imported on first use so the
+    # fake provider below works on machines without network access.
+    #
+    # yf.download keeps its results in module-level state, so two calls
+    # running at once can mix up each other's tickers.  Batches are
+    # serialized with a lock, and single symbols, which the fallback and the
+    # streaming screener request from many threads at once, go through
+    # yf.Ticker(...).history(), which keeps its state on the Ticker.
+
+    _download_lock = threading.Lock()
+
+    def download(self, tickers, period="1y", interval="1d", start=None):
+        import yfinance as yf
+        if isinstance(tickers, str) or len(tickers) == 1:
+            return self._history(yf, tickers if isinstance(tickers, str) else tickers[0],
+                                 period, interval, start)
+        span = {"period": period} if start is None else {"start": start}
+        with self._download_lock:
+            return yf.download(tickers, interval=interval, group_by="column", progress=False, **span)
+
+    def _history(self, yf, ticker, period, interval, start):
+        span = {"period": period} if start is None else {"start": start}
+        data = yf.Ticker(ticker).history(interval=interval, auto_adjust=False, **span)
+        if data.empty:
+            return pd.DataFrame()
+        # yf.download drops the exchange time zone from daily bars; do the
+        # same so single-symbol frames line up with batch ones
+        if interval not in FakeProvider.INTRADAY_MINUTES and data.index.tz is not None:
+            data.index = data.index.tz_localize(None)
+        return data[[f for f in FIELDS if f in data.columns]]
+
+
+class FakeProvider:
+    # Offline stand-in for YahooProvider that returns deterministic random-walk
+    # bars.  Tickers listed in fail_in_batch come back empty from a multi-ticker
+    # request but succeed when asked for on their own; tickers in missing never
+    # return data.
+
+    # Every series starts here so a bar's value does not depend on end
+    ORIGIN = "2015-01-01"
+    # Intraday series start later and cover 09:30-16:00 on business days; for
+    # them sessions counts days, and end may include a time of day
+    INTRADAY_ORIGIN = "2024-01-01"
+    INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+
+    def __init__(self, sessions=260, fail_in_batch=(), missing=(), end="2024-12-31",
+                 delay=0.0, flaky=()):
+        self.sessions = sessions
+        self.fail_in_batch = set(fail_in_batch)
+        self.missing = set(missing)
+        self.end = end
+        self.delay = delay
+        # Tickers whose next single-symbol request raises, to exercise retries
+        self.flaky = set(flaky)
+        self.calls = []
+
+    def _index(self, interval="1d"):
+        # Building a long business-day range is slow, so build it once
+        if getattr(self, "_dates", None) is None or self._dates[0] != (self.end, interval):
+            if interval in self.INTRADAY_MINUTES:
+                end = pd.Timestamp(self.end)
+                days = pd.bdate_range(start=self.INTRADAY_ORIGIN, end=end.normalize())
+                offsets = pd.timedelta_range("09:30:00", "15:59:00", freq=f"{self.INTRADAY_MINUTES[interval]}min")
+                index = pd.DatetimeIndex((days.values[:, None] + offsets.values).ravel(), name="Datetime")
+                index = index[index <= end] if end != end.normalize() else index
+            else:
+                index = pd.bdate_range(start=self.ORIGIN, end=self.end, name="Date")
+            self._dates = ((self.end, interval), index)
+        return self._dates[1]
+
+    def bars(self, ticker, interval="1d"):
+        # Seed from the ticker name so every call returns the same series
+        seed = sum(ord(c) * 31 ** i for i, c in enumerate(ticker)) % (2 ** 32)
+        index = self._index(interval)
+        n = len(index)
+        # Intraday steps are scaled down so a day moves about as much as a daily bar
+        scale = np.sqrt(self.INTRADAY_MINUTES[interval] / 390) if interval in self.INTRADAY_MINUTES else 1.0
+        # Each field draws from its own stream, so its first bars are the
+        # same however many bars are asked for
+        steps = [np.random.default_rng(seed if i == 0 else [seed, i]).normal(0, 0.02 * scale, n)
+                 for i in range(5)]
+        close = 50 * np.exp(np.cumsum(steps[0]))
+        open_ = close * (1 + steps[1] / 4)
+        high = np.maximum(open_, close) * (1 + np.abs(steps[2]) / 2)
+        low = np.minimum(open_, close) * (1 - np.abs(steps[3]) / 2)
+        volume = (2_500_000 * scale ** 2 * np.exp(steps[4] * 10 / scale)).astype(np.int64)
+        data = pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close,
+                             "Adj Close": close, "Volume": volume}, index=index)
+        if interval in self.INTRADAY_MINUTES:
+            days = index.normalize().unique()
+            return data[index >= days[-min(self.sessions, len(days))]] if len(days) else data
+        return data.iloc[-self.sessions:]
+
+    def download(self, tickers, period="1y", interval="1d", start=None):
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        self.calls.append(list(tickers))
+        time.sleep(self.delay)
+        if len(tickers) == 1 and tickers[0] in self.flaky:
+            self.flaky.discard(tickers[0])
+            raise ConnectionError(f"simulated failure for {tickers[0]}")
+        batch = len(tickers) > 1
+        frames = {}
+        for ticker in tickers:
+            if ticker in self.missing or (batch and ticker in self.fail_in_batch):
+                continue
+            bars = self.bars(ticker, interval)
+            if start is not None:
+                bars = bars[bars.index >= pd.Timestamp(start)]
+            frames[ticker] = bars
+        if not frames or all(f.empty for f in frames.values()):
+            return pd.DataFrame()
+        panel = pd.concat(frames, axis=1).swaplevel(axis=1)
+        # Failed symbols show up as all-NaN columns, the same way yfinance reports them
+        columns = pd.MultiIndex.from_product([FIELDS, tickers], names=["Price", "Ticker"])
+        return panel.reindex(columns=columns)
+
+
+def _as_panel(data, tickers):
+    # Normalise a download result to (field, ticker) columns
+    if data is None or data.empty:
+        return pd.DataFrame()
+    if not isinstance(data.columns, pd.MultiIndex):
+        data = pd.concat({tickers[0]: data}, axis=1).swaplevel(axis=1)
+    data.columns = data.columns.set_names(["Price", "Ticker"])
+    return data
+
+
+def _has_data(panel, ticker):
+    if panel.empty or ticker not in panel.columns.get_level_values(1):
+        return False
+    return panel["Close"][ticker].notna().any()
+
+
+def _with_data(panel):
+    # Every ticker in panel with at least one close, in one pass
+    if panel.empty:
+        return set()
+    close = panel["Close"]
+    return set(close.columns[close.notna().any().to_numpy()])
+
+
+def fetch_panel(tickers, period="1y", interval="1d", chunk_size=50, provider=None, start=None,
+                workers=8, rate=5.0, retries=3, timeout=30):
+    # Download every ticker in chunks of chunk_size and return one panel with
+    # (field, ticker) columns.  Symbols that come back empty from a batch are
+    # retried one at a time on a rate-limited thread pool (see
+    # screener.workers.run_concurrent); symbols that still fail are left out
+    # of the panel.  When start is given it replaces period and only bars
+    # from that date on are requested.
+    tickers = list(dict.fromkeys(tickers))
+    return _combine(list(fetch_chunks(tickers, period, interval, chunk_size, provider, start,
+                                      workers, rate, retries, timeout)), tickers)
+
+
+def fetch_chunks(tickers, period="1y", interval="1d", chunk_size=50, provider=None, start=None,
+                 workers=8, rate=5.0, retries=3, timeout=30):
+    # fetch_panel one piece at a time: yields the panel of each batch as it
+    # arrives, then one panel per symbol retried on its own, so callers that
+    # write the bars out (refresh_cache) never hold the whole download
+    provider = provider or YahooProvider()
+    tickers = list(dict.fromkeys(tickers))
+    missed = []
+
+    for offset in range(0, len(tickers), chunk_size):
+        chunk = tickers[offset:offset + chunk_size]
+        try:
+            panel = _as_panel(provider.download(chunk, period=period, interval=interval, start=start), chunk)
+        except Exception as e:
+            print(f"Warning: batch download failed for {chunk[0]}..{chunk[-1]}: {e}")
+            panel = pd.DataFrame()
+
+        found = _with_data(panel)
+        good = [t for t in chunk if t in found]
+        if good:
+            yield panel.loc[:, (slice(None), good)]
+        missed.extend(t for t in chunk if t not in good)
+
+    # Fall back to one request per symbol for whatever the batches missed
+    def download_one(ticker):
+        return _as_panel(provider.download(ticker, period=period, interval=interval, start=start), [ticker])
+
+    singles = run_concurrent(download_one, missed, workers=workers, rate=rate,
+                             retries=retries, timeout=timeout)
+    for ticker, single in zip(missed, singles):
+        if single is not None and _has_data(single, ticker):
+            yield single.loc[:, (slice(None), [ticker])]
+
+
+def _combine(pieces, tickers):
+    # Join per-chunk panels on the union of their dates
+    if not pieces:
+        return pd.DataFrame()
+    panel = pd.concat(pieces, axis=1).sort_index()
+    # Keep the tickers in the order they were requested
+    present = set(panel.columns.get_level_values(1))
+    fields = list(dict.fromkeys(panel.columns.get_level_values(0)))
+    columns = [(f, t) for f in fields for t in tickers if t in present]
+    return panel.reindex(columns=pd.MultiIndex.from_tuples(columns, names=["Price", "Ticker"]))
+
+
+def ticker_frame(panel, ticker):
+    # Slice one ticker's bars out of the panel as a plain single-level frame,
+    # dropping dates where that ticker did not trade
+    if panel.empty or ticker not in panel.columns.get_level_values(1):
+        return pd.DataFrame()
+    data = panel.xs(ticker, axis=1, level=1)
+    data.columns.name = None
+    return data.dropna(subset=["Close"])
+
+
+def ticker_frames(panel):
+    # (ticker, ticker_frame(panel, ticker)) for every ticker in the panel,
+    # all values as floats, from one copy of the panel's values instead of
+    # a cross-section per ticker
+    if panel.empty:
+        return
+    values = panel.to_numpy(dtype=float)
+    fields = panel.columns.get_level_values(0)
+    columns = {}
+    for i, ticker in enumerate(panel.columns.get_level_values(1)):
+        columns.setdefault(ticker, []).append(i)
+    for ticker, positions in columns.items():
+        data = pd.DataFrame(values[:, positions], index=panel.index, columns=list(fields[positions]))
+        yield ticker, data[data["Close"].notna().to_numpy()]
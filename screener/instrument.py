@@ -0,0 +1,101 @@
+import cProfile
+import contextlib
+import json
+import threading
+import time
+import tracemalloc
+
+
+class RunStats:
+    # Wall time, CPU time and peak traced memory per pipeline stage, plus
+    # wall and CPU time per ticker for the stages that work one ticker at a
+    # time.  Memory is only tracked when trace_memory=True because
+    # tracemalloc slows everything down noticeably.
+    #
+    # Peak memory is per stage only.  tracemalloc has one process-wide peak,
+    # so per-ticker stages overlapping on pool threads would each report
+    # the others' allocations.  The panel path in screener.cli computes all
+    # tickers in whole-matrix passes and has no per-ticker records at all;
+    # only the per-ticker screeners (screener.stream) fill self.tickers.
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.tickers = {}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name, ticker=None):
+        # Per-ticker records use the calling thread's CPU time, so work done
+        # on pool threads is attributed to the right ticker
+        cpu_clock = time.thread_time if ticker is not None else time.process_time
+        track = self.trace_memory and ticker is None
+        if track:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), cpu_clock()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, cpu_clock() - cpu
+            peak = tracemalloc.get_traced_memory()[1] if track else None
+            with self.lock:
+                if ticker is None:
+                    record = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+                    if peak is not None:
+                        record["peak_mb"] = max(record.get("peak_mb", 0.0), peak / 2 ** 20)
+                else:
+                    record = self.tickers.setdefault(ticker, {}).setdefault(
+                        name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+                record["wall"] += wall
+                record["cpu"] += cpu
+                record["calls"] += 1
+
+    def summary(self):
+        return {
+            "total_wall": time.perf_counter() - self.started,
+            "stages": self.stages,
+            "tickers": self.tickers,
+        }
+
+    def report(self):
+        # Print the per-stage table and the slowest tickers
+        print(f"\n{'Stage':<14}{'Wall s':>10}{'CPU s':>10}{'Peak MB':>10}")
+        for name, record in self.stages.items():
+            peak = f"{record['peak_mb']:.1f}" if "peak_mb" in record else "-"
+            print(f"{name:<14}{record['wall']:>10.3f}{record['cpu']:>10.3f}{peak:>10}")
+        if self.tickers:
+            slowest = sorted(self.tickers.items(),
+                             key=lambda item: -sum(r["wall"] for r in item[1].values()))[:10]
+            print("\nSlowest tickers:")
+            for ticker, records in slowest:
+                parts = ", ".join(f"{name} {r['wall']:.3f}s" for name, r in records.items())
+                print(f"{ticker}: {parts}")
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def stage(stats, name, ticker=None):
+    # stats.stage(...) when instrumentation is on, a no-op otherwise
+    return stats.stage(name, ticker) if stats is not None else contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def profiled(path):
+    # Run the block under cProfile and dump pstats data to path; a falsy
+    # path disables profiling
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Profile saved as {path}")
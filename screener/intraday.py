@@ -0,0 +1,199 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from screener.cache import INTRADAY_STEPS, PriceCache, refresh_cache, same_clock
+from screener.cli import print_categories, read_universe, write_outputs
+from screener.profiles import PROFILES
+from screener.state import WINDOW, IndicatorState, bar_key, load_states, save_states, summarize_states
+from screener.summary import SummaryBuffer
+
+# Intraday screening: one base-resolution series per ticker (5-minute bars
+# by default) is kept in the price cache, and every higher timeframe is
+# resampled from it instead of being downloaded separately.  Closed
+# higher-timeframe bars are cached next to the base bars, so each refresh
+# only re-buckets the base bars of the latest day.  Indicators are advanced
+# bar by bar from a saved IndicatorState per ticker and timeframe, so a
+# refresh costs one download of the new base bars plus a constant amount of
+# work per new bar closed.
+
+BASE_INTERVAL = "5m"
+# Yahoo serves 5-minute bars for the last 60 days only
+BASE_PERIOD = "60d"
+TIMEFRAMES = ["5m", "15m", "1h"]
+
+# How base bars combine into one bar of a higher timeframe: the first open,
+# the last close, the extremes and the total volume
+AGGREGATES = {"Open": "first", "High": np.maximum, "Low": np.minimum, "Close": "last", "Adj Close": "last",
+              "Volume": np.add}
+
+
+def state_file(timeframe):
+    return f"intraday_state_{timeframe}.json"
+
+
+def aggregate_key(timeframe, base=BASE_INTERVAL):
+    # Interval the cached aggregates are stored under, e.g. "15m@5m"
+    return f"{timeframe}@{base}"
+
+
+def bucket_starts(index, timeframe):
+    # Start of the timeframe bar each bar in index falls in, as int64
+    # nanoseconds.  Buckets are counted from each day's first bar, so hourly
+    # bars run 09:30-10:30 the way Yahoo's do, and never span two sessions.
+    stamps = index.as_unit("ns").asi8
+    days = stamps // pd.Timedelta(days=1).value
+    first = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    opens = stamps[first][np.cumsum(np.r_[True, days[1:] != days[:-1]]) - 1]
+    step = INTRADAY_STEPS[timeframe].value
+    return opens + (stamps - opens) // step * step
+
+
+def resample_bars(frame, timeframe):
+    # Aggregate one ticker's bars (a ticker_frame / PriceCache.load frame)
+    # into timeframe bars.  Bars are in order, so each bucket is a run of
+    # rows and ufunc.reduceat does each column in one call, which is much
+    # cheaper than a groupby on the few hundred rows a refresh re-buckets.
+    if frame.empty:
+        return frame
+    buckets = bucket_starts(frame.index, timeframe)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    index = pd.DatetimeIndex(buckets[starts].astype("datetime64[ns]"), name=frame.index.name)
+    if frame.index.tz is not None:
+        index = index.tz_localize("UTC").tz_convert(frame.index.tz)
+    ends = np.r_[starts[1:], len(frame)] - 1
+    values = frame.to_numpy(dtype=float)
+    out = np.empty((len(starts), values.shape[1]))
+    for i, name in enumerate(frame.columns):
+        how = AGGREGATES.get(name, "last")
+        if how == "first":
+            out[:, i] = values[starts, i]
+        elif how == "last":
+            out[:, i] = values[ends, i]
+        else:
+            out[:, i] = how.reduceat(values[:, i], starts)
+    return pd.DataFrame(out, index=index, columns=frame.columns)
+
+
+def closed_bars(frame, timeframe, now):
+    # Drop the last bar while it is still forming.  Every earlier bar is
+    # closed, since a later one has started.
+    if frame.empty:
+        return frame
+    last = frame.index[-1]
+    return frame if last + INTRADAY_STEPS[timeframe] <= same_clock(now, last) else frame.iloc[:-1]
+
+
+def new_bars(cache, ticker, timeframe, after=None, now=None, base=BASE_INTERVAL):
+    # Closed timeframe bars of ticker after the bar keyed after (None for all
+    # of them).  Higher timeframes come from the cached aggregates, topped up
+    # by resampling the base bars from the day of the last cached one on.
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    if timeframe == base:
+        key = base
+    else:
+        key = aggregate_key(timeframe, base)
+        done = cache.last_date(ticker, key)
+        start = None if done is None else done.normalize()
+        fresh = closed_bars(resample_bars(cache.load(ticker, base, start=start), timeframe), timeframe, now)
+        if done is not None and not fresh.empty:
+            fresh = fresh[fresh.index > same_clock(done, fresh.index[-1])]
+        cache.store(ticker, key, fresh)
+        # A state already at the last cached bar needs only the new ones,
+        # which are at hand
+        if done is not None and after is not None and same_clock(pd.Timestamp(after), done) >= done:
+            if fresh.empty:
+                return fresh
+            return fresh[fresh.index > same_clock(pd.Timestamp(after), fresh.index[-1])]
+    # Stored dates are compared as text, so load from the day before and
+    # filter exactly here
+    start = None if after is None else pd.Timestamp(after).normalize() - pd.Timedelta(days=1)
+    bars = cache.load(ticker, key, start=start)
+    if timeframe == base:
+        bars = closed_bars(bars, base, now)
+    if after is not None and not bars.empty:
+        bars = bars[bars.index > same_clock(pd.Timestamp(after), bars.index[-1])]
+    return bars
+
+
+def update_intraday(states, cache, stocks, timeframe, now=None, base=BASE_INTERVAL, window=WINDOW):
+    # Advance each ticker's state for timeframe with the bars that closed
+    # since its last update; tickers without state, or whose state keeps
+    # fewer than window sessions for the crossover scan, replay everything
+    # cached.  Returns the tickers that changed.
+    changed = []
+    with cache.batch():
+        for stock in stocks:
+            state = states.get(stock)
+            if state is None or state.window < window:
+                state = states[stock] = IndicatorState(window)
+            bars = new_bars(cache, stock, timeframe, state.last_date, now, base)
+            applied = False
+            for date, close in zip(bars.index, bars["Close"].to_numpy(dtype=float)):
+                applied = state.update(bar_key(date.isoformat()), close) or applied
+            if applied:
+                changed.append(stock)
+    return changed
+
+
+def run_intraday(profile="sma23", universe="stocks.txt", timeframes=None, base=BASE_INTERVAL, window=WINDOW,
+                 cache=None, provider=None, now=None):
+    # Refresh the base bars, bring every timeframe's indicators up to date
+    # and print/write the profile's summary per timeframe, to files named
+    # after the profile's with the timeframe appended (stocks_summary_15m.csv).
+    # Returns {timeframe: summary table}.
+    settings = PROFILES[profile]
+    timeframes = TIMEFRAMES if timeframes is None else timeframes
+    for timeframe in [base, *timeframes]:
+        if timeframe not in INTRADAY_STEPS:
+            raise ValueError(f"Unsupported intraday timeframe: {timeframe}")
+        if INTRADAY_STEPS[timeframe] < INTRADAY_STEPS[base]:
+            raise ValueError(f"{timeframe} bars cannot be built from {base} bars")
+    stocks = read_universe(universe)
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    cache = refresh_cache(stocks, period=BASE_PERIOD, interval=base, cache=cache or PriceCache(),
+                          provider=provider, today=now)
+
+    tables = {}
+    for timeframe in timeframes:
+        states = load_states(state_file(timeframe))
+        update_intraday(states, cache, stocks, timeframe, now, base, window)
+        save_states(states, state_file(timeframe))
+
+        screened = []
+        for stock in stocks:
+            bars = states[stock].sma50.count if stock in states else 0
+            if bars == 0:
+                print(f"Warning: No data available for {stock} at {timeframe}. Skipping...")
+            elif bars < settings["min_bars"]:
+                print(f"Skipping stock {stock} at {timeframe} due to insufficient data.")
+            else:
+                screened.append(stock)
+
+        records = SummaryBuffer.from_rows(summarize_states(states, screened, window))
+        print(f"\n{timeframe} bars:")
+        print_categories(records, settings, window)
+        outputs = {fmt: (f"{path.rsplit('.', 1)[0]}_{timeframe}.{fmt}", columns)
+                   for fmt, (path, columns) in settings["outputs"].items()}
+        write_outputs(records, dict(settings, outputs=outputs), window=window)
+        tables[timeframe] = records.table()
+    return tables
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen stocks on intraday bars")
+    parser.add_argument("--profile", default="sma23", choices=sorted(PROFILES),
+                        help="categories and outputs to use (default: sma23)")
+    parser.add_argument("--universe", default="stocks.txt", help="file with one ticker per line")
+    parser.add_argument("--base", default=BASE_INTERVAL,
+                        help=f"interval downloaded and stored (default: {BASE_INTERVAL})")
+    parser.add_argument("--timeframes", default=",".join(TIMEFRAMES),
+                        help=f"comma-separated timeframes to screen (default: {','.join(TIMEFRAMES)})")
+    parser.add_argument("--window", type=int, default=15, help="crossover lookback in bars")
+    args = parser.parse_args(argv)
+    run_intraday(args.profile, args.universe, args.timeframes.split(","), args.base, args.window)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+# Content-addressed store of computed results.  A result is keyed by a hash
+# of the exact closes it was computed from and of the settings that shaped
+# it, so a rerun over unchanged bars, another profile with the same
+# indicator set or an overlapping parameter sweep finds it instead of
+# computing it again, while any new, revised or dropped bar gives a new key.
+# Entries are evicted least recently used first once the store grows past
+# max_bytes.
+#
+#   summary rows   screener.summary.summarize_panel(memo=...)
+#   sweep tallies  screener.sweep.sweep(memo=...)
+
+MEMO_FILE = "result_cache.sqlite"
+MAX_BYTES = 64 * 1024 * 1024
+
+# Part of every key; bump it when an indicator's arithmetic changes so old
+# results are no longer found
+MEMO_VERSION = 2
+
+# SQLite's default limit on ? parameters per statement is 999
+_CHUNK = 500
+
+
+def column_digests(values):
+    # One digest per column of a right-aligned (dates, tickers) close matrix,
+    # over that column's valid bars, which is all the indicator engine sees
+    # of it.  Leading padding does not change a digest.
+    values = np.asarray(values, dtype=float)
+    counts = (~np.isnan(values)).sum(axis=0)
+    columns = np.ascontiguousarray(values.T)
+    n = values.shape[0]
+    return [hashlib.blake2b(columns[j, n - counts[j]:].tobytes(), digest_size=16).digest()
+            for j in range(values.shape[1])]
+
+
+def content_key(digest, config):
+    # Key of the result computed from the bars behind digest under config,
+    # a repr-able tuple of everything else the result depends on
+    return hashlib.blake2b(digest + repr((MEMO_VERSION, config)).encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    # SQLite store of result blobs keyed by content_key, with the time each
+    # was last read or written for LRU eviction
+
+    def __init__(self, path=MEMO_FILE, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_by_use ON results (used)")
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, keys):
+        # {key: value} for the keys that are stored; their use time is
+        # refreshed so they are evicted last
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for i in range(0, len(keys), _CHUNK):
+            chunk = keys[i:i + _CHUNK]
+            marks = ",".join("?" * len(chunk))
+            found.update(self.conn.execute(f"SELECT key, value FROM results WHERE key IN ({marks})", chunk))
+        now = time.time()
+        self.conn.executemany("UPDATE results SET used = ? WHERE key = ?", [(now, k) for k in found])
+        self.conn.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, items):
+        # Store {key: value} and evict down to max_bytes
+        now = time.time()
+        self.conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                              [(k, v, len(k) + len(v), now) for k, v in items.items()])
+        self.evict()
+        self.conn.commit()
+
+    def size(self):
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def evict(self, max_bytes=None):
+        # Drop the least recently used entries until the rest fit in max_bytes
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        excess = self.size() - max_bytes
+        if excess <= 0:
+            return 0
+        dropped, freed = [], 0
+        for key, size in self.conn.execute("SELECT key, size FROM results ORDER BY used, key"):
+            if freed >= excess:
+                break
+            dropped.append((key,))
+            freed += size
+        self.conn.executemany("DELETE FROM results WHERE key = ?", dropped)
+        return len(dropped)
+
+    def report(self, what):
+        # One line on how much was reused, e.g. after a run
+        total = self.hits + self.misses
+        if total:
+            print(f"Reused {self.hits} of {total} {what} from {os.path.basename(self.path)}")
+
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Works out how many bars the screener really needs, so that "--period auto"
+# fetches enough history for every indicator to be correct and nothing more.
+#
+# SMA(w) is exact once w bars are in; RSI (a rolling mean of 14 deltas here)
+# needs period + 1.  An EMA started with adjust=False never becomes exact,
+# but the weight left on its seed bar after n updates is (1 - alpha) ** n,
+# so it is converged to tol after ceil(log(tol) / log(1 - alpha)) bars.
+# The crossover columns look back window sessions on the 50/200 DMAs, which
+# therefore have to be valid window + 1 bars before the latest one.
+
+TRADING_DAYS_PER_YEAR = 252
+# Default weight left on an EMA's seed bar
+EMA_TOLERANCE = 1e-3
+# Extra calendar days asked for on top of the estimate, to cover holidays
+# and a listing or halt gap in the planned range
+CALENDAR_MARGIN = 10
+
+
+def ema_warmup(span, tol=EMA_TOLERANCE):
+    # Bars after which the seed of an EMA with this span weighs less than tol
+    alpha = 2.0 / (span + 1.0)
+    return math.ceil(math.log(tol) / math.log(1.0 - alpha))
+
+
+def indicator_bars(name, window=15, tol=EMA_TOLERANCE):
+    # Bars needed for the latest value of one engine indicator to be correct
+    if name == "Close":
+        return 1
+    if name.endswith("dma"):
+        return int(name[:-3])
+    if name.endswith("EMA"):
+        return ema_warmup(int(name[:-3]), tol) + 1
+    if name == "RSI":
+        return 14 + 1
+    if name == "MACD":
+        return ema_warmup(26, tol) + 1
+    if name == "Signal":
+        # The signal EMA starts from a MACD line that is itself warming up
+        return ema_warmup(26, tol) + ema_warmup(9, tol) + 1
+    raise ValueError(f"unknown indicator {name!r}")
+
+
+def plan_bars(indicators=None, window=15, tol=EMA_TOLERANCE, min_bars=0):
+    # Bars to fetch per ticker for the given indicators (None means all of
+    # them), and the requirement of each one so the plan can be printed
+    from screener.summary import INDICATORS
+    names = INDICATORS if indicators is None else list(dict.fromkeys(["Close", *indicators]))
+    needs = {name: indicator_bars(name, window, tol) for name in names}
+    # 50/200 DMAs are always computed for the crossover and trend columns
+    needs["crossovers"] = 200 + window
+    if min_bars:
+        needs["min_bars"] = min_bars
+    return max(needs.values()), needs
+
+
+def plan_start(bars, end=None):
+    # First calendar date to request so that bars sessions end at end
+    end = pd.Timestamp(end or pd.Timestamp.today()).normalize()
+    days = math.ceil(bars * 365.25 / TRADING_DAYS_PER_YEAR) + CALENDAR_MARGIN
+    return end - pd.Timedelta(days=days)
+
+
+def trim_bars(panel, bars):
+    # Keep only each ticker's last bars valid sessions; anything the margin
+    # in plan_start pulled in beyond that is blanked, and dates no ticker
+    # keeps are dropped
+    if panel.empty:
+        return panel
+    valid = panel["Close"].notna().to_numpy()
+    # Rank every valid bar from the newest one backwards
+    ranks = np.cumsum(valid[::-1], axis=0)[::-1]
+    keep = valid & (ranks <= bars)
+    keep = pd.DataFrame(keep, index=panel.index, columns=panel["Close"].columns)
+    fields = panel.columns.get_level_values(0)
+    mask = pd.concat({field: keep for field in dict.fromkeys(fields)}, axis=1)
+    mask.columns = mask.columns.set_names(panel.columns.names)
+    panel = panel.where(mask.reindex(columns=panel.columns, fill_value=False))
+    return panel[keep.any(axis=1).to_numpy()]
@@ -0,0 +1,134 @@
+# Profiles reproducing the historical sma*.py scripts on the shared pipeline.
+#
+# Each profile sets the lookback period, the minimum number of bars a ticker
+# needs (older scripts skipped anything under a year of sessions), which
+# indicators to compute, the console categories to print and which summary
+# columns go to which output files.
+
+# Console categories: title and a screen expression (see screener.query)
+# over the summary.  Crossed categories also name the sessions-ago column
+# printed next to each ticker.
+CATEGORIES = {
+    "above_50dma": ("Stocks above the 50-day moving average",
+                    "price > 50dma"),
+    "above_200dma": ("Stocks above the 200-day moving average",
+                     "price > 200dma"),
+    "between_50dma_and_200dma": ("Stocks between the 50-day and 200-day moving averages",
+                                 "50dma < price < 200dma"),
+    "below_50dma": ("Stocks below the 50-day moving average",
+                    "price < 50dma"),
+    "above_both": ("Stocks above both the 50-day and 200-day moving averages",
+                   "price > 50dma & price > 200dma"),
+    "below_both": ("Stocks below both the 50-day and 200-day moving averages",
+                   "price < 50dma & price < 200dma"),
+    "50dma_above_200dma_between": (
+        "Stocks where the 50DMA is above the 200DMA and price is between 200DMA and 50DMA",
+        "50dma > 200dma & 200dma < price < 50dma"),
+    "50dma_below_200dma_between": (
+        "Stocks where the 50DMA is below the 200DMA and price is between 50DMA and 200DMA",
+        "50dma < 200dma & 50dma < price < 200dma"),
+}
+
+CROSSED_CATEGORIES = {
+    "crossed_above_50dma": ("Stocks above the 50-day moving average and crossed above it in the last {window} trading sessions",
+                            "Above 50DMA Last 15 Sessions", "Crossed above 50DMA"),
+    "crossed_above_200dma": ("Stocks above the 200-day moving average and crossed above it in the last {window} trading sessions",
+                             "Above 200DMA Last 15 Sessions", "Crossed above 200DMA"),
+    "crossed_below_50dma": ("Stocks below the 50-day moving average and crossed below it in the last {window} trading sessions",
+                            "Below 50DMA Last 15 Sessions", "Crossed below 50DMA"),
+    "crossed_below_200dma": ("Stocks below the 200-day moving average and crossed below it in the last {window} trading sessions",
+                             "Below 200DMA Last 15 Sessions", "Crossed below 200DMA"),
+}
+
+# Yes/No columns only stock_analysis.csv (sma17.py) had
+DERIVED_COLUMNS = {
+    "Price Above 50DMA": "price > 50dma",
+    "Price Above 200DMA": "price > 200dma",
+    "Price Below 50DMA": "price < 50dma",
+    "Price Below 200DMA": "price < 200dma",
+    "Price Between 50DMA and 200DMA": "50dma < price < 200dma",
+}
+
+POSITION = ["above_50dma", "above_200dma", "between_50dma_and_200dma", "below_50dma"]
+CROSSED_ABOVE = ["crossed_above_50dma", "crossed_above_200dma"]
+CROSSED_BELOW = ["crossed_below_50dma", "crossed_below_200dma"]
+DMA_ONLY = ["50dma", "200dma"]
+ALL_INDICATORS = ["50dma", "200dma", "50EMA", "200EMA", "MACD", "Signal", "RSI"]
+
+SESSIONS = ["Above 50DMA Last 15 Sessions", "Above 200DMA Last 15 Sessions",
+            "Below 50DMA Last 15 Sessions", "Below 200DMA Last 15 Sessions"]
+FLAGS = ["Above 50DMA Flag", "Above 200DMA Flag"]
+
+_DEFAULTS = {
+    "period": "1y",
+    "min_bars": 0,
+    "indicators": DMA_ONLY,
+    "categories": POSITION,
+    # Only print "No stocks are ..." for empty categories when True
+    "empty_message": False,
+    # Put each stock in the first matching category only
+    "exclusive": False,
+    # Sort position lists by symbol descending (sma7.py)
+    "reverse_symbols": False,
+    # Sort crossed lists by sessions ago: None, "asc" or "desc"
+    "crossed_order": None,
+    # Crossed categories that list bare symbols, without the sessions ago
+    # (sma17.py's crossed-below lists)
+    "bare_crossed": (),
+    "outputs": {},
+}
+
+
+def _profile(**options):
+    profile = dict(_DEFAULTS)
+    profile.update(options)
+    return profile
+
+
+PROFILES = {
+    "sma": _profile(period="2y", categories=["above_50dma"], empty_message=True),
+    "sma2": _profile(period="2y", categories=["above_50dma", "above_200dma"], empty_message=True),
+    "sma3": _profile(period="2y", categories=["between_50dma_and_200dma", "above_200dma", "below_50dma"],
+                     empty_message=True, exclusive=True),
+    "sma4": _profile(period="2y", min_bars=252, categories=POSITION + CROSSED_ABOVE),
+    "sm4": _profile(period="2y", categories=POSITION + CROSSED_ABOVE),
+    "sma7": _profile(min_bars=252, categories=POSITION + CROSSED_ABOVE,
+                     reverse_symbols=True, crossed_order="asc"),
+    "sma9": _profile(min_bars=252, categories=POSITION + CROSSED_ABOVE + [
+        "50dma_above_200dma_between", "50dma_below_200dma_between"]),
+    "sma10": _profile(min_bars=252, categories=["above_both", "below_both"] + POSITION + CROSSED_ABOVE + [
+        "50dma_above_200dma_between", "50dma_below_200dma_between"]),
+    "sma11": _profile(min_bars=252, categories=POSITION + CROSSED_ABOVE + [
+        "50dma_above_200dma_between", "50dma_below_200dma_between", "above_both", "below_both"],
+        crossed_order="asc"),
+    "sma15": _profile(categories=POSITION + CROSSED_ABOVE + CROSSED_BELOW, crossed_order="desc"),
+    "sma17": _profile(min_bars=252, categories=POSITION + CROSSED_ABOVE + CROSSED_BELOW,
+                      bare_crossed=CROSSED_BELOW, outputs={
+        "csv": ("stock_analysis.csv", ["Symbol", "Current Price", "50DMA", "200DMA"] + list(DERIVED_COLUMNS)),
+    }),
+    "sma18": _profile(outputs={
+        "csv": ("stocks_summary.csv", ["Symbol", "Current Price", "50DMA", "200DMA"] + SESSIONS),
+    }),
+    "sma19": _profile(outputs={
+        "csv": ("stocks_summary.csv", ["Symbol", "Current Price", "50DMA", "200DMA"] + FLAGS + SESSIONS),
+        "xlsx": ("stocks_summary.xlsx", ["Symbol", "Current Price", "50DMA", "200DMA"] + FLAGS + SESSIONS),
+    }),
+}
+
+_SMA20 = ["Symbol", "Current Price", "50DMA", "200DMA", "Trend (50DMA vs 200DMA)"] + FLAGS + SESSIONS
+PROFILES["sma20"] = _profile(outputs={"csv": ("stocks_summary.csv", _SMA20),
+                                      "xlsx": ("stocks_summary.xlsx", _SMA20)})
+PROFILES["sma21"] = PROFILES["sma20"]
+PROFILES["sma22"] = _profile(indicators=ALL_INDICATORS, outputs={
+    "csv": ("stocks_summary.csv", _SMA20 + ["MACD", "Signal", "RSI"]),
+    "xlsx": ("stocks_summary.xlsx", _SMA20 + ["MACD", "Signal", "RSI"]),
+})
+PROFILES["sma23"] = _profile(indicators=ALL_INDICATORS, outputs={
+    "csv": ("stocks_summary.csv", None),
+    "xlsx": ("stocks_summary.xlsx", None),
+    "parquet": ("stocks_summary.parquet", None),
+})
+PROFILES["sma24"] = _profile(indicators=ALL_INDICATORS, categories=[], outputs={
+    "csv": ("stocks_summary.csv", None),
+    "xlsx": ("stocks_summary.xlsx", None),
+})
@@ -0,0 +1,163 @@
+import ast
+import re
+
+import numpy as np
+
+# Screen expressions evaluated as vectorized masks over a SummaryBuffer (or
+# anything that returns a column array for a summary header), e.g.
+#
+#   price > 50dma & rsi < 30 & golden_cross_within(15)
+#   50dma > 200dma and 200dma < price < 50dma
+#
+# Names are the latest indicator values below; 50dma/200ema style names are
+# accepted as written.  & | ~ (or and/or/not) combine masks and bind more
+# loosely than comparisons, comparisons may be chained, and + - * / work on
+# the values.  The *_within(n) functions
+# test the sessions-ago columns, which only cover the crossover window the
+# summary was built with, so n may not exceed it (n defaults to it).
+
+NAMES = {
+    "price": "Current Price",
+    "close": "Current Price",
+    "dma50": "50DMA",
+    "dma200": "200DMA",
+    "ema50": "50EMA",
+    "ema200": "200EMA",
+    "macd": "MACD",
+    "signal": "Signal",
+    "rsi": "RSI",
+    "trend_up": "Trend (50DMA vs 200DMA)",
+    "macd_up": "MACD Trend",
+}
+
+FUNCTIONS = {
+    "golden_cross_within": "Golden Cross Sessions Ago",
+    "crossed_above_50dma_within": "Above 50DMA Last 15 Sessions",
+    "crossed_above_200dma_within": "Above 200DMA Last 15 Sessions",
+    "crossed_below_50dma_within": "Below 50DMA Last 15 Sessions",
+    "crossed_below_200dma_within": "Below 200DMA Last 15 Sessions",
+}
+
+_OPERATORS = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide,
+    ast.Gt: np.greater, ast.GtE: np.greater_equal, ast.Lt: np.less, ast.LtE: np.less_equal,
+    ast.Eq: np.equal, ast.NotEq: np.not_equal,
+}
+
+# 50dma -> dma50, 200EMA -> ema200: Python names cannot start with a digit
+_NUMBERED = re.compile(r"\b(\d+)(dma|ema)\b", re.IGNORECASE)
+
+
+class Screen:
+    # One compiled screen expression; calling it on a summary returns a
+    # boolean mask with one entry per row
+
+    def __init__(self, expression):
+        self.expression = expression
+        source = _NUMBERED.sub(lambda m: f"{m.group(2).lower()}{m.group(1)}", expression)
+        # & | ~ mean and/or/not here; spelling them as keywords gives them
+        # the precedence people expect ("a > b & c < d"), below comparisons
+        source = source.replace("&", " and ").replace("|", " or ").replace("~", " not ")
+        try:
+            self.tree = ast.parse(source.strip(), mode="eval").body
+        except SyntaxError as e:
+            raise ValueError(f"Invalid screen {expression!r}: {e.msg}") from None
+        self._check(self.tree)
+
+    def _check(self, node):
+        # Reject anything outside the small expression language up front,
+        # so a bad screen fails before any data is fetched
+        if isinstance(node, ast.Name):
+            if node.id not in NAMES and node.id != "window":
+                raise ValueError(f"Unknown name {node.id!r} in screen {self.expression!r}")
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords \
+                    or len(node.args) > 1:
+                raise ValueError(f"Unsupported call in screen {self.expression!r}")
+            for arg in node.args:
+                self._check(arg)
+            return
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+                raise ValueError(f"Unsupported constant {node.value!r} in screen {self.expression!r}")
+        elif isinstance(node, (ast.BinOp, ast.Compare)):
+            ops = node.ops if isinstance(node, ast.Compare) else [node.op]
+            if any(type(op) not in _OPERATORS for op in ops):
+                raise ValueError(f"Unsupported operator in screen {self.expression!r}")
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, (ast.Not, ast.USub)):
+                raise ValueError(f"Unsupported operator in screen {self.expression!r}")
+        elif not isinstance(node, ast.BoolOp):
+            raise ValueError(f"Unsupported syntax in screen {self.expression!r}")
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.expr):
+                self._check(child)
+
+    def __call__(self, summary, window=15, columns=None):
+        # columns is an optional dict shared between screens so each summary
+        # column is only read (and decoded) once per evaluation pass
+        columns = {} if columns is None else columns
+
+        def column(name):
+            if name not in columns:
+                columns[name] = np.asarray(summary[name])
+            return columns[name]
+
+        def value(node):
+            if isinstance(node, ast.Constant):
+                return node.value
+            if isinstance(node, ast.Name):
+                return window if node.id == "window" else column(NAMES[node.id])
+            if isinstance(node, ast.Call):
+                n = int(value(node.args[0])) if node.args else window
+                if n > window:
+                    raise ValueError(f"{node.func.id}({n}) looks further back than the "
+                                     f"{window}-session crossover window")
+                sessions = column(FUNCTIONS[node.func.id])
+                return (sessions >= 0) & (sessions <= n)
+            if isinstance(node, ast.UnaryOp):
+                operand = value(node.operand)
+                return -operand if isinstance(node.op, ast.USub) else np.logical_not(operand)
+            if isinstance(node, ast.BoolOp):
+                combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+                result = value(node.values[0])
+                for other in node.values[1:]:
+                    result = combine(result, value(other))
+                return result
+            if isinstance(node, ast.BinOp):
+                return _OPERATORS[type(node.op)](value(node.left), value(node.right))
+            # Chained comparisons: a < b < c is a < b and b < c
+            left, result = value(node.left), True
+            for op, right in zip(node.ops, node.comparators):
+                right = value(right)
+                with np.errstate(invalid="ignore"):
+                    result = np.logical_and(result, _OPERATORS[type(op)](left, right))
+                left = right
+            return result
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mask = value(self.tree)
+        return np.broadcast_to(np.asarray(mask, dtype=bool), (len(summary),))
+
+
+def evaluate(screens, summary, window=15):
+    # Masks for a {name: expression or Screen} mapping, in one pass that
+    # reads each summary column once however many screens use it
+    columns = {}
+    return {name: (screen if isinstance(screen, Screen) else Screen(screen))(summary, window, columns)
+            for name, screen in screens.items()}
+
+
+def load_screens(path):
+    # Screens from a text file of "name: expression" lines; blank lines and
+    # lines starting with # are ignored, and a line without a name is named
+    # after its expression
+    screens = {}
+    with open(path, 'r') as f:
+        for line in f.read().splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, _, expression = line.partition(":") if ":" in line else (line, "", line)
+            screens[name.strip()] = Screen(expression.strip())
+    return screens
@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from screener.cache import PriceCache, fetch_panel_cached, refresh_cache
+from screener.calendars import last_closed_session
+from screener.cli import eligible, print_categories, read_universe, write_outputs
+from screener.profiles import PROFILES
+from screener.state import save_json
+from screener.summary import VALUE_DTYPE, SummaryBuffer, summarize_panel
+
+# Calendar-aware runs of a screener profile.  The offline exchange calendar
+# says which daily bar is the newest that can exist, so on weekends,
+# holidays, before the close or when the profile already ran for the
+# session nothing is downloaded, recomputed or written.  Otherwise only the
+# tickers whose cached history moved past what the last run used are
+# requested and recomputed; everyone else keeps their previous summary row.
+#
+#   screener_schedule.json            per profile: the session it last ran for,
+#                                     the settings and each ticker's last bar
+#   screener_schedule_<profile>.npy   the summary rows of that run
+
+SCHEDULE_FILE = "screener_schedule.json"
+
+
+def _rows_file(path, profile):
+    return f"{os.path.splitext(path)[0]}_{profile}.npy"
+
+
+def _save_rows(records, path):
+    # Symbols are saved as a fixed-width string field so the file loads
+    # without pickle
+    width = max([len(s) for s in records['Symbol']] + [1])
+    dtype = np.dtype([('Symbol', f'U{width}')] + [(name, VALUE_DTYPE[name]) for name in VALUE_DTYPE.names])
+    np.save(path, records.astype(dtype))
+
+
+def _load(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def run_scheduled(profile="sma23", universe="stocks.txt", period=None, window=15, indicators=None,
+                  formats=None, provider=None, now=None, force=False, path=SCHEDULE_FILE, cache=None):
+    # Run one daily profile only as far as the data moved since its last
+    # run.  Returns the summary table, or None when the run was skipped.
+    settings = PROFILES[profile]
+    period = period or settings["period"]
+    if period == "auto":
+        raise ValueError("Scheduled runs need a fixed --period, not auto")
+    indicators = settings["indicators"] if indicators is None else indicators
+    stocks = read_universe(universe)
+    session = last_closed_session(now)
+    config = {"universe": stocks, "period": period, "window": window, "indicators": indicators,
+              "formats": formats}
+
+    states = _load(path)
+    previous = states.get(profile)
+    if previous is not None and previous["config"] != config:
+        previous = None
+    if previous is not None and not force and previous["session"] == f"{session:%Y-%m-%d}" \
+            and previous["complete"]:
+        print(f"Nothing new since the {session:%Y-%m-%d} close; {profile} outputs are up to date.")
+        return None
+
+    # Only tickers without the session's bar are requested
+    cache = cache or PriceCache()
+    refresh_cache(stocks, period=period, cache=cache, provider=provider, session=session)
+    # A ticker only counts as current for the session once its bar for it
+    # was fetched after the close (see PriceCache.settled_date), so a
+    # partial bar cached by an earlier run is never taken as final
+    bars = {}
+    for stock in stocks:
+        last = cache.settled_date(stock)
+        bars[stock] = None if last is None else f"{last:%Y-%m-%d}"
+    old = None
+    if previous is not None and not force and os.path.exists(_rows_file(path, profile)):
+        old = SummaryBuffer.from_records(np.load(_rows_file(path, profile)))
+    changed = [s for s in stocks if old is None or bars[s] != previous["bars"].get(s)]
+
+    if old is not None and not changed:
+        print(f"No ticker has a bar newer than the last run; {profile} outputs left as they are.")
+        fresh = None
+    else:
+        print(f"Recomputing {len(changed)} of {len(stocks)} tickers")
+        panel = fetch_panel_cached(changed, period=period, cache=cache, provider=provider, session=session)
+        # Bars of a session still in progress belong to a later run
+        panel = panel[panel.index <= session] if not panel.empty else panel
+        counts = panel["Close"].notna().sum() if not panel.empty else {}
+        screened = eligible(changed, counts, settings["min_bars"])
+        fresh = summarize_panel(panel, screened, window=window, indicators=indicators)
+
+    states[profile] = {
+        "session": f"{session:%Y-%m-%d}",
+        # Every ticker already has the session's bar, so later runs for the
+        # same session can stop before looking at the cache
+        "complete": all(b is not None and b >= f"{session:%Y-%m-%d}" for b in bars.values()),
+        "config": config,
+        "bars": bars,
+    }
+    if fresh is None:
+        save_json(states, path, indent=1)
+        return None
+
+    # Fresh rows replace the old ones; tickers that changed but no longer
+    # qualify drop out
+    pool = fresh.records if old is None else np.concatenate([old.records, fresh.records])
+    where = {symbol: i for i, symbol in enumerate(pool['Symbol'])}
+    recomputed = set(fresh['Symbol'])
+    changed = set(changed)
+    keep = [where[s] for s in stocks if s in recomputed or (s in where and s not in changed)]
+    records = SummaryBuffer.from_records(pool[keep])
+
+    print_categories(records, settings, window)
+    write_outputs(records, settings, formats, window)
+    _save_rows(records.records, _rows_file(path, profile))
+    save_json(states, path, indent=1)
+    return records.table()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a screener profile only when new daily bars exist")
+    parser.add_argument("--profile", default="sma23", choices=sorted(PROFILES),
+                        help="which historical sma*.py script to reproduce (default: sma23)")
+    parser.add_argument("--universe", default="stocks.txt", help="file with one ticker per line")
+    parser.add_argument("--period", help="lookback such as 1y or 2y (default: the profile's)")
+    parser.add_argument("--window", type=int, default=15, help="crossover lookback in sessions")
+    parser.add_argument("--indicators", help="comma-separated indicators, e.g. 50dma,200dma,RSI")
+    parser.add_argument("--formats", help="comma-separated outputs: csv,xlsx,parquet")
+    parser.add_argument("--force", action="store_true", help="recompute every ticker and rewrite the outputs")
+    parser.add_argument("--state", default=SCHEDULE_FILE, help=f"schedule state file (default: {SCHEDULE_FILE})")
+    args = parser.parse_args(argv)
+    run_scheduled(args.profile, args.universe, args.period, args.window,
+                  indicators=args.indicators.split(",") if args.indicators else None,
+                  formats=args.formats.split(",") if args.formats else None,
+                  force=args.force, path=args.state)
+
+
+if __name__ == "__main__":
+    main()
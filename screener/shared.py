@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# A (dates, tickers) float64 price matrix in shared memory, for process-pool
+# stages.  The owner copies the prices in once; workers attach by name and
+# get a NumPy view of the same pages, so only the block name, its shape and
+# a column range travel to each task.
+
+
+class SharedPrices:
+
+    def __init__(self, block, shape, symbols=None, owner=False):
+        self.block = block
+        self.shape = tuple(shape)
+        self.symbols = list(symbols) if symbols is not None else None
+        # Column of each ticker, so workers and callers can find one by name
+        self.index = {s: j for j, s in enumerate(self.symbols)} if self.symbols is not None else None
+        self.owner = owner
+        self.values = np.ndarray(self.shape, dtype=np.float64, buffer=block.buf)
+
+    @classmethod
+    def create(cls, values, symbols=None):
+        values = np.asarray(values, dtype=np.float64)
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        shared = cls(block, values.shape, symbols, owner=True)
+        shared.values[:] = values
+        return shared
+
+    @classmethod
+    def attach(cls, name, shape, symbols=None):
+        return cls(shared_memory.SharedMemory(name=name), shape, symbols)
+
+    @property
+    def name(self):
+        return self.block.name
+
+    def column(self, symbol):
+        return self.values[:, self.index[symbol]]
+
+    def close(self):
+        # Views must be dropped before the block can be closed
+        self.values = None
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _run_columns(task):
+    # Pool worker: attach, run func on the column range, detach
+    func, name, shape, lo, hi, args = task
+    shared = SharedPrices.attach(name, shape)
+    try:
+        return func(shared.values[:, lo:hi], *args)
+    finally:
+        shared.close()
+
+
+def map_columns(func, shared, args=(), workers=None, pieces_per_worker=4):
+    # Call func(values[:, lo:hi], *args) over column ranges of a SharedPrices
+    # block on a process pool and return the results in column order.  func
+    # must be a module-level function so the pool can find it by name, and
+    # must return something small (per-ticker results, not whole matrices)
+    # that does not point into values: the block is detached before the
+    # result is pickled back.
+    workers = workers or os.cpu_count() or 1
+    k = shared.shape[1]
+    # A few ranges per worker so uneven ranges even out
+    edges = np.linspace(0, k, min(k, workers * pieces_per_worker) + 1).astype(int)
+    tasks = [(func, shared.name, shared.shape, lo, hi, args)
+             for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_columns, tasks))
@@ -0,0 +1,322 @@
+import json
+import math
+import os
+from collections import deque
+
+import numpy as np
+
+from screener.cache import PriceCache, fetch_panel_cached, refresh_cache
+from screener.calendars import last_closed_session
+from screener.crossover import crossovers
+from screener.summary import _row
+
+STATE_FILE = 'moving_average_state.json'
+
+# Sessions kept for the 15-session crossover scan (15 plus the current one)
+RECENT_SESSIONS = 16
+WINDOW = RECENT_SESSIONS - 1
+
+
+def _nan_to_none(value):
+    return None if value is None or math.isnan(value) else value
+
+
+def _none_to_nan(value):
+    return math.nan if value is None else value
+
+
+def bar_key(date):
+    # Key a bar is stored and compared under: the day for daily bars, the
+    # full timestamp for intraday ones
+    if date is None:
+        return None
+    text = str(date).replace("T", " ")
+    return text[:10] if not text[10:19].strip(" 0:") else text
+
+
+class RollingWindow:
+    # Fixed-size ring buffer with a running sum, for O(1) rolling means.  The
+    # sum is rebuilt from the buffer once per full turn of the ring so that
+    # rounding error from the add/subtract updates cannot build up.
+
+    def __init__(self, size):
+        self.size = size
+        self.buffer = [0.0] * size
+        self.count = 0
+        self.total = 0.0
+
+    def push(self, value):
+        slot = self.count % self.size
+        if self.count >= self.size:
+            self.total -= self.buffer[slot]
+        self.buffer[slot] = value
+        self.total += value
+        self.count += 1
+        if slot == self.size - 1:
+            self.total = math.fsum(self.buffer)
+
+    def mean(self, min_periods=None):
+        min_periods = self.size if min_periods is None else min_periods
+        n = min(self.count, self.size)
+        if n < max(min_periods, 1):
+            return math.nan
+        return self.total / n
+
+    def values(self):
+        # Buffered values, oldest first
+        n = min(self.count, self.size)
+        return [self.buffer[(self.count - n + k) % self.size] for k in range(n)]
+
+    def to_dict(self):
+        return {"count": self.count, "values": self.values()}
+
+    @classmethod
+    def from_dict(cls, size, d):
+        window = cls(size)
+        values = d["values"]
+        window.count = d["count"] - len(values)
+        for value in values:
+            slot = window.count % size
+            window.buffer[slot] = value
+            window.count += 1
+        window.total = math.fsum(values)
+        return window
+
+
+class IndicatorState:
+    # Everything needed to advance the summary indicators of one ticker by a
+    # bar in constant time: SMA 50/200 windows, EMA 12/26/50/200 and the MACD
+    # signal, the RSI gain/loss windows and the last window + 1 sessions of
+    # close/50DMA/200DMA for the crossover scan
+
+    EMA_SPANS = (12, 26, 50, 200)
+    SIGNAL_SPAN = 9
+    RSI_PERIOD = 14
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.last_date = None
+        self.last_close = math.nan
+        self.sma50 = RollingWindow(50)
+        self.sma200 = RollingWindow(200)
+        self.ema = {span: math.nan for span in self.EMA_SPANS}
+        self.signal = math.nan
+        self.gains = RollingWindow(self.RSI_PERIOD)
+        self.losses = RollingWindow(self.RSI_PERIOD)
+        self.recent = deque(maxlen=window + 1)
+
+    @staticmethod
+    def _ema_step(weighted, value, span):
+        # Series.ewm(span, adjust=False).mean() update, in pandas' arithmetic
+        if math.isnan(weighted):
+            return value
+        if weighted == value:
+            return weighted
+        alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+        return ((1.0 - alpha) * weighted + alpha * value) / ((1.0 - alpha) + alpha)
+
+    def update(self, date, close):
+        # Apply one new bar; bars at or before last_date are ignored so the
+        # same download can be replayed safely
+        date = bar_key(date)
+        if self.last_date is not None and date is not None and date <= self.last_date:
+            return False
+
+        delta = close - self.last_close
+        self.gains.push(delta if delta > 0 else 0.0)
+        self.losses.push(-delta if delta < 0 else 0.0)
+
+        self.sma50.push(close)
+        self.sma200.push(close)
+        for span in self.EMA_SPANS:
+            self.ema[span] = self._ema_step(self.ema[span], close, span)
+        self.signal = self._ema_step(self.signal, self.macd, self.SIGNAL_SPAN)
+
+        self.recent.append((close, self.sma50.mean(), self.sma200.mean()))
+        self.last_close = close
+        self.last_date = date
+        return True
+
+    @property
+    def macd(self):
+        return self.ema[12] - self.ema[26]
+
+    @property
+    def rsi(self):
+        avg_gain = self.gains.mean(min_periods=1)
+        avg_loss = self.losses.mean(min_periods=1)
+        # Follow the float division in calculate_rsi: x/0 is inf and 0/0 is NaN
+        if avg_loss == 0:
+            rs = math.inf if avg_gain > 0 else math.nan
+        else:
+            rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def latest(self):
+        # Latest indicator values, keyed like the summary's INDICATORS
+        return {
+            'Close': self.last_close,
+            '50dma': self.sma50.mean(),
+            '200dma': self.sma200.mean(),
+            '50EMA': self.ema[50],
+            '200EMA': self.ema[200],
+            'MACD': self.macd,
+            'Signal': self.signal,
+            'RSI': self.rsi,
+        }
+
+    def crossovers(self, window=None):
+        # Crosses within window sessions; at most the window it was built for
+        window = self.window if window is None else window
+        if window > self.window:
+            raise ValueError(f"State keeps {self.window} sessions, not {window}")
+        close, dma50, dma200 = (np.array(column) for column in zip(*self.recent))
+        return crossovers(close, dma50, dma200, window=window)
+
+    @classmethod
+    def from_history(cls, dates, close, dma50, dma200, ema, signal, window=WINDOW):
+        # The state update() would reach after replaying a ticker's whole
+        # history, built from indicator arrays already computed over it
+        # (engine.sma/ema/macd over its valid bars) instead of bar by bar.
+        # ema maps each of EMA_SPANS to its last value.
+        close = np.asarray(close, dtype=float)
+        n = len(close)
+        state = cls(window)
+        if n == 0:
+            return state
+        state.last_date = bar_key(dates[-1])
+        state.last_close = float(close[-1])
+        state.sma50 = RollingWindow.from_dict(50, {"count": n, "values": close[-50:].tolist()})
+        state.sma200 = RollingWindow.from_dict(200, {"count": n, "values": close[-200:].tolist()})
+        state.ema = {span: float(ema[span]) for span in cls.EMA_SPANS}
+        state.signal = float(signal)
+        # The first bar has no previous close and counts as neither
+        delta = np.diff(close, prepend=np.nan)
+        gains = np.where(delta > 0, delta, 0.0)[-cls.RSI_PERIOD:]
+        losses = np.where(delta < 0, -delta, 0.0)[-cls.RSI_PERIOD:]
+        state.gains = RollingWindow.from_dict(cls.RSI_PERIOD, {"count": n, "values": gains.tolist()})
+        state.losses = RollingWindow.from_dict(cls.RSI_PERIOD, {"count": n, "values": losses.tolist()})
+        keep = window + 1
+        state.recent.extend(zip(close[-keep:].tolist(), np.asarray(dma50)[-keep:].tolist(),
+                                np.asarray(dma200)[-keep:].tolist()))
+        return state
+
+    def to_dict(self):
+        return {
+            "window": self.window,
+            "last_date": self.last_date,
+            "last_close": _nan_to_none(self.last_close),
+            "sma50": self.sma50.to_dict(),
+            "sma200": self.sma200.to_dict(),
+            "ema": {str(span): _nan_to_none(v) for span, v in self.ema.items()},
+            "signal": _nan_to_none(self.signal),
+            "gains": self.gains.to_dict(),
+            "losses": self.losses.to_dict(),
+            "recent": [[_nan_to_none(v) for v in row] for row in self.recent],
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        # States saved before the window was stored kept 15 sessions
+        state = cls(d.get("window", WINDOW))
+        state.last_date = d["last_date"]
+        state.last_close = _none_to_nan(d["last_close"])
+        state.sma50 = RollingWindow.from_dict(50, d["sma50"])
+        state.sma200 = RollingWindow.from_dict(200, d["sma200"])
+        state.ema = {int(span): _none_to_nan(v) for span, v in d["ema"].items()}
+        state.signal = _none_to_nan(d["signal"])
+        state.gains = RollingWindow.from_dict(cls.RSI_PERIOD, d["gains"])
+        state.losses = RollingWindow.from_dict(cls.RSI_PERIOD, d["losses"])
+        state.recent.extend(tuple(_none_to_nan(v) for v in row) for row in d["recent"])
+        return state
+
+
+def load_states(path=STATE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        raw = json.load(f)
+    return {ticker: IndicatorState.from_dict(d) for ticker, d in raw.items()}
+
+
+def save_json(data, path, indent=None):
+    # Write to a temporary file first so an interrupted run keeps the old file
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+
+def save_states(states, path=STATE_FILE):
+    save_json({ticker: state.to_dict() for ticker, state in states.items()}, path)
+
+
+def update_states(states, panel, stocks, window=WINDOW):
+    # Advance each ticker's state with the bars in panel that are newer than
+    # what it has already seen.  Tickers without state are seeded by
+    # replaying their full history.  Returns the tickers that changed.
+    changed = []
+    if panel.empty:
+        return changed
+    close = panel['Close']
+    for stock in stocks:
+        if stock not in close.columns:
+            continue
+        state = states.setdefault(stock, IndicatorState(window))
+        series = close[stock].dropna()
+        if state.last_date is not None:
+            series = series[series.index.strftime('%Y-%m-%d') > state.last_date]
+        applied = False
+        for date, value in zip(series.index.strftime('%Y-%m-%d'), series.to_numpy(dtype=float)):
+            applied = state.update(date, value) or applied
+        if applied:
+            changed.append(stock)
+    return changed
+
+
+def advance_states(stocks, period="1y", path=STATE_FILE, window=WINDOW, cache=None, provider=None, now=None):
+    # Daily incremental run: bring each ticker's saved state up to the last
+    # closed session (see screener.calendars) and save it back.  Tickers
+    # with state read only the bars cached after their last update; new
+    # ones, and ones saved for a shorter crossover window, are seeded from
+    # their period of history.  A state cannot take a bar back, so only
+    # final bars are applied: none of a session still in progress, and not
+    # a closed session's bar that was fetched before the close and could
+    # not be fetched again (see PriceCache.settled_date).
+    session = last_closed_session(now)
+    states = load_states(path)
+    cache = cache or PriceCache()
+    refresh_cache(stocks, period=period, cache=cache, provider=provider, session=session)
+    through = {}
+    for stock in stocks:
+        settled = cache.settled_date(stock)
+        through[stock] = None if settled is None else min(settled, session)
+    new = [s for s in stocks if s not in states or states[s].window < window]
+    for stock in new:
+        states.pop(stock, None)
+    if new:
+        panel = fetch_panel_cached(new, period=period, cache=cache, provider=provider, session=session)
+        if not panel.empty:
+            panel = panel[panel.index <= session].copy()
+            for stock in new:
+                if stock in panel['Close'].columns and through[stock] != session:
+                    cutoff = through[stock]
+                    late = panel.index > cutoff if cutoff is not None else np.ones(len(panel), dtype=bool)
+                    panel.loc[late, ('Close', stock)] = np.nan
+            update_states(states, panel, new, window)
+    for stock in stocks:
+        if stock in new or stock not in states or through[stock] is None:
+            continue
+        state = states[stock]
+        bars = cache.load(stock, start=state.last_date)
+        bars = bars[bars.index <= through[stock]] if not bars.empty else bars
+        for date, close in zip(bars.index.strftime('%Y-%m-%d'), bars['Close'].to_numpy(dtype=float)):
+            state.update(date, close)
+    save_states(states, path)
+    return states
+
+
+def summarize_states(states, stocks, window=WINDOW):
+    # stocks_summary rows straight from the saved state, without history
+    return [_row(stock, states[stock].latest(), states[stock].crossovers(window))
+            for stock in stocks if stock in states]
@@ -0,0 +1,212 @@
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+
+from screener.cache import COLUMNS, window_mask
+from screener.engine import align_right
+from screener.fetch import FIELDS
+from screener.instrument import stage
+from screener.summary import SummaryBuffer, latest_indicators
+
+# On-disk columnar price history: one memory-mapped (dates, tickers) float64
+# .npy file per OHLCV field, plus the date and ticker axes.  Arrays are laid
+# out column-major, so one ticker's whole history (or a block of adjacent
+# tickers) is a contiguous run of the file.  Readers only page in the blocks
+# they touch, which keeps memory flat however many tickers the store holds.
+#
+#   <dir>/dates.npy       datetime64[ns] date axis
+#   <dir>/tickers.txt     ticker axis, one symbol per line like stocks.txt
+#   <dir>/<field>.npy     one array per field, e.g. close.npy, adj_close.npy
+
+# File name of each field, the same names the SQLite cache uses
+FIELD_FILES = dict(zip(FIELDS, COLUMNS))
+
+
+class ColumnStore:
+
+    def __init__(self, directory, mode="r"):
+        self.directory = directory
+        self.mode = mode
+        self.dates = pd.DatetimeIndex(np.load(os.path.join(directory, "dates.npy")), name="Date")
+        with open(os.path.join(directory, "tickers.txt")) as f:
+            self.tickers = f.read().splitlines()
+        self.index = {t: j for j, t in enumerate(self.tickers)}
+        self.fields = {}
+
+    @classmethod
+    def create(cls, directory, dates, tickers):
+        # Allocate an empty (all-NaN) store for the given axes
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "dates.npy"), pd.DatetimeIndex(dates).to_numpy(dtype="datetime64[ns]"))
+        with open(os.path.join(directory, "tickers.txt"), "w") as f:
+            f.write("".join(f"{t}\n" for t in tickers))
+        for name in FIELD_FILES.values():
+            array = np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode="w+",
+                                              dtype=np.float64, shape=(len(dates), len(tickers)),
+                                              fortran_order=True)
+            array[:] = np.nan
+            array.flush()
+            del array
+        return cls(directory, mode="r+")
+
+    @classmethod
+    def write(cls, directory, panel):
+        # Store a whole fetch_panel result
+        tickers = list(dict.fromkeys(panel.columns.get_level_values(1)))
+        store = cls.create(directory, panel.index, tickers)
+        for field in FIELDS:
+            if field in panel.columns.get_level_values(0):
+                store.field(field)[:] = panel[field].reindex(columns=tickers).to_numpy(dtype=float)
+        store.flush()
+        return store
+
+    def field(self, name):
+        # The memory-mapped (dates, tickers) array of one field, opened on first use
+        if name not in self.fields:
+            path = os.path.join(self.directory, f"{FIELD_FILES[name]}.npy")
+            self.fields[name] = np.load(path, mmap_mode=self.mode)
+        return self.fields[name]
+
+    def put(self, ticker, frame):
+        # Write one ticker's bars (a ticker_frame / PriceCache.load frame)
+        rows = self.dates.get_indexer(frame.index)
+        found = rows >= 0
+        j = self.index[ticker]
+        for name in FIELDS:
+            if name in frame.columns:
+                self.field(name)[rows[found], j] = frame[name].to_numpy(dtype=float)[found]
+
+    def flush(self):
+        for array in self.fields.values():
+            if self.mode != "r":
+                array.flush()
+
+    def blocks(self, name="Close", tickers=None, block=256):
+        # Yield (tickers, values) for consecutive blocks of tickers.  values
+        # is a view of one scratch buffer that is reused for every block, so
+        # callers must copy anything they keep past the next iteration.
+        tickers = self.tickers if tickers is None else list(tickers)
+        source = self.field(name)
+        # Pages already copied out are handed back to the OS, so a full pass
+        # over a read-only store does not leave the whole file resident
+        mapping = getattr(source, "_mmap", None) if self.mode == "r" else None
+        scratch = np.empty((len(self.dates), min(block, len(tickers))), order="F")
+        for offset in range(0, len(tickers), block):
+            names = tickers[offset:offset + block]
+            out = scratch[:, :len(names)]
+            # Column by column: each one is a contiguous run of the file
+            for i, name in enumerate(names):
+                out[:, i] = source[:, self.index[name]]
+            if mapping is not None and hasattr(mmap, "MADV_DONTNEED"):
+                mapping.madvise(mmap.MADV_DONTNEED)
+            yield names, out
+
+    def counts(self, tickers=None, block=256):
+        # Number of bars per ticker, without loading the whole field
+        return pd.Series({t: n for names, values in self.blocks("Close", tickers, block)
+                          for t, n in zip(names, (~np.isnan(values)).sum(axis=0).tolist())}, dtype=int)
+
+    def panel(self, tickers=None):
+        # Materialize a fetch_panel-style panel, for code that needs one
+        tickers = self.tickers if tickers is None else list(tickers)
+        columns = [self.index[t] for t in tickers]
+        data = {name: pd.DataFrame(self.field(name)[:, columns], index=self.dates, columns=tickers)
+                for name in FIELDS}
+        panel = pd.concat(data, axis=1)
+        panel.columns = panel.columns.set_names(["Price", "Ticker"])
+        return panel
+
+
+def store_from_cache(cache, tickers, directory, period="1y", interval="1d", start=None):
+    # Build a store for tickers from a PriceCache one ticker at a time, so
+    # the whole universe is never held in memory at once.  The window is
+    # the one fetch_panel_cached would return.  A store already in directory
+    # whose dates lead into the window is brought up to date instead: in
+    # place when the axes are unchanged, else by copying its bars onto the
+    # new axes.  Either way each ticker then reads only the cached bars from
+    # its newest stored one on, which is read again as it may have been a
+    # snapshot taken mid-session.
+    tickers = [t for t in dict.fromkeys(tickers) if cache.last_date(t, interval) is not None]
+    dates = cache.dates(tickers, interval)
+    if len(dates):
+        dates = dates[window_mask(dates, period, start, dates[-1])]
+    old = _reusable(directory, dates)
+    if old is not None and old.dates.equals(dates) and old.tickers == tickers:
+        store = ColumnStore(directory, mode="r+")
+    else:
+        staging = directory.rstrip(os.sep) + ".new"
+        store = ColumnStore.create(staging, dates, tickers)
+        if old is not None:
+            _copy_bars(old, store)
+            old.fields.clear()
+        store.flush()
+        del store
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(staging):
+            os.replace(os.path.join(staging, name), os.path.join(directory, name))
+        os.rmdir(staging)
+        store = ColumnStore(directory, mode="r+")
+
+    last = _last_rows(store) if old is not None else {}
+    for ticker in tickers:
+        row = last.get(ticker, -1)
+        store.put(ticker, cache.load(ticker, interval, start=dates[max(row, 0)] if len(dates) else None))
+    store.flush()
+    return store
+
+
+def _reusable(directory, dates):
+    # The store in directory when the window's dates start with its dates
+    # from the window's first one on, else None
+    if not len(dates) or not os.path.exists(os.path.join(directory, "dates.npy")):
+        return None
+    old = ColumnStore(directory)
+    kept = old.dates[old.dates >= dates[0]]
+    if not len(kept) or old.dates[0] > dates[0] or not dates[:len(kept)].equals(kept):
+        return None
+    return old
+
+
+def _copy_bars(old, store):
+    # Copy the bars of the tickers both stores hold, for the dates they
+    # share, a column at a time
+    rows = len(old.dates) - (old.dates >= store.dates[0]).sum()
+    shared = [t for t in store.tickers if t in old.index]
+    for name in FIELDS:
+        source, target = old.field(name), store.field(name)
+        for ticker in shared:
+            target[:len(old.dates) - rows, store.index[ticker]] = source[rows:, old.index[ticker]]
+
+
+def _last_rows(store, block=256):
+    # Row of each ticker's newest bar, -1 for tickers without any
+    last = {}
+    for tickers, closes in store.blocks("Close", block=block):
+        valid = ~np.isnan(closes)
+        rows = len(closes) - 1 - valid[::-1].argmax(axis=0)
+        last.update(zip(tickers, np.where(valid.any(axis=0), rows, -1).tolist()))
+    return last
+
+
+def summarize_store(store, stocks, window=15, indicators=None, bars=None, block=256, stats=None):
+    # summarize_panel over a ColumnStore, block by block: each block of
+    # closes is copied into the store's scratch buffer and reduced to the
+    # latest indicator values, which go straight into one preallocated
+    # SummaryBuffer, so memory depends on the block size rather than the
+    # universe.  bars keeps only each ticker's last bars sessions (as
+    # trim_bars does).
+    names = None if indicators is None else sorted(set(indicators) | {'50dma', '200dma'})
+    records = SummaryBuffer(len(stocks))
+    for tickers, closes in store.blocks("Close", stocks, block):
+        with stage(stats, 'indicators'):
+            values = align_right(closes)
+            if bars is not None:
+                values = values[-bars:]
+            latest, crosses = latest_indicators(values, names, window)
+        with stage(stats, 'rows'):
+            keep = np.flatnonzero(~np.isnan(latest['Close']))
+            records.extend([tickers[j] for j in keep], {name: column[keep] for name, column in latest.items()},
+                           {name: ago[keep] for name, ago in crosses.items()})
+    return records
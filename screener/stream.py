@@ -0,0 +1,81 @@
+import asyncio
+import sys
+
+from screener.cli import read_universe
+from screener.fetch import YahooProvider, _as_panel, ticker_frame
+from screener.instrument import stage
+from screener.summary import summarize, write_csv, write_xlsx
+
+# Marks the end of the download stream on the queue
+_DONE = object()
+
+
+async def stream_frames(tickers, provider=None, period="1y", interval="1d",
+                        concurrency=8, queue_size=32, stats=None):
+    # Yield (index, ticker, data) as soon as each ticker's bars arrive, in
+    # completion order.  concurrency downloads run at once on worker threads
+    # and the queue holds at most queue_size finished frames, so workers stop
+    # downloading while the consumer is behind and memory stays bounded no
+    # matter how large the universe is.
+    provider = provider or YahooProvider()
+    queue = asyncio.Queue(maxsize=queue_size)
+    pending = iter(enumerate(tickers))
+
+    def download(ticker):
+        with stage(stats, 'download', ticker):
+            return provider.download(ticker, period=period, interval=interval)
+
+    async def worker():
+        for index, ticker in pending:
+            try:
+                raw = await asyncio.to_thread(download, ticker)
+                data = ticker_frame(_as_panel(raw, [ticker]), ticker)
+            except Exception as e:
+                print(f"Warning: download failed for {ticker}: {e}")
+                continue
+            await queue.put((index, ticker, data))
+        await queue.put(_DONE)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        finished = 0
+        while finished < len(workers):
+            item = await queue.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            yield item
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+async def check_stocks_async(stocks_file, provider=None, concurrency=8, queue_size=32,
+                             csv_file='stocks_summary.csv', excel_file='stocks_summary.xlsx',
+                             stats=None):
+    # Async variant of sma23.check_stocks_combined: the indicators for one
+    # ticker are computed while the downloads for the next ones are in flight
+    stocks = read_universe(stocks_file)
+
+    rows = {}
+    async for index, stock, data in stream_frames(stocks, provider, concurrency=concurrency,
+                                                  queue_size=queue_size, stats=stats):
+        print(f"Processing stock: {stock}")
+        if data.empty:
+            print(f"Warning: No data available for {stock}. Skipping...")
+            continue
+        with stage(stats, 'indicators', stock):
+            rows[index] = summarize(stock, data)
+
+    # Write rows in stocks.txt order regardless of arrival order
+    csv_data = [rows[i] for i in sorted(rows)]
+    with stage(stats, 'export'):
+        if csv_file:
+            write_csv(csv_data, csv_file)
+        if excel_file:
+            write_xlsx(csv_data, excel_file)
+    return csv_data
+
+
+if __name__ == "__main__":
+    asyncio.run(check_stocks_async(sys.argv[1] if len(sys.argv) > 1 else 'stocks.txt'))
@@ -0,0 +1,471 @@
+import csv
+import math
+
+import numpy as np
+import pandas as pd
+
+from screener.crossover import crossover_arrays, crossovers
+from screener.engine import align_right, compute_indicators
+from screener.instrument import stage
+from screener.memo import column_digests, content_key
+
+# Column headers of stocks_summary.csv / stocks_summary.xlsx
+COLUMNS = [
+    "Symbol", "Current Price", "50EMA", "200EMA", "50DMA", "200DMA", "Trend (50DMA vs 200DMA)",
+    "Golden Cross Sessions Ago", "Above 50DMA Flag", "Above 200DMA Flag",
+    "Above 50DMA Last 15 Sessions", "Above 200DMA Last 15 Sessions",
+    "Below 50DMA Last 15 Sessions", "Below 200DMA Last 15 Sessions",
+    "MACD", "Signal", "MACD Trend", "RSI"
+]
+
+# Column types of the typed summary table; the rest are text
+FLOAT_COLUMNS = ["Current Price", "50EMA", "200EMA", "50DMA", "200DMA", "MACD", "Signal", "RSI"]
+FLAG_COLUMNS = ["Above 50DMA Flag", "Above 200DMA Flag"]
+SESSION_COLUMNS = [
+    "Golden Cross Sessions Ago",
+    "Above 50DMA Last 15 Sessions", "Above 200DMA Last 15 Sessions",
+    "Below 50DMA Last 15 Sessions", "Below 200DMA Last 15 Sessions",
+]
+
+# Indicator columns whose latest value goes into a summary row
+INDICATORS = ['Close', '50dma', '200dma', '50EMA', '200EMA', 'MACD', 'Signal', 'RSI']
+
+# Where each float column of a summary row comes from
+FLOAT_SOURCES = dict(zip(FLOAT_COLUMNS, ['Close', '50EMA', '200EMA', '50dma', '200dma', 'MACD', 'Signal', 'RSI']))
+# Which crossover each sessions-ago column reports
+SESSION_SOURCES = dict(zip(SESSION_COLUMNS, ['golden_cross', 'above_50dma', 'above_200dma',
+                                             'below_50dma', 'below_200dma']))
+
+# Bits of SummaryBuffer's flags field, and the Yes/No or Up/Down column each one backs
+FLAG_BITS = {
+    "Trend (50DMA vs 200DMA)": 1,
+    "Above 50DMA Flag": 2,
+    "Above 200DMA Flag": 4,
+    "MACD Trend": 8,
+}
+# One summary row: floats stay float64 so the files show the same digits,
+# the four Yes/No and Up/Down columns share one byte, and sessions-ago is
+# -1 where the row says "No"
+RECORD_DTYPE = np.dtype([('Symbol', object)] + [(c, 'f8') for c in FLOAT_COLUMNS] + [('flags', 'u1')] +
+                        [(c, 'i2') for c in SESSION_COLUMNS])
+# A summary row without its symbol, as screener.memo stores it
+VALUE_DTYPE = np.dtype([(name, RECORD_DTYPE[name]) for name in RECORD_DTYPE.names if name != 'Symbol'])
+
+
+def calculate_macd(data, fastperiod=12, slowperiod=26, signalperiod=9):
+    # Calculate MACD and Signal line using simple moving averages
+    data['EMA_fast'] = data['Close'].ewm(span=fastperiod, adjust=False).mean()
+    data['EMA_slow'] = data['Close'].ewm(span=slowperiod, adjust=False).mean()
+    data['MACD'] = data['EMA_fast'] - data['EMA_slow']
+    data['Signal'] = data['MACD'].ewm(span=signalperiod, adjust=False).mean()
+    return data
+
+
+def calculate_rsi(data, period=14):
+    # Calculate RSI using rolling window and price changes
+    delta = data['Close'].diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+
+    avg_gain = gain.rolling(window=period, min_periods=1).mean()
+    avg_loss = loss.rolling(window=period, min_periods=1).mean()
+
+    rs = avg_gain / avg_loss
+    data['RSI'] = 100 - (100 / (1 + rs))
+    return data
+
+
+def add_indicators(data):
+    # Calculate the 50-day and 200-day moving averages
+    data['50dma'] = data['Close'].rolling(window=50).mean()
+    data['200dma'] = data['Close'].rolling(window=200).mean()
+
+    # Calculate 50EMA and 200EMA
+    data['50EMA'] = data['Close'].ewm(span=50, adjust=False).mean()
+    data['200EMA'] = data['Close'].ewm(span=200, adjust=False).mean()
+
+    # Calculate MACD and RSI
+    data = calculate_macd(data)
+    data = calculate_rsi(data)
+    return data
+
+
+def _scalar(value):
+    # yf.download can return single-column frames, so lookups may give a Series
+    return value.item() if isinstance(value, pd.Series) else value
+
+
+def _or_no(sessions_ago):
+    return "No" if sessions_ago is None else sessions_ago
+
+
+def summarize(stock, data):
+    # Build one stocks_summary row from a ticker's daily bars
+    data = add_indicators(data)
+
+    # Get the latest stock price, moving averages, MACD and RSI
+    latest = {name: _scalar(data[name].iloc[-1]) for name in INDICATORS}
+
+    # Check for crossovers of price/50DMA, price/200DMA and 50DMA/200DMA in the last 15 sessions
+    crosses = crossovers(data['Close'], data['50dma'], data['200dma'], window=15)
+    return _row(stock, latest, crosses)
+
+
+def latest_indicators(values, names=None, window=15):
+    # What the summary rows need from a right-aligned (dates, tickers) close
+    # matrix: each indicator's latest value per ticker, and the crossover
+    # sessions-ago arrays
+    computed = compute_indicators(values, names)
+    crosses = crossover_arrays(values, computed['50dma'], computed['200dma'], window=window)
+    missing = np.full(values.shape[1], np.nan)
+    # Copies, since values may be a view of shared memory that is detached
+    # before the result is sent back
+    return {name: computed[name][-1].copy() if name in computed else missing for name in INDICATORS}, crosses
+
+
+def summarize_panel(panel, stocks, window=15, indicators=None, stats=None, workers=1, memo=None):
+    # Build the stocks_summary rows for every ticker in a fetch_panel result
+    # at once, as a SummaryBuffer, using the column-wise indicator engine
+    # instead of one DataFrame per ticker.  Tickers without data are left out.  indicators
+    # limits which indicator columns are computed; the rest are left NaN.
+    # With workers > 1 the indicator and crossover stages run on a process
+    # pool over a shared-memory copy of the closes (see screener.shared).
+    # stats is an optional screener.instrument.RunStats.  memo is an
+    # optional screener.memo.ResultCache: tickers whose closes and window
+    # match a stored row reuse it, and only the rest are computed.  Stored
+    # rows carry every indicator, so profiles with different indicator sets
+    # share them; the columns a profile does not compute are blanked after.
+    close = panel['Close'].reindex(columns=stocks) if not panel.empty else None
+    if close is None:
+        return SummaryBuffer()
+    values = align_right(close.to_numpy(dtype=float))
+    names = None if indicators is None else sorted(set(indicators) | {'50dma', '200dma'})
+    if memo is None:
+        return _summarize_values(values, stocks, names, window, stats, workers)
+
+    with stage(stats, 'memo'):
+        keep = np.flatnonzero(~np.isnan(values[-1]))
+        digests = column_digests(values[:, keep])
+        config = ('summary', window)
+        keys = [content_key(d, config) for d in digests]
+        stored = memo.get(keys)
+    todo = [i for i, key in enumerate(keys) if key not in stored]
+    if todo:
+        fresh = _summarize_values(values[:, keep[todo]], [stocks[keep[i]] for i in todo], None, window,
+                                  stats, workers)
+        packed = np.zeros(len(todo), dtype=VALUE_DTYPE)
+        for name in VALUE_DTYPE.names:
+            packed[name] = fresh.records[name]
+        stored.update({keys[i]: row.tobytes() for i, row in zip(todo, packed)})
+        with stage(stats, 'memo'):
+            memo.put({keys[i]: stored[keys[i]] for i in todo})
+
+    with stage(stats, 'rows'):
+        packed = np.frombuffer(b''.join(stored[key] for key in keys), dtype=VALUE_DTYPE)
+        records = SummaryBuffer(len(keep))
+        out = records.data
+        out['Symbol'] = [stocks[j] for j in keep]
+        for name in VALUE_DTYPE.names:
+            out[name] = packed[name]
+        records.size = len(keep)
+        if names is not None:
+            _blank_uncomputed(records.records, names)
+    return records
+
+
+def _blank_uncomputed(records, names):
+    # Make rows computed with every indicator look like ones computed with
+    # names only: compute_indicators always has the closes, and MACD and
+    # Signal come together
+    computed = set(names) | {'Close'}
+    if computed & {'MACD', 'Signal'}:
+        computed |= {'MACD', 'Signal'}
+    for column, name in FLOAT_SOURCES.items():
+        if name not in computed:
+            records[column] = np.nan
+    if 'MACD' not in computed:
+        records['flags'] &= ~np.uint8(FLAG_BITS["MACD Trend"])
+
+
+def _summarize_values(values, stocks, names, window, stats, workers):
+    # summarize_panel over a right-aligned close matrix
+    has_data = ~np.isnan(values[-1])
+    if workers > 1 and len(stocks) > 1:
+        # Only pooled runs need the process pool and shared memory modules
+        from screener.shared import SharedPrices, map_columns
+
+        # Both stages happen inside the workers, so they are timed as one
+        with stage(stats, 'indicators'):
+            with SharedPrices.create(values, stocks) as shared:
+                parts = map_columns(latest_indicators, shared, (names, window), workers=workers)
+            latest = {name: np.concatenate([part[0][name] for part in parts]) for name in INDICATORS}
+            crosses = {name: np.concatenate([part[1][name] for part in parts]) for name in parts[0][1]}
+    else:
+        with stage(stats, 'indicators'):
+            computed = compute_indicators(values, names)
+        with stage(stats, 'crossovers'):
+            crosses = crossover_arrays(values, computed['50dma'], computed['200dma'], window=window)
+        latest = {name: computed[name][-1] if name in computed else np.full(len(stocks), np.nan)
+                  for name in INDICATORS}
+
+    with stage(stats, 'rows'):
+        keep = np.flatnonzero(has_data)
+        records = SummaryBuffer(len(keep))
+        records.extend([stocks[j] for j in keep], {name: column[keep] for name, column in latest.items()},
+                       {name: ago[keep] for name, ago in crosses.items()})
+    return records
+
+
+def _row(stock, latest, crosses):
+    latest_price = latest['Close']
+    latest_50dma = latest['50dma']
+    latest_200dma = latest['200dma']
+    latest_macd = latest['MACD']
+    latest_signal = latest['Signal']
+
+    # Determine the trend based on the 50DMA and 200DMA
+    trend = "Up" if latest_50dma >= latest_200dma else "Down"
+
+    # Prepare the row for CSV and Excel
+    golden_cross_sessions_ago = _or_no(crosses['golden_cross'])
+    above_50dma_last_15_sessions = _or_no(crosses['above_50dma'])
+    above_200dma_last_15_sessions = _or_no(crosses['above_200dma'])
+    below_50dma_last_15_sessions = _or_no(crosses['below_50dma'])
+    below_200dma_last_15_sessions = _or_no(crosses['below_200dma'])
+
+    # Flags for latest price > 50DMA and 200DMA
+    flag_above_50dma = "Yes" if latest_price > latest_50dma else "No"
+    flag_above_200dma = "Yes" if latest_price > latest_200dma else "No"
+
+    # Determine MACD Trend (Up or Down)
+    macd_trend = "Up" if latest_macd > latest_signal else "Down"
+
+    return [
+        stock, latest_price, latest['50EMA'], latest['200EMA'], latest_50dma, latest_200dma, trend,
+        golden_cross_sessions_ago,
+        flag_above_50dma, flag_above_200dma,
+        above_50dma_last_15_sessions,
+        above_200dma_last_15_sessions,
+        below_50dma_last_15_sessions,
+        below_200dma_last_15_sessions,
+        latest_macd, latest_signal, macd_trend, latest['RSI']
+    ]
+
+
+def summary_table(rows):
+    # Typed version of the summary rows: float64 prices and indicators,
+    # booleans for the Yes/No flags and nullable Int64 sessions-ago, with
+    # <NA> where the row says "No"
+    table = pd.DataFrame(rows, columns=COLUMNS)
+    for column in COLUMNS:
+        if column in FLOAT_COLUMNS:
+            table[column] = table[column].astype('float64')
+        elif column in FLAG_COLUMNS:
+            table[column] = (table[column] == "Yes").astype('bool')
+        elif column in SESSION_COLUMNS:
+            table[column] = pd.array([None if v == "No" else v for v in table[column]], dtype='Int64')
+        else:
+            table[column] = table[column].astype('string')
+    return table
+
+
+class SummaryBuffer:
+    # The summary rows as one preallocated structured array (RECORD_DTYPE)
+    # instead of a list of mixed Python lists.  Rows are appended in place,
+    # a whole block of tickers at a time with extend(); the typed table and
+    # the CSV/Excel rows are both rendered from this buffer.  buffer[column]
+    # gives a column by its COLUMNS header, so the profile masks work on it.
+
+    def __init__(self, capacity=0):
+        self.data = np.zeros(capacity, dtype=RECORD_DTYPE)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def records(self):
+        return self.data[:self.size]
+
+    def _reserve(self, n):
+        if self.size + n > len(self.data):
+            grown = np.zeros(max(2 * len(self.data), self.size + n), dtype=RECORD_DTYPE)
+            grown[:self.size] = self.records
+            self.data = grown
+
+    def extend(self, stocks, latest, crosses):
+        # Append one row per stock from arrays of latest indicator values and
+        # crossover sessions-ago (-1 for none), as latest_indicators returns
+        n = len(stocks)
+        self._reserve(n)
+        out = self.data[self.size:self.size + n]
+        out['Symbol'] = stocks
+        for column, name in FLOAT_SOURCES.items():
+            out[column] = latest[name]
+        for column, name in SESSION_SOURCES.items():
+            out[column] = crosses[name]
+        price, dma50, dma200 = latest['Close'], latest['50dma'], latest['200dma']
+        # The same comparisons as _row, so NaN gives "Down" / "No"
+        with np.errstate(invalid='ignore'):
+            out['flags'] = (np.where(dma50 >= dma200, FLAG_BITS["Trend (50DMA vs 200DMA)"], 0)
+                            | np.where(price > dma50, FLAG_BITS["Above 50DMA Flag"], 0)
+                            | np.where(price > dma200, FLAG_BITS["Above 200DMA Flag"], 0)
+                            | np.where(latest['MACD'] > latest['Signal'], FLAG_BITS["MACD Trend"], 0))
+        self.size += n
+
+    def append(self, stock, latest, crosses):
+        # One row from _row-style scalars; sessions-ago may be None
+        self.extend([stock], {name: np.array([latest[name]], dtype=float) for name in INDICATORS},
+                     {name: np.array([-1 if ago is None else ago]) for name, ago in crosses.items()})
+
+    @classmethod
+    def from_rows(cls, rows):
+        # Buffer holding rows in the list format _row returns
+        buffer = cls(len(rows))
+        for row in rows:
+            values = dict(zip(COLUMNS, row))
+            buffer.data[buffer.size] = (
+                values['Symbol'], *[values[c] for c in FLOAT_COLUMNS],
+                sum(bit for c, bit in FLAG_BITS.items() if values[c] in ("Yes", "Up")),
+                *[-1 if values[c] == "No" else values[c] for c in SESSION_COLUMNS])
+            buffer.size += 1
+        return buffer
+
+    @classmethod
+    def from_records(cls, records):
+        # Buffer holding a copy of RECORD_DTYPE rows, e.g. a saved .records
+        buffer = cls(len(records))
+        buffer.data[:] = records
+        buffer.size = len(records)
+        return buffer
+
+    def __getitem__(self, column):
+        records = self.records
+        if column in FLAG_BITS:
+            return (records['flags'] & FLAG_BITS[column]) != 0
+        return records[column]
+
+    def table(self):
+        # Same typed DataFrame as summary_table(rows)
+        columns = {}
+        for column in COLUMNS:
+            if column in FLOAT_COLUMNS:
+                columns[column] = self[column].astype('float64')
+            elif column in SESSION_COLUMNS:
+                sessions = self[column].astype('int64')
+                columns[column] = pd.arrays.IntegerArray(sessions, sessions < 0)
+            elif column in FLAG_COLUMNS:
+                columns[column] = self[column]
+            elif column in FLAG_BITS:
+                columns[column] = pd.array(np.where(self[column], "Up", "Down"), dtype='string')
+            else:
+                columns[column] = pd.array(self[column], dtype='string')
+        return pd.DataFrame(columns)
+
+    def rows(self, columns=COLUMNS, extra=None):
+        # The CSV/Excel rows for the given columns.  extra maps any other
+        # column name to its already rendered values.
+        rendered = []
+        for column in columns:
+            if extra and column in extra:
+                rendered.append(list(extra[column]))
+            elif column in FLAG_COLUMNS:
+                rendered.append(np.where(self[column], "Yes", "No").tolist())
+            elif column in FLAG_BITS:
+                rendered.append(np.where(self[column], "Up", "Down").tolist())
+            elif column in SESSION_COLUMNS:
+                rendered.append([int(v) if v >= 0 else "No" for v in self[column].tolist()])
+            else:
+                rendered.append(self[column].tolist())
+        return [list(row) for row in zip(*rendered)]
+
+
+def render_rows(table, columns=COLUMNS):
+    # Turn a summary_table back into the Yes/No/"No"-or-int rows that the
+    # CSV and Excel files show, for the given columns
+    rendered = []
+    for column in columns:
+        values = table[column]
+        if column in FLAG_COLUMNS:
+            rendered.append(["Yes" if v else "No" for v in values])
+        elif column in SESSION_COLUMNS:
+            rendered.append(["No" if pd.isna(v) else int(v) for v in values])
+        elif column in FLOAT_COLUMNS:
+            rendered.append(list(values.to_numpy(dtype='float64')))
+        else:
+            rendered.append(list(values.astype(object)))
+    return [list(row) for row in zip(*rendered)]
+
+
+def write_columnar(table, path='stocks_summary.parquet'):
+    # Write the typed table as Parquet, or as uncompressed Arrow IPC for
+    # .arrow/.feather paths so readers can memory-map it.  Both need pyarrow,
+    # which is optional: without it the file is skipped with a warning.
+    try:
+        if path.endswith(('.arrow', '.feather')):
+            table.to_feather(path, compression='uncompressed')
+        else:
+            table.to_parquet(path, index=False)
+    except ImportError as e:
+        print(f"Warning: {path} not written: {e}")
+        return
+    print(f"Columnar file saved as {path}")
+
+
+def write_csv(rows, csv_file='stocks_summary.csv', columns=COLUMNS):
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    print(f"CSV file saved as {csv_file}")
+
+
+def _excel_value(value):
+    # Match DataFrame.to_excel: empty cells for NaN, text for infinities
+    if isinstance(value, (float, np.floating)):
+        if math.isnan(value):
+            return None
+        if math.isinf(value):
+            return 'inf' if value > 0 else '-inf'
+    return value
+
+
+def write_xlsx(rows, excel_file='stocks_summary.xlsx', columns=COLUMNS):
+    # Write the workbook in one streaming pass: openpyxl's write-only mode
+    # never holds the sheet in memory, and the styles, widths, filter and
+    # freeze pane are all set before the rows go out.  openpyxl is only
+    # imported here, so runs that write no workbook never load it.
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, NamedStyle
+    from openpyxl.utils import get_column_letter
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+
+    # Set font size to 14 and left-align all columns
+    wb.add_named_style(NamedStyle(name='summary', font=Font(size=14),
+                                  alignment=Alignment(horizontal='left')))
+
+    # Set column width to 20 for all columns
+    for i in range(1, len(columns) + 1):
+        ws.column_dimensions[get_column_letter(i)].width = 20
+
+    # Apply auto filter, and freeze the first row and first column
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(columns))}{len(rows) + 1}"
+    ws.freeze_panes = 'B2'
+
+    def styled(values):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=_excel_value(value))
+            cell.style = 'summary'
+            cells.append(cell)
+        return cells
+
+    ws.append(styled(columns))
+    for row in rows:
+        ws.append(styled(row))
+
+    wb.save(excel_file)
+    print(f"Excel file saved as {excel_file}")
@@ -0,0 +1,220 @@
+import argparse
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from screener.cache import fetch_panel_cached
+from screener.cli import read_universe
+from screener.engine import align_right, ema, prefix_sums, rsi_from_prefix, rsi_prefix, sma_from_prefix
+from screener.memo import MEMO_FILE, ResultCache, column_digests, content_key
+from screener.shared import SharedPrices, map_columns
+
+# Grid search over the indicator parameters the screener hard-codes.  Each
+# parameter set is scored by the buy signals it produces across the whole
+# universe: how many there were, how often the close was higher `horizon`
+# sessions later (hit rate), and the mean forward return.
+#
+#   ma    (fast, slow)          fast SMA crossing above the slow SMA
+#   macd  (fast, slow, signal)  MACD line crossing above its signal line
+#   rsi   (period,)             RSI crossing back above RSI_OVERSOLD
+#
+# Work is split by columns across a process pool; the close matrix lives in
+# shared memory (screener.shared) so workers read it in place instead of
+# receiving a pickled copy.  Within a worker the prefix sums are built once for every SMA and
+# RSI period, and each EMA span is computed once for every MACD combination
+# that uses it.
+#
+# With a screener.memo.ResultCache each ticker's tally for each parameter set
+# is stored under a hash of its closes, the set and the horizon, so sweeps
+# over the same data with overlapping grids only score the new combinations.
+
+DEFAULT_GRID = {
+    "ma": [(f, s) for f, s in itertools.product([10, 20, 50, 100], [100, 150, 200]) if f < s],
+    "macd": [(f, s, g) for f, s, g in itertools.product([8, 12], [21, 26], [5, 9])],
+    "rsi": [(p,) for p in [7, 14, 21]],
+}
+RSI_OVERSOLD = 30
+RESULT_COLUMNS = ["Family", "Parameters", "Signals", "Hit Rate", "Mean Forward Return"]
+# One ticker's tally for one parameter set, as the result cache stores it
+TALLY_DTYPE = np.dtype([("signals", "i8"), ("wins", "i8"), ("total", "f8")])
+
+
+def _crossed_up(a, b):
+    # Row t is True when a went from at or below b to above it between bars
+    # t and t + 1, the same test as the golden cross
+    diff = np.sign(a - b)
+    return (diff[:-1] <= 0) & (diff[1:] > 0)
+
+
+def score_grid(prices, grid=None, horizon=20, per_column=False):
+    # Signal counts, wins and summed forward returns for every parameter set
+    # over one right-aligned (dates, tickers) close matrix; per_column gives
+    # arrays with each ticker's own tallies instead of the totals
+    grid = DEFAULT_GRID if grid is None else grid
+    n = len(prices)
+    forward = np.full(prices.shape, np.nan)
+    if n > horizon:
+        forward[:-horizon] = prices[horizon:] / prices[:-horizon] - 1
+    # A cross between bars t and t + 1 is acted on at the close of bar t + 1
+    forward = forward[1:]
+
+    def tally(mask):
+        if per_column:
+            hits = np.where(mask, forward, np.nan)
+            return (~np.isnan(hits)).sum(axis=0), (hits > 0).sum(axis=0), np.nansum(hits, axis=0)
+        hits = forward[mask]
+        hits = hits[~np.isnan(hits)]
+        return len(hits), int((hits > 0).sum()), float(hits.sum())
+
+    scores = {}
+    if grid.get("ma"):
+        prefix = prefix_sums(prices)
+        smas = {w: sma_from_prefix(prefix, w) for w in sorted({w for pair in grid["ma"] for w in pair})}
+        for fast, slow in grid["ma"]:
+            scores[("ma", (fast, slow))] = tally(_crossed_up(smas[fast], smas[slow]))
+    if grid.get("macd"):
+        emas = {span: ema(prices, span) for span in sorted({s for f, s, _ in grid["macd"]} |
+                                                            {f for f, s, _ in grid["macd"]})}
+        lines = {}
+        for fast, slow, signal in grid["macd"]:
+            if (fast, slow) not in lines:
+                lines[(fast, slow)] = emas[fast] - emas[slow]
+            line = lines[(fast, slow)]
+            scores[("macd", (fast, slow, signal))] = tally(_crossed_up(line, ema(line, signal)))
+    if grid.get("rsi"):
+        prefix = rsi_prefix(prices)
+        for (period,) in grid["rsi"]:
+            scores[("rsi", (period,))] = tally(_crossed_up(rsi_from_prefix(prefix, period), RSI_OVERSOLD))
+    return scores
+
+
+def _score(values, symbols, grid, horizon, workers, per_column=False):
+    # score_grid over values, split across the process pool when it pays
+    if workers == 1 or values.shape[1] < 2:
+        return [score_grid(values, grid, horizon, per_column)]
+    with SharedPrices.create(values, symbols) as shared:
+        del values
+        return map_columns(score_grid, shared, (grid, horizon, per_column), workers=workers)
+
+
+def _memo_scores(values, symbols, grid, horizon, workers, memo):
+    # Totals like score_grid's, from each ticker's stored tallies where the
+    # result cache has them.  Tickers missing any set are scored on the sets
+    # missing for any of them, and their tallies stored.
+    keep = np.flatnonzero(~np.isnan(values[-1]))
+    values, symbols = values[:, keep], [symbols[j] for j in keep]
+    digests = column_digests(values)
+    points = [(family, params) for family, sets in grid.items() for params in sets or []]
+    keys = [[content_key(d, ("sweep", family, params, horizon)) for family, params in points] for d in digests]
+    stored = memo.get(key for row in keys for key in row)
+
+    todo = [j for j, row in enumerate(keys) if any(key not in stored for key in row)]
+    if todo:
+        missing = {points[p] for j in todo for p, key in enumerate(keys[j]) if key not in stored}
+        subgrid = {family: [params for params in sets if (family, params) in missing]
+                   for family, sets in grid.items()}
+        parts = _score(values[:, todo], [symbols[j] for j in todo], subgrid, horizon, workers, per_column=True)
+        fresh = {}
+        for point in parts[0]:
+            counts, wins, totals = (np.concatenate([part[point][i] for part in parts]) for i in range(3))
+            p = points.index(point)
+            for i, j in enumerate(todo):
+                fresh[keys[j][p]] = np.array((counts[i], wins[i], totals[i]), dtype=TALLY_DTYPE).tobytes()
+        stored.update(fresh)
+        memo.put(fresh)
+
+    scores = {}
+    for p, point in enumerate(points):
+        tallies = np.frombuffer(b"".join(stored[row[p]] for row in keys), dtype=TALLY_DTYPE)
+        scores[point] = (int(tallies["signals"].sum()), int(tallies["wins"].sum()), float(tallies["total"].sum()))
+    return [scores]
+
+
+def sweep(panel, grid=None, horizon=20, workers=None, memo=None):
+    # Score every parameter set over the whole panel and return one row per
+    # set, best mean forward return first within each family.  memo is an
+    # optional screener.memo.ResultCache of per-ticker tallies; the sums then
+    # run over tickers, so means can differ from a run without it in the
+    # last digit.
+    grid = DEFAULT_GRID if grid is None else grid
+    values = align_right(panel["Close"].to_numpy(dtype=float))
+    workers = workers or os.cpu_count() or 1
+    symbols = list(panel["Close"].columns)
+
+    if memo is None:
+        parts = _score(values, symbols, grid, horizon, workers)
+    else:
+        parts = _memo_scores(values, symbols, grid, horizon, workers, memo)
+
+    totals = {}
+    for part in parts:
+        for key, (count, wins, total) in part.items():
+            seen = totals.get(key, (0, 0, 0.0))
+            totals[key] = (seen[0] + count, seen[1] + wins, seen[2] + total)
+    rows = [(family, params, count, wins / count if count else np.nan, total / count if count else np.nan)
+            for (family, params), (count, wins, total) in totals.items()]
+    result = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    return result.sort_values(["Family", "Mean Forward Return"], ascending=[True, False],
+                              ignore_index=True)
+
+
+def best_parameters(result, min_signals=30):
+    # The top parameter set of each family among those with enough signals
+    # for the averages to mean something
+    enough = result[result["Signals"] >= min_signals]
+    return enough.groupby("Family", sort=False).head(1).reset_index(drop=True)
+
+
+def _ints(text):
+    return [int(x) for x in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find the indicator parameters with the best signals")
+    parser.add_argument("--universe", default="stocks.txt", help="file with one ticker per line")
+    parser.add_argument("--period", default="max", help="history to test over (default: max)")
+    parser.add_argument("--fast", type=_ints, help="fast SMA windows, e.g. 20,50")
+    parser.add_argument("--slow", type=_ints, help="slow SMA windows, e.g. 150,200")
+    parser.add_argument("--macd-fast", type=_ints, help="MACD fast spans, e.g. 8,12")
+    parser.add_argument("--macd-slow", type=_ints, help="MACD slow spans, e.g. 21,26")
+    parser.add_argument("--macd-signal", type=_ints, help="MACD signal spans, e.g. 5,9")
+    parser.add_argument("--rsi", type=_ints, help="RSI periods, e.g. 7,14,21")
+    parser.add_argument("--horizon", type=int, default=20, help="sessions to hold after a signal")
+    parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    parser.add_argument("--min-signals", type=int, default=30, help="signals needed to rank a set")
+    parser.add_argument("--output", help="write every parameter set's score to this CSV")
+    parser.add_argument("--memo", nargs="?", const=MEMO_FILE, metavar="PATH",
+                        help=f"reuse per-ticker scores from a result cache (default: {MEMO_FILE})")
+    args = parser.parse_args(argv)
+
+    grid = dict(DEFAULT_GRID)
+    if args.fast or args.slow:
+        fast = args.fast or sorted({f for f, _ in DEFAULT_GRID["ma"]})
+        slow = args.slow or sorted({s for _, s in DEFAULT_GRID["ma"]})
+        grid["ma"] = [(f, s) for f, s in itertools.product(fast, slow) if f < s]
+    if args.macd_fast or args.macd_slow or args.macd_signal:
+        grid["macd"] = [(f, s, g) for f, s, g in itertools.product(args.macd_fast or [12], args.macd_slow or [26],
+                                                                   args.macd_signal or [9]) if f < s]
+    if args.rsi:
+        grid["rsi"] = [(p,) for p in args.rsi]
+
+    panel = fetch_panel_cached(read_universe(args.universe), period=args.period)
+    if panel.empty:
+        print("Warning: no price data to sweep.")
+        return
+    memo = ResultCache(args.memo) if args.memo else None
+    result = sweep(panel, grid, horizon=args.horizon, workers=args.workers, memo=memo)
+    if memo is not None:
+        memo.report("ticker scores")
+        memo.close()
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"Sweep results saved as {args.output}")
+    print(f"Best parameters by mean {args.horizon}-session forward return:")
+    print(best_parameters(result, args.min_signals).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
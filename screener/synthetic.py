@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from screener.fetch import FIELDS
+
+SESSIONS_PER_YEAR = 252
+
+
+def generate_panel(tickers=100, years=1, seed=0, drift=0.0003, volatility=0.02,
+                   gap_prob=0.01, gap_size=0.08, halt_prob=0.001, split_prob=0.0005,
+                   listing_prob=0.1, end="2024-12-31"):
+    # Deterministic synthetic daily bars in fetch_panel's (field, ticker)
+    # layout, for benchmarks and offline runs.  Closes follow a geometric
+    # random walk with these irregularities mixed in:
+    #   gap_prob     chance per bar of an overnight gap of about gap_size
+    #   halt_prob    chance per bar that trading halts for 1-5 sessions (NaN bars)
+    #   split_prob   chance per bar of a 2:1, 3:1 or 4:1 split; Close is left
+    #                unadjusted, Adj Close is back-adjusted
+    #   listing_prob share of tickers that list part-way through the history
+    # Memory is about 48 bytes per ticker per session.
+    names = tickers if isinstance(tickers, list) else [f"T{i:05d}" for i in range(tickers)]
+    n, k = int(years * SESSIONS_PER_YEAR), len(names)
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=end, periods=n, name="Date")
+
+    returns = rng.normal(drift, volatility, (n, k))
+    gaps = rng.random((n, k)) < gap_prob
+    returns[gaps] += rng.normal(0, gap_size, gaps.sum())
+    adj_close = rng.uniform(10, 200, k) * np.exp(np.cumsum(returns, axis=0))
+
+    # Each split divides every later unadjusted price by its ratio
+    ratios = np.where(rng.random((n, k)) < split_prob, rng.choice([2.0, 3.0, 4.0], (n, k)), 1.0)
+    close = adj_close / np.cumprod(ratios, axis=0)
+
+    open_ = close * np.exp(np.where(gaps, 0.0, rng.normal(0, volatility / 4, (n, k))))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, volatility / 2, (n, k))))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, volatility / 2, (n, k))))
+    volume = np.exp(rng.normal(14.5, 0.5, (n, k))).round()
+
+    # Halts and late listings show up as missing bars
+    missing = np.zeros((n, k), dtype=bool)
+    for day, col in zip(*np.nonzero(rng.random((n, k)) < halt_prob)):
+        missing[day:day + rng.integers(1, 6), col] = True
+    late = rng.random(k) < listing_prob
+    for col in np.flatnonzero(late):
+        missing[:rng.integers(1, n), col] = True
+
+    fields = {"Open": open_, "High": high, "Low": low, "Close": close,
+              "Adj Close": adj_close, "Volume": volume}
+    blocks = []
+    for name in FIELDS:
+        values = fields[name]
+        values[missing] = np.nan
+        blocks.append(values)
+    columns = pd.MultiIndex.from_product([FIELDS, names], names=["Price", "Ticker"])
+    return pd.DataFrame(np.hstack(blocks), index=index, columns=columns)
+
+
+class SyntheticProvider:
+    # Serves slices of a generated panel through the provider interface, as
+    # a network-free stand-in for YahooProvider
+
+    def __init__(self, panel):
+        self.panel = panel
+        self.calls = []
+
+    def download(self, tickers, period="1y", interval="1d", start=None):
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        self.calls.append(list(tickers))
+        data = self.panel.loc[:, (slice(None), tickers)]
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start)]
+        return data
@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TokenBucket:
+    # Allows `rate` calls per second on average with bursts of up to `burst`
+    # calls; acquire() blocks until a token is available
+
+    def __init__(self, rate=5.0, burst=5):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def call_with_timeout(func, args, timeout):
+    # Run func(*args) on a helper thread and give up after timeout seconds.
+    # Python threads cannot be killed, so a hung call is left running in the
+    # background and its result is discarded.
+    if timeout is None:
+        return func(*args)
+    result = {}
+
+    def target():
+        try:
+            result["value"] = func(*args)
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"timed out after {timeout}s")
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def run_concurrent(func, items, workers=8, rate=5.0, burst=5, retries=3, backoff=0.5, timeout=30):
+    # Call func(item) for every item on a bounded thread pool.  Every attempt
+    # takes a token from a shared rate limiter, is cut off after timeout
+    # seconds and is retried with exponential backoff when it raises.
+    # Returns the results in the same order as items, with None for items
+    # that failed on every attempt.
+    limiter = TokenBucket(rate, burst)
+
+    def attempt(item):
+        for n in range(retries + 1):
+            limiter.acquire()
+            try:
+                return call_with_timeout(func, (item,), timeout)
+            except Exception as e:
+                if n == retries:
+                    print(f"Warning: {item} failed after {retries + 1} attempts: {e}")
+                    return None
+                time.sleep(backoff * 2 ** n)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(attempt, items))
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from screener.backtest import backtest
+from screener.synthetic import generate_panel
+
+
+def reference_trades(close, fast=50, slow=200):
+    # Per-ticker loop: buy on a golden cross, sell on the next death cross,
+    # and report a position still held at the end as open
+    trades = []
+    for ticker in close.columns:
+        series = close[ticker].dropna()
+        prices = series.to_numpy()
+        a = series.rolling(fast).mean().to_numpy()
+        b = series.rolling(slow).mean().to_numpy()
+        entry = None
+        for i in range(1, len(prices)):
+            if entry is None and a[i - 1] <= b[i - 1] and a[i] > b[i]:
+                entry = i
+            elif entry is not None and a[i - 1] >= b[i - 1] and a[i] < b[i]:
+                trades.append((ticker, series.index[entry], series.index[i], prices[entry:i + 1], False))
+                entry = None
+        if entry is not None:
+            trades.append((ticker, series.index[entry], series.index[-1], prices[entry:], True))
+    return pd.DataFrame({
+        "Ticker": [t[0] for t in trades],
+        "Entry Date": [t[1] for t in trades],
+        "Exit Date": [t[2] for t in trades],
+        "Return": [t[3][-1] / t[3][0] - 1 for t in trades],
+        "Max Drawdown": [(t[3] / np.maximum.accumulate(t[3]) - 1).min() for t in trades],
+        "Open": [t[4] for t in trades],
+    })
+
+
+def test_trades_match_a_per_ticker_loop():
+    panel = generate_panel(60, years=6, seed=4, halt_prob=0.005, listing_prob=0.3)
+    trades, tickers = backtest(panel)
+    expected = reference_trades(panel["Adj Close"])
+
+    assert len(trades) == len(expected) > 0
+    order = ["Ticker", "Entry Date"]
+    trades = trades.sort_values(order, kind="stable").reset_index(drop=True)
+    expected = expected.sort_values(order, kind="stable").reset_index(drop=True)
+    for column in ["Ticker", "Entry Date", "Exit Date", "Open"]:
+        assert (trades[column].to_numpy() == expected[column].to_numpy()).all()
+    np.testing.assert_allclose(trades["Return"], expected["Return"], rtol=1e-12)
+    np.testing.assert_allclose(trades["Max Drawdown"], expected["Max Drawdown"], rtol=1e-9, atol=1e-12)
+
+    counts = expected.groupby("Ticker").size().reindex(tickers.index, fill_value=0)
+    assert (tickers["Trades"] == counts).all()
@@ -0,0 +1,94 @@
+import pandas as pd
+
+from screener.cache import PriceCache, fetch_panel_cached, refresh_cache
+from screener.calendars import last_closed_session
+from screener.fetch import FakeProvider, fetch_panel
+
+
+class LiveProvider(FakeProvider):
+    # FakeProvider whose newest bar closes at live, like a session that is
+    # still trading
+
+    live = 100.0
+
+    def bars(self, ticker, interval="1d"):
+        data = super().bars(ticker, interval).copy()
+        data.loc[data.index[-1], ["Close", "Adj Close"]] = self.live
+        return data
+
+
+def test_bar_fetched_mid_session_is_fetched_again(tmp_path):
+    cache = PriceCache(str(tmp_path / "prices.sqlite"))
+    provider = LiveProvider(sessions=30, end="2024-12-31")
+
+    refresh_cache(["AAA"], cache=cache, provider=provider, today="2024-12-31 11:00")
+    assert cache.load("AAA")["Close"].iloc[-1] == 100.0
+    assert cache.settled_date("AAA") == pd.Timestamp("2024-12-30")
+
+    # Later the same day the price moved; the partial bar is replaced
+    provider.live = 123.0
+    refresh_cache(["AAA"], cache=cache, provider=provider, today="2024-12-31 14:00")
+    assert len(provider.calls) == 2
+    assert cache.load("AAA")["Close"].iloc[-1] == 123.0
+
+    # After the close and the publishing delay the final bar is stored once
+    provider.live = 125.0
+    refresh_cache(["AAA"], cache=cache, provider=provider, today="2024-12-31 16:45")
+    assert cache.load("AAA")["Close"].iloc[-1] == 125.0
+    assert cache.settled_date("AAA") == pd.Timestamp("2024-12-31")
+    refresh_cache(["AAA"], cache=cache, provider=provider, today="2024-12-31 18:00")
+    assert len(provider.calls) == 3
+
+
+def test_bar_fetched_before_the_publishing_delay_is_not_final(tmp_path):
+    cache = PriceCache(str(tmp_path / "prices.sqlite"))
+    provider = LiveProvider(sessions=30, end="2024-12-31")
+    refresh_cache(["AAA"], cache=cache, provider=provider, today="2024-12-31 16:10")
+    assert cache.settled_date("AAA") == pd.Timestamp("2024-12-30")
+
+    # A run for the closed session re-requests it ...
+    now = pd.Timestamp("2025-01-02 09:00")
+    session = last_closed_session(now)
+    assert session == pd.Timestamp("2024-12-31")
+    refresh_cache(["AAA"], cache=cache, provider=provider, today=now, session=session)
+    assert len(provider.calls) == 2
+    assert cache.settled_date("AAA") == session
+    # ... and once it is final, later runs for that session do not
+    refresh_cache(["AAA"], cache=cache, provider=provider, today=now, session=session)
+    assert len(provider.calls) == 2
+
+
+def test_cached_panel_matches_a_direct_download(tmp_path):
+    cache = PriceCache(str(tmp_path / "prices.sqlite"))
+    tickers = ["AAA", "BBB", "CCC"]
+    fetch_panel_cached(tickers, cache=cache, provider=FakeProvider(sessions=300, end="2024-12-20"),
+                       today="2024-12-20 18:00")
+
+    # A week later only the new bars are requested, from each ticker's last date
+    provider = FakeProvider(sessions=300, end="2024-12-27")
+    panel = fetch_panel_cached(tickers, cache=cache, provider=provider, today="2024-12-27 18:00")
+    assert provider.calls == [tickers]
+    expected = fetch_panel(tickers, provider=FakeProvider(sessions=300, end="2024-12-27"))
+    expected = expected[expected.index > pd.Timestamp("2023-12-27")]
+    pd.testing.assert_frame_equal(panel, expected, check_freq=False, check_dtype=False, check_names=False)
+
+
+def test_chunks_are_stored_as_they_arrive(tmp_path):
+    cache = PriceCache(str(tmp_path / "prices.sqlite"))
+    tickers = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+
+    class Watching(FakeProvider):
+        # Records which tickers the cache already holds at each batch;
+        # single-symbol retries run on worker threads, away from the cache
+        seen = []
+
+        def download(self, tickers, *args, **kwargs):
+            if not isinstance(tickers, str):
+                self.seen.append([t for t in ["AAA", "BBB", "CCC", "DDD", "EEE"] if cache.last_date(t)])
+            return super().download(tickers, *args, **kwargs)
+
+    provider = Watching(sessions=30, end="2024-12-20", fail_in_batch=["BBB"])
+    refresh_cache(tickers, cache=cache, provider=provider, chunk_size=2, today="2024-12-20 18:00")
+    assert provider.calls == [["AAA", "BBB"], ["CCC", "DDD"], ["EEE"], ["BBB"]]
+    assert provider.seen == [[], ["AAA"], ["AAA", "CCC", "DDD"]]
+    assert all(cache.last_date(t) == pd.Timestamp("2024-12-20") for t in tickers)
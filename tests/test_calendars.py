@@ -0,0 +1,69 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from screener.calendars import (early_closes, holidays, is_session, last_closed_session, previous_session,
+                                session_close, sessions, settled)
+
+
+def dates(*days):
+    return {datetime.date.fromisoformat(d) for d in days}
+
+
+@pytest.mark.parametrize("year, expected", [
+    # Juneteenth starts in 2022; 2021's Independence Day and Christmas fall
+    # on weekends and are observed on the Monday after and the Friday before
+    (2021, ["2021-01-01", "2021-01-18", "2021-02-15", "2021-04-02", "2021-05-31", "2021-07-05",
+            "2021-09-06", "2021-11-25", "2021-12-24"]),
+    # New Year's Day on a Saturday is not made up; Juneteenth and Christmas
+    # on a Sunday are observed on the Monday
+    (2022, ["2022-01-17", "2022-02-21", "2022-04-15", "2022-05-30", "2022-06-20", "2022-07-04",
+            "2022-09-05", "2022-11-24", "2022-12-26"]),
+    (2024, ["2024-01-01", "2024-01-15", "2024-02-19", "2024-03-29", "2024-05-27", "2024-06-19",
+            "2024-07-04", "2024-09-02", "2024-11-28", "2024-12-25"]),
+    # One-off closure for a national day of mourning
+    (2025, ["2025-01-01", "2025-01-09", "2025-01-20", "2025-02-17", "2025-04-18", "2025-05-26",
+            "2025-06-19", "2025-07-04", "2025-09-01", "2025-11-27", "2025-12-25"]),
+    # Independence Day on a Saturday is observed on the Friday before
+    (2026, ["2026-01-01", "2026-01-19", "2026-02-16", "2026-04-03", "2026-05-25", "2026-06-19",
+            "2026-07-03", "2026-09-07", "2026-11-26", "2026-12-25"]),
+])
+def test_holidays(year, expected):
+    assert holidays(year) == dates(*expected)
+
+
+def test_early_closes():
+    assert early_closes(2024) == dates("2024-07-03", "2024-11-29", "2024-12-24")
+    # July 3rd is the observed holiday and Christmas Eve a Thursday
+    assert early_closes(2026) == dates("2026-11-27", "2026-12-24")
+    # July 3rd and Christmas Eve fall on weekends
+    assert early_closes(2022) == dates("2022-11-25")
+    assert session_close("2024-11-29") == pd.Timestamp("2024-11-29 13:00", tz="America/New_York")
+    assert session_close("2024-11-27") == pd.Timestamp("2024-11-27 16:00", tz="America/New_York")
+
+
+def test_sessions():
+    assert len(sessions("2024-01-01", "2024-12-31")) == 252
+    assert not is_session("2024-03-29") and not is_session("2024-03-30") and is_session("2024-04-01")
+    assert previous_session("2024-04-01") == pd.Timestamp("2024-03-28")
+
+
+def test_last_closed_session_and_settled():
+    # Before the close plus the publishing delay the previous session is the
+    # newest, after it today's; early closes move the cutoff
+    assert last_closed_session(pd.Timestamp("2024-06-18 16:29")) == pd.Timestamp("2024-06-17")
+    assert last_closed_session(pd.Timestamp("2024-06-18 16:30")) == pd.Timestamp("2024-06-18")
+    assert last_closed_session(pd.Timestamp("2024-06-19 20:00")) == pd.Timestamp("2024-06-18")
+    assert last_closed_session(pd.Timestamp("2024-11-29 13:29")) == pd.Timestamp("2024-11-27")
+    assert last_closed_session(pd.Timestamp("2024-11-29 13:30")) == pd.Timestamp("2024-11-29")
+    assert last_closed_session(pd.Timestamp("2024-06-22 12:00")) == pd.Timestamp("2024-06-21")
+    # Aware times are converted to exchange time first
+    assert last_closed_session(pd.Timestamp("2024-06-18 20:29", tz="UTC")) == pd.Timestamp("2024-06-17")
+    assert last_closed_session(pd.Timestamp("2024-06-18 20:30", tz="UTC")) == pd.Timestamp("2024-06-18")
+
+    assert not settled("2024-06-18", None)
+    assert not settled("2024-06-18", pd.Timestamp("2024-06-18 12:00"))
+    assert settled("2024-06-18", pd.Timestamp("2024-06-18 16:30"))
+    assert settled("2024-11-29", pd.Timestamp("2024-11-29 13:30"))
+    assert settled("2024-06-18", pd.Timestamp("2024-06-19 09:00"))
@@ -0,0 +1,19 @@
+from screener.cli import categorize
+from screener.fetch import FakeProvider, fetch_panel
+from screener.profiles import PROFILES
+from screener.summary import summarize_panel
+
+TICKERS = [f"T{i:02d}" for i in range(60)]
+
+
+def test_sma17_lists_crossed_below_as_bare_symbols():
+    panel = fetch_panel(TICKERS, provider=FakeProvider(sessions=260))
+    records = summarize_panel(panel, TICKERS)
+    titles = [title for title, _ in categorize(records, PROFILES["sma17"])]
+    lines = dict(categorize(records, PROFILES["sma17"]))
+    above, below = lines[titles[4]], lines[titles[6]]
+    assert above and all(" - Crossed above 50DMA " in line for line in above)
+    assert below and all(symbol in TICKERS for symbol in below)
+    # sma15 prints the same list with the sessions ago
+    detailed = dict(categorize(records, PROFILES["sma15"]))[titles[6]]
+    assert sorted(line.split(" - ")[0] for line in detailed) == sorted(below)
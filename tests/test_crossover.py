@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from screener.crossover import crossover_arrays, crossovers
+
+
+def reference_crossovers(close, dma50, dma200, window=15):
+    # The per-ticker loops from the sma*.py scripts, for one column: the
+    # golden and death cross keep the earliest cross in the window, the
+    # price crosses the most recent one
+    n = len(close)
+    recent = range(n - window - 1, n)
+    c, a, b = ([x[j] for j in recent] for x in (close, dma50, dma200))
+    result = dict.fromkeys(["golden_cross", "death_cross", "above_50dma", "above_200dma",
+                            "below_50dma", "below_200dma"])
+    for i in range(1, window + 1):
+        if result["golden_cross"] is None and a[i - 1] <= b[i - 1] and a[i] > b[i]:
+            result["golden_cross"] = window - i
+        if result["death_cross"] is None and a[i - 1] >= b[i - 1] and a[i] < b[i]:
+            result["death_cross"] = window - i
+    for i in range(1, window + 1):
+        if c[i - 1] < a[i - 1] and c[i] > a[i]:
+            result["above_50dma"] = window - i
+        if c[i - 1] < b[i - 1] and c[i] > b[i]:
+            result["above_200dma"] = window - i
+        if c[i - 1] > a[i - 1] and c[i] < a[i]:
+            result["below_50dma"] = window - i
+        if c[i - 1] > b[i - 1] and c[i] < b[i]:
+            result["below_200dma"] = window - i
+    return result
+
+
+def random_columns(rng, sessions, tickers):
+    # Small integer levels so ties between the series are common, with NaN
+    # gaps like the warm-up of a 200-day average
+    close, dma50, dma200 = (rng.integers(0, 4, (sessions, tickers)).astype(float) for _ in range(3))
+    for values in (close, dma50, dma200):
+        values[rng.random(values.shape) < 0.05] = np.nan
+    dma200[:rng.integers(0, sessions)] = np.nan
+    return close, dma50, dma200
+
+
+@pytest.mark.parametrize("window", [1, 15, 40])
+def test_crossover_arrays_match_the_loop(window):
+    rng = np.random.default_rng(window)
+    close, dma50, dma200 = random_columns(rng, window + 10, 400)
+    result = crossover_arrays(close, dma50, dma200, window=window)
+    for j in range(close.shape[1]):
+        expected = reference_crossovers(close[:, j], dma50[:, j], dma200[:, j], window)
+        assert {name: None if ago[j] < 0 else int(ago[j]) for name, ago in result.items()} == expected
+
+
+def test_single_ticker_form_matches_the_loop():
+    rng = np.random.default_rng(1)
+    close, dma50, dma200 = random_columns(rng, 30, 50)
+    for j in range(close.shape[1]):
+        columns = close[:, j], dma50[:, j], dma200[:, j]
+        assert crossovers(*columns) == reference_crossovers(*columns)
+
+
+def test_no_cross_when_the_averages_never_meet():
+    close = np.arange(30.0)[:, None]
+    result = crossover_arrays(close, close - 1, close - 2)
+    assert all(ago[0] == -1 for ago in result.values())
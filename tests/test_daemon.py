@@ -0,0 +1,40 @@
+import pandas as pd
+
+from screener.cache import window_mask
+from screener.daemon import ScreenerService
+from screener.fetch import FakeProvider, fetch_panel
+
+TICKERS = ["AAA", "BBB", "CCC"]
+
+
+class CatchingUpProvider(FakeProvider):
+    # FakeProvider where some tickers are behind by a few bars
+    lag = {}
+
+    def bars(self, ticker, interval="1d"):
+        data = super().bars(ticker, interval)
+        return data.iloc[:len(data) - self.lag.get(ticker, 0)]
+
+
+def _expected(tickers):
+    panel = fetch_panel(tickers, provider=FakeProvider(sessions=400))
+    return panel[window_mask(panel.index, "1y", None, panel.index[-1])]
+
+
+def test_refresh_fills_lagging_and_late_tickers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "stocks.txt").write_text("\n".join(TICKERS))
+    provider = CatchingUpProvider(sessions=400, missing={"CCC"})
+    provider.lag = {"BBB": 5}
+    service = ScreenerService(universe="stocks.txt", period="1y", provider=provider,
+                              cache_path=str(tmp_path / "prices.sqlite"), write=False)
+    service.refresh()
+    assert list(service.panel["Close"].columns) == ["AAA", "BBB"]
+
+    # BBB catches up and CCC starts returning data
+    provider.lag = {}
+    provider.missing = set()
+    service.refresh()
+    pd.testing.assert_frame_equal(service.panel, _expected(TICKERS), check_freq=False, check_dtype=False,
+                                  check_names=False)
+    assert set(service.snapshot["records"]["Symbol"]) == set(TICKERS)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener.engine import align_right, compute_indicators, rolling_mean
+from screener.fetch import ticker_frame
+from screener.summary import add_indicators
+from screener.synthetic import generate_panel
+
+@pytest.fixture(scope="module")
+def panel():
+    # Halts and late listings give the columns different leading NaNs
+    return generate_panel(40, years=2, seed=3, halt_prob=0.01, listing_prob=0.3)
+
+
+def test_matches_the_per_ticker_pandas_indicators(panel):
+    tickers = list(panel["Close"].columns)
+    computed = compute_indicators(align_right(panel["Close"].to_numpy()))
+    for j, ticker in enumerate(tickers):
+        reference = add_indicators(ticker_frame(panel, ticker).copy())
+        n = len(reference)
+        for name in ["50dma", "200dma", "50EMA", "200EMA", "MACD", "Signal", "RSI"]:
+            np.testing.assert_array_equal(computed[name][-n:, j], reference[name].to_numpy(), err_msg=name)
+        # Nothing is computed over the padding in front of a column
+        assert np.isnan(computed["50dma"][:-n, j]).all()
+
+
+def test_names_limit_the_columns(panel):
+    close = align_right(panel["Close"].to_numpy())
+    computed = compute_indicators(close, ["50dma", "RSI"])
+    assert set(computed) == {"Close", "50dma", "RSI"}
+    full = compute_indicators(close)
+    np.testing.assert_array_equal(computed["RSI"], full["RSI"])
+
+
+def test_rolling_mean_edge_cases():
+    # Runs of one value, signed zeros and windows that straddle zero
+    column = np.array([np.nan, 1.0, 1.0, 1.0, -0.5, 0.5, 0.5, 0.5, 0.0, -0.0, 0.1, 0.2, 0.3, 0.1])
+    values = np.column_stack([column, column[::-1], np.full(len(column), 0.1)])
+    for window, min_periods in [(1, None), (3, None), (3, 1), (5, 2)]:
+        computed = rolling_mean(values, window, min_periods)
+        for j in range(values.shape[1]):
+            expected = pd.Series(values[:, j]).rolling(window, min_periods=min_periods).mean().to_numpy()
+            np.testing.assert_array_equal(computed[:, j], expected)
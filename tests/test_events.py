@@ -0,0 +1,35 @@
+import pandas as pd
+
+from screener.events import KINDS, EventIndex
+from screener.fetch import FakeProvider, fetch_panel
+
+TICKERS = [f"T{i:02d}" for i in range(12)]
+
+
+def _events(index):
+    return index.events().sort_values(["Ticker", "Kind", "Date"]).reset_index(drop=True)
+
+
+def test_update_matches_full_rebuild(tmp_path):
+    panel = fetch_panel(TICKERS, provider=FakeProvider(sessions=400))
+    dates = panel.index
+
+    # Index the first 300 bars, add a ticker with the next 50, then catch up
+    incremental = EventIndex(str(tmp_path / "incremental.sqlite"))
+    incremental.update(panel.loc[:dates[299]], TICKERS[:-1])
+    incremental.update(panel.loc[:dates[349]], TICKERS)
+    changed = incremental.update(panel, TICKERS)
+    assert changed == TICKERS
+    assert incremental.update(panel, TICKERS) == []
+
+    full = EventIndex(str(tmp_path / "full.sqlite"))
+    assert full.build(panel, TICKERS) == TICKERS
+
+    assert len(_events(full)) > 0
+    pd.testing.assert_frame_equal(_events(incremental), _events(full))
+    for kind in KINDS:
+        pd.testing.assert_frame_equal(incremental.sessions_since(kind), full.sessions_since(kind))
+    recent = full.events("golden_cross", within=60)
+    assert (recent["Sessions Ago"] <= 60).all() and set(recent["Kind"]) <= {"golden_cross"}
+    incremental.close()
+    full.close()
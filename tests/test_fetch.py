@@ -0,0 +1,64 @@
+import pandas as pd
+
+from screener.fetch import FIELDS, FakeProvider, fetch_panel
+
+
+def test_batch_misses_fall_back_to_single_requests():
+    provider = FakeProvider(sessions=30, fail_in_batch={"BBB"})
+    panel = fetch_panel(["AAA", "BBB", "CCC"], provider=provider, rate=1000.0)
+
+    assert list(panel["Close"].columns) == ["AAA", "BBB", "CCC"]
+    assert panel["Close"]["BBB"].notna().all()
+    assert ["BBB"] in provider.calls
+    # Only the symbol the batch missed is asked for again
+    assert [c for c in provider.calls if len(c) == 1] == [["BBB"]]
+
+
+def test_missing_tickers_are_left_out():
+    provider = FakeProvider(sessions=30, missing={"BBB"})
+    panel = fetch_panel(["AAA", "BBB", "CCC"], provider=provider, rate=1000.0)
+
+    assert list(panel["Close"].columns) == ["AAA", "CCC"]
+    assert "BBB" not in panel.columns.get_level_values(1)
+
+
+def test_nothing_found_gives_an_empty_panel():
+    provider = FakeProvider(sessions=30, missing={"AAA", "BBB"})
+    panel = fetch_panel(["AAA", "BBB"], provider=provider, rate=1000.0)
+    assert panel.empty
+
+
+def test_columns_are_field_major_in_requested_order():
+    tickers = ["EEE", "AAA", "DDD", "BBB", "CCC"]
+    # Small chunks and a fallback symbol from the first chunk, which is
+    # added to the pieces last
+    provider = FakeProvider(sessions=30, fail_in_batch={"EEE"})
+    panel = fetch_panel(tickers, chunk_size=2, provider=provider, rate=1000.0)
+
+    expected = pd.MultiIndex.from_product([FIELDS, tickers], names=["Price", "Ticker"])
+    assert panel.columns.equals(expected)
+    assert panel.index.is_monotonic_increasing
+
+
+def test_duplicate_tickers_are_fetched_once():
+    provider = FakeProvider(sessions=30)
+    panel = fetch_panel(["AAA", "BBB", "AAA"], provider=provider, rate=1000.0)
+    assert list(panel["Close"].columns) == ["AAA", "BBB"]
+    assert provider.calls == [["AAA", "BBB"]]
+
+
+def test_panel_matches_the_provider_bars():
+    provider = FakeProvider(sessions=30, fail_in_batch={"BBB"})
+    panel = fetch_panel(["AAA", "BBB"], provider=provider, rate=1000.0)
+    for ticker in ["AAA", "BBB"]:
+        bars = provider.bars(ticker)
+        pd.testing.assert_frame_equal(panel.xs(ticker, axis=1, level=1), bars,
+                                      check_names=False, check_freq=False, check_dtype=False)
+
+
+def test_single_requests_are_retried():
+    provider = FakeProvider(sessions=30, fail_in_batch={"BBB"}, flaky={"BBB"})
+    panel = fetch_panel(["AAA", "BBB"], provider=provider, rate=1000.0)
+
+    assert list(panel["Close"].columns) == ["AAA", "BBB"]
+    assert provider.calls.count(["BBB"]) == 2
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from screener.cache import PriceCache, refresh_cache
+from screener.fetch import FakeProvider
+from screener.intraday import closed_bars, resample_bars, update_intraday
+
+TICKERS = ["AAA", "BBB", "CCC"]
+
+
+def _groupby_resample(frame, minutes):
+    # Reference buckets: minutes counted from each day's 09:30 open
+    opens = frame.index.normalize() + pd.Timedelta(hours=9, minutes=30)
+    starts = opens + (frame.index - opens) // pd.Timedelta(minutes=minutes) * pd.Timedelta(minutes=minutes)
+    grouped = frame.groupby(starts)
+    out = pd.DataFrame({"Open": grouped["Open"].first(), "High": grouped["High"].max(),
+                        "Low": grouped["Low"].min(), "Close": grouped["Close"].last(),
+                        "Adj Close": grouped["Adj Close"].last(), "Volume": grouped["Volume"].sum()})
+    out.index = out.index.as_unit("ns").rename(frame.index.name)
+    return out.astype(float)
+
+
+def test_resample_buckets():
+    frame = FakeProvider(sessions=3, end="2024-06-05").bars("AAA", "5m")
+    hourly = resample_bars(frame, "1h")
+    # Hourly bars run from the open, the last one a half hour, and never
+    # span two sessions
+    assert list(hourly.index[:7].strftime("%H:%M")) == ["09:30", "10:30", "11:30", "12:30", "13:30",
+                                                        "14:30", "15:30"]
+    assert len(hourly) == 21
+    for timeframe, minutes in [("5m", 5), ("15m", 15), ("1h", 60)]:
+        pd.testing.assert_frame_equal(resample_bars(frame, timeframe), _groupby_resample(frame, minutes),
+                                      check_freq=False)
+
+    utc = frame.tz_localize("America/New_York")
+    assert resample_bars(utc, "1h").index.equals(hourly.index.tz_localize("America/New_York"))
+
+
+def test_closed_bars_drops_the_forming_bar():
+    frame = resample_bars(FakeProvider(sessions=1, end="2024-06-05 10:40").bars("AAA", "5m"), "1h")
+    assert list(frame.index.strftime("%H:%M")) == ["09:30", "10:30"]
+    assert list(closed_bars(frame, "1h", pd.Timestamp("2024-06-05 10:45")).index) == [frame.index[0]]
+    assert closed_bars(frame, "1h", pd.Timestamp("2024-06-05 11:30")).equals(frame)
+
+
+def test_incremental_updates_match_from_scratch(tmp_path):
+    # Refresh every 25 minutes over three days, through the open, mid-bucket
+    # and after the close, then compare with one run over the same bars
+    days = pd.bdate_range("2024-06-03", "2024-06-05")
+    nows = [day + pd.Timedelta(hours=9, minutes=20) + pd.Timedelta(minutes=25) * i
+            for day in days for i in range(30)]
+    timeframes = ["5m", "15m", "1h"]
+
+    cache = PriceCache(str(tmp_path / "incremental.sqlite"))
+    incremental = {timeframe: {} for timeframe in timeframes}
+    for now in nows:
+        refresh_cache(TICKERS, period="60d", interval="5m", cache=cache,
+                      provider=FakeProvider(sessions=40, end=str(now)), today=now)
+        for timeframe in timeframes:
+            update_intraday(incremental[timeframe], cache, TICKERS, timeframe, now)
+
+    # The first refresh, before the open on the 3rd, held the 40 days before
+    # it, so one run now needs those days too
+    scratch_cache = refresh_cache(TICKERS, period="60d", interval="5m",
+                                  cache=PriceCache(str(tmp_path / "scratch.sqlite")),
+                                  provider=FakeProvider(sessions=40 + len(days), end=str(nows[-1])),
+                                  today=nows[-1])
+    for timeframe in timeframes:
+        scratch = {}
+        assert update_intraday(scratch, scratch_cache, TICKERS, timeframe, nows[-1]) == TICKERS
+        for ticker in TICKERS:
+            assert incremental[timeframe][ticker].to_dict() == scratch[ticker].to_dict(), (timeframe, ticker)
+        assert not np.isnan(scratch[TICKERS[0]].latest()["200dma"])
+    cache.close()
+    scratch_cache.close()
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from screener.fetch import FakeProvider, fetch_panel
+from screener.memo import ResultCache, column_digests, content_key
+from screener.summary import summarize_panel
+
+TICKERS = [f"T{i:02d}" for i in range(8)]
+
+
+def test_keys_follow_the_bars_and_config():
+    rng = np.random.default_rng(0)
+    values = 50 + rng.normal(size=(30, 3)).cumsum(axis=0)
+    values[:10, 1] = np.nan
+    digests = column_digests(values)
+    assert len(set(digests)) == 3
+
+    # Leading padding is not part of a column's content
+    padded = np.vstack([np.full((5, 3), np.nan), values])
+    assert column_digests(padded) == digests
+
+    # A revised, added or dropped bar gives a new digest
+    revised = values.copy()
+    revised[-1, 0] += 1e-9
+    assert column_digests(revised)[0] != digests[0] and column_digests(revised)[1:] == digests[1:]
+    assert column_digests(values[:-1])[0] != digests[0]
+    assert column_digests(np.vstack([values, values[-1:]]))[0] != digests[0]
+
+    assert content_key(digests[0], ("summary", 15)) == content_key(digests[0], ("summary", 15))
+    assert content_key(digests[0], ("summary", 15)) != content_key(digests[0], ("summary", 20))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr("screener.memo.time.time", lambda: next(clock))
+    # Every entry is a 1-byte key and a 99-byte value
+    memo = ResultCache(str(tmp_path / "memo.sqlite"), max_bytes=300)
+    for key in "abc":
+        memo.put({key: b"x" * 99})
+    assert memo.size() == 300
+
+    # Reading a refreshes it, so b is now the oldest
+    assert memo.get(["a", "z"]) == {"a": b"x" * 99}
+    memo.put({"d": b"x" * 99})
+    assert set(memo.get(["a", "b", "c", "d"])) == {"a", "c", "d"}
+    assert (memo.hits, memo.misses) == (4, 2)
+
+    assert memo.evict(150) == 2 and memo.size() == 100
+    memo.close()
+
+
+def test_summary_reuses_rows_until_a_bar_is_revised(tmp_path):
+    panel = fetch_panel(TICKERS, provider=FakeProvider(sessions=260))
+    plain = summarize_panel(panel, TICKERS).table()
+    memo = ResultCache(str(tmp_path / "memo.sqlite"))
+    pd.testing.assert_frame_equal(summarize_panel(panel, TICKERS, memo=memo).table(), plain)
+    pd.testing.assert_frame_equal(summarize_panel(panel, TICKERS, memo=memo).table(), plain)
+    assert (memo.hits, memo.misses) == (len(TICKERS), len(TICKERS))
+
+    # Revising one ticker's last close recomputes that ticker only
+    revised = panel.copy()
+    revised.loc[revised.index[-1], ("Close", "T03")] *= 1.5
+    table = summarize_panel(revised, TICKERS, memo=memo).table()
+    assert (memo.hits, memo.misses) == (2 * len(TICKERS) - 1, len(TICKERS) + 1)
+    pd.testing.assert_frame_equal(table, summarize_panel(revised, TICKERS).table())
+    assert table.loc[3, "Current Price"] != plain.loc[3, "Current Price"]
+    memo.close()
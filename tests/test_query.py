@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from screener.fetch import FakeProvider, fetch_panel
+from screener.query import Screen, evaluate, load_screens
+from screener.summary import summarize_panel
+
+TICKERS = [f"T{i:02d}" for i in range(40)]
+
+
+@pytest.fixture(scope="module")
+def summary():
+    panel = fetch_panel(TICKERS, provider=FakeProvider(sessions=260))
+    return summarize_panel(panel, TICKERS)
+
+
+def col(summary, name):
+    return np.asarray(summary[name])
+
+
+def test_comparisons_and_boolean_operators(summary):
+    price, dma50, dma200, rsi = (col(summary, c) for c in ["Current Price", "50DMA", "200DMA", "RSI"])
+    cases = {
+        "price > 50dma & rsi < 50": (price > dma50) & (rsi < 50),
+        "price > 50DMA and not rsi >= 50": (price > dma50) & ~(rsi >= 50),
+        "price < 200dma | rsi > 60": (price < dma200) | (rsi > 60),
+        "~(price > 200ema)": ~(price > col(summary, "200EMA")),
+        "50dma > 200dma and 200dma < price < 50dma": (dma50 > dma200) & (dma200 < price) & (price < dma50),
+        "(price - 50dma) / 50dma > 0.02": (price - dma50) / dma50 > 0.02,
+        "macd > signal": col(summary, "MACD") > col(summary, "Signal"),
+        "trend_up & macd_up": col(summary, "Trend (50DMA vs 200DMA)") & col(summary, "MACD Trend"),
+        "rsi > -1": rsi > -1,
+    }
+    for expression, expected in cases.items():
+        np.testing.assert_array_equal(Screen(expression)(summary), expected, err_msg=expression)
+
+
+def test_within_functions_use_sessions_ago(summary):
+    golden = col(summary, "Golden Cross Sessions Ago")
+    above = col(summary, "Above 50DMA Last 15 Sessions")
+    np.testing.assert_array_equal(Screen("golden_cross_within(5)")(summary), (golden >= 0) & (golden <= 5))
+    np.testing.assert_array_equal(Screen("crossed_above_50dma_within()")(summary), (above >= 0) & (above <= 15))
+    with pytest.raises(ValueError, match="further back"):
+        Screen("golden_cross_within(20)")(summary, window=15)
+
+
+def test_evaluate_and_load_screens(summary, tmp_path):
+    path = tmp_path / "screens.txt"
+    path.write_text("# comment\n\noversold: rsi < 30\nprice > 50dma\n")
+    screens = load_screens(str(path))
+    assert list(screens) == ["oversold", "price > 50dma"]
+    masks = evaluate(screens, summary)
+    np.testing.assert_array_equal(masks["oversold"], col(summary, "RSI") < 30)
+    np.testing.assert_array_equal(evaluate({"x": "rsi < 30"}, summary)["x"], masks["oversold"])
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('true')",
+    "open('stocks.txt')",
+    "price.__class__",
+    "rsi.real > 1",
+    "golden_cross_within(n=3)",
+    "golden_cross_within(1, 2)",
+    "golden_cross_within.__globals__",
+    "(lambda: 1)()",
+    "[price][0] > 1",
+    "price if rsi else macd",
+    "price ** 2 > 1",
+    "'a' == 'a'",
+    "True",
+    "volume > 1",
+    "os",
+    "price > ",
+])
+def test_rejected_expressions(expression):
+    with pytest.raises(ValueError):
+        Screen(expression)
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from screener.cache import PriceCache, refresh_cache
+from screener.fetch import FakeProvider
+from screener.scheduler import run_scheduled
+from tests.test_cache import LiveProvider
+
+TICKERS = ["AAA", "BBB", "CCC"]
+
+
+def _run(tmp_path, provider, now, cache):
+    return run_scheduled("sma23", str(tmp_path / "stocks.txt"), provider=provider, now=now, cache=cache,
+                         formats=[], path=str(tmp_path / "schedule.json"))
+
+
+def test_partial_bar_cached_before_the_close_is_not_current(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "stocks.txt").write_text("\n".join(TICKERS))
+    cache = PriceCache(str(tmp_path / "prices.sqlite"))
+    provider = LiveProvider(sessions=300, end="2024-12-31")
+
+    # Another run caches the session's bar while it is still trading
+    refresh_cache(TICKERS, cache=cache, provider=provider, today="2024-12-31 11:00")
+
+    # Before the close the session in progress is left out
+    table = _run(tmp_path, provider, pd.Timestamp("2024-12-31 12:00"), cache)
+    expected = FakeProvider(sessions=300, end="2024-12-30").bars("AAA")["Close"].iloc[-1]
+    assert table.set_index("Symbol").loc["AAA", "Current Price"] == expected
+
+    # After the close the final bar is fetched and screened
+    provider.live = 123.0
+    table = _run(tmp_path, provider, pd.Timestamp("2024-12-31 17:00"), cache)
+    assert (table["Current Price"] == 123.0).all()
+
+    # and the session is done
+    calls = len(provider.calls)
+    assert _run(tmp_path, provider, pd.Timestamp("2024-12-31 18:00"), cache) is None
+    assert len(provider.calls) == calls
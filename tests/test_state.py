@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener.cache import PriceCache, refresh_cache
+from screener.crossover import crossovers
+from screener.engine import ema, macd, sma
+from screener.fetch import FakeProvider
+from screener.state import IndicatorState, advance_states, load_states
+from screener.summary import add_indicators
+from tests.test_cache import LiveProvider
+
+INDICATORS = ["Close", "50dma", "200dma", "50EMA", "200EMA", "MACD", "Signal", "RSI"]
+
+
+def assert_matches_pandas(state, bars, window=15):
+    # The state after a run of bars against add_indicators over the same bars
+    reference = add_indicators(bars[["Close"]].copy())
+    latest = state.latest()
+    for name in INDICATORS:
+        np.testing.assert_allclose(latest[name], reference[name].iloc[-1], rtol=1e-12)
+    assert state.crossovers(window) == crossovers(reference["Close"], reference["50dma"],
+                                                  reference["200dma"], window=window)
+    assert state.last_date == f"{bars.index[-1]:%Y-%m-%d}"
+
+
+@pytest.mark.parametrize("ticker", ["AAA", "BBB", "CCC", "DDD"])
+def test_bar_by_bar_updates_match_pandas(ticker):
+    bars = FakeProvider(sessions=400).bars(ticker)
+    state = IndicatorState()
+    for date, close in zip(bars.index, bars["Close"]):
+        state.update(date, close)
+        # Replaying a bar already applied changes nothing
+        assert not state.update(date, close)
+    assert_matches_pandas(state, bars)
+
+
+def test_state_survives_a_round_trip_and_keeps_advancing():
+    bars = FakeProvider(sessions=300).bars("AAA")
+    state = IndicatorState()
+    for date, close in zip(bars.index[:250], bars["Close"][:250]):
+        state.update(date, close)
+    state = IndicatorState.from_dict(state.to_dict())
+    for date, close in zip(bars.index[250:], bars["Close"][250:]):
+        state.update(date, close)
+    assert_matches_pandas(state, bars)
+
+
+def test_from_history_matches_a_replay():
+    bars = FakeProvider(sessions=300).bars("AAA")
+    close = bars["Close"].to_numpy()[:, None]
+    line, signal = macd(close)
+    state = IndicatorState.from_history(
+        bars.index, close[:, 0], sma(close, 50)[:, 0], sma(close, 200)[:, 0],
+        {span: ema(close, span)[-1, 0] for span in IndicatorState.EMA_SPANS}, signal[-1, 0])
+    for date, close in zip(bars.index[-5:] + pd.offsets.BDay(5), bars["Close"][-5:]):
+        state.update(date, close)
+    bars = pd.concat([bars, bars[-5:].set_axis(bars.index[-5:] + pd.offsets.BDay(5))])
+    assert_matches_pandas(state, bars)
+
+
+def test_advance_states_applies_only_final_bars(tmp_path):
+    tickers = ["AAA", "BBB"]
+    path = str(tmp_path / "state.json")
+    cache = PriceCache(str(tmp_path / "prices.sqlite"))
+
+    # Seeded after the 2024-12-30 close
+    advance_states(tickers, path=path, cache=cache, provider=FakeProvider(sessions=400, end="2024-12-30"),
+                   now="2024-12-30 17:00")
+
+    # Another run caches the next session's partial bar, which is not applied
+    provider = LiveProvider(sessions=400, end="2024-12-31")
+    refresh_cache(tickers, cache=cache, provider=provider, today="2024-12-31 12:00")
+    states = advance_states(tickers, path=path, cache=cache, provider=provider, now="2024-12-31 12:00")
+    assert all(s.last_date == "2024-12-30" for s in states.values())
+
+    # After the close the final bar is fetched and applied
+    provider.live = 123.0
+    states = advance_states(tickers, path=path, cache=cache, provider=provider, now="2024-12-31 17:00")
+    assert all(s.last_close == 123.0 for s in states.values())
+
+    # The state equals pandas over the seeded period plus the new bar
+    saved = load_states(path)
+    for ticker in tickers:
+        bars = cache.load(ticker)
+        bars = bars[bars.index > pd.Timestamp("2023-12-30")]
+        assert_matches_pandas(saved[ticker], bars)
+
+
+def test_partial_bar_that_cannot_be_refetched_is_not_applied(tmp_path):
+    path = str(tmp_path / "state.json")
+    cache = PriceCache(str(tmp_path / "prices.sqlite"))
+    advance_states(["AAA"], path=path, cache=cache, provider=FakeProvider(sessions=400, end="2024-12-30"),
+                   now="2024-12-30 17:00")
+    refresh_cache(["AAA"], cache=cache, provider=LiveProvider(sessions=400, end="2024-12-31"),
+                  today="2024-12-31 12:00")
+
+    # The download after the close fails, so the cached bar is still partial
+    offline = FakeProvider(missing={"AAA"})
+    states = advance_states(["AAA"], path=path, cache=cache, provider=offline, now="2024-12-31 17:00")
+    assert states["AAA"].last_date == "2024-12-30"
@@ -0,0 +1,44 @@
+import numpy as np
+
+from screener.cache import PriceCache, refresh_cache
+from screener.fetch import FIELDS
+from screener.store import store_from_cache
+from tests.test_cache import LiveProvider
+
+TICKERS = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+
+
+def assert_same_store(store, expected):
+    assert store.tickers == expected.tickers
+    assert store.dates.equals(expected.dates)
+    for name in FIELDS:
+        np.testing.assert_array_equal(store.field(name), expected.field(name), err_msg=name)
+
+
+def test_store_updates_match_a_fresh_build(tmp_path, monkeypatch):
+    cache = PriceCache(str(tmp_path / "prices.sqlite"))
+    directory = str(tmp_path / "store")
+    steps = [
+        ("2024-12-20", "2024-12-20 18:00", 100.0, TICKERS[:4]),
+        # A session still trading, with a new ticker, then its final bar
+        ("2024-12-31", "2024-12-31 11:00", 123.0, TICKERS),
+        ("2024-12-31", "2024-12-31 17:00", 125.0, TICKERS),
+    ]
+    for i, (end, today, live, universe) in enumerate(steps):
+        provider = LiveProvider(sessions=300, end=end)
+        provider.live = live
+        refresh_cache(universe, cache=cache, provider=provider, today=today)
+        store = store_from_cache(cache, universe, directory)
+        assert store.field("Close")[-1, 0] == live
+        assert_same_store(store, store_from_cache(cache, universe, str(tmp_path / f"fresh{i}")))
+
+    # With nothing new, the store is updated in place from each ticker's
+    # newest stored bar on
+    starts = []
+    load = cache.load
+    monkeypatch.setattr(cache, "load", lambda ticker, interval="1d", start=None:
+                        starts.append(start) or load(ticker, interval, start))
+    store = store_from_cache(cache, TICKERS, directory)
+    assert starts == [store.dates[-1]] * len(TICKERS)
+    assert_same_store(store, store_from_cache(cache, TICKERS, str(tmp_path / "fresh")))
+    cache.close()
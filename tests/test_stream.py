@@ -0,0 +1,79 @@
+import asyncio
+import random
+import threading
+import time
+
+from screener.fetch import FakeProvider
+from screener.stream import check_stocks_async, stream_frames
+from screener.summary import summarize
+
+
+class CountingProvider(FakeProvider):
+    # FakeProvider that sleeps a random, per-ticker time so downloads finish
+    # out of order, and counts the downloads started so far
+
+    def __init__(self, max_delay=0.0, **options):
+        super().__init__(**options)
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.started = 0
+
+    def download(self, tickers, period="1y", interval="1d", start=None):
+        with self.lock:
+            self.started += 1
+        ticker = tickers if isinstance(tickers, str) else tickers[0]
+        time.sleep(random.Random(ticker).uniform(0, self.max_delay))
+        return super().download(tickers, period=period, interval=interval, start=start)
+
+
+def test_queue_bounds_downloads_ahead_of_the_consumer():
+    tickers = [f"T{i:03d}" for i in range(60)]
+    provider = CountingProvider(sessions=30)
+    concurrency, queue_size = 2, 3
+
+    async def consume():
+        seen = []
+        async for index, ticker, data in stream_frames(tickers, provider, concurrency=concurrency,
+                                                        queue_size=queue_size):
+            seen.append(index)
+            # A slow consumer: give the workers time to run ahead
+            await asyncio.sleep(0.01)
+            # Finished frames wait in the queue, plus one per worker blocked
+            # on put(); no worker starts another download meanwhile
+            assert provider.started <= len(seen) + queue_size + concurrency
+        return seen
+
+    seen = asyncio.run(consume())
+    assert sorted(seen) == list(range(len(tickers)))
+    assert provider.started == len(tickers)
+
+
+def test_stream_yields_every_ticker_with_its_index():
+    tickers = [f"T{i:03d}" for i in range(20)]
+    provider = CountingProvider(max_delay=0.02, sessions=30, missing={"T005"})
+
+    async def consume():
+        return [(index, ticker, data) async for index, ticker, data in
+                stream_frames(tickers, provider, concurrency=4, queue_size=2)]
+
+    items = asyncio.run(consume())
+    assert sorted(index for index, _, _ in items) == list(range(len(tickers)))
+    for index, ticker, data in items:
+        assert tickers[index] == ticker
+        assert data.empty == (ticker == "T005")
+
+
+def test_rows_follow_the_stocks_file_order(tmp_path):
+    tickers = [f"T{i:03d}" for i in range(16)]
+    stocks = tmp_path / "stocks.txt"
+    # Blank lines and stray whitespace are not tickers
+    stocks.write_text("\n".join(tickers[:8]) + "\n\n  " + "\n".join(f"{t} " for t in tickers[8:]) + "\n\n")
+    provider = CountingProvider(max_delay=0.03, sessions=260, missing={"T007"})
+
+    rows = asyncio.run(check_stocks_async(str(stocks), provider, concurrency=4, queue_size=2,
+                                          csv_file=None, excel_file=None))
+
+    expected = [t for t in tickers if t != "T007"]
+    assert [row[0] for row in rows] == expected
+    reference = FakeProvider(sessions=260)
+    assert rows == [summarize(t, reference.bars(t)) for t in expected]
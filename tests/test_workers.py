@@ -0,0 +1,120 @@
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+import pandas as pd
+
+from screener.fetch import FIELDS, YahooProvider
+from screener.workers import TokenBucket, call_with_timeout, run_concurrent
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    bucket = TokenBucket(rate=50.0, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+    for _ in range(10):
+        bucket.acquire()
+    # Ten more tokens at 50 a second
+    assert time.monotonic() - start >= 0.19
+
+
+def test_failed_calls_are_retried_with_backoff():
+    attempts = {}
+
+    def flaky(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if attempts[item] < 3:
+            raise ConnectionError("try again")
+        return item * 2
+
+    start = time.monotonic()
+    assert run_concurrent(flaky, [1, 2, 3], rate=1000.0, retries=3, backoff=0.02) == [2, 4, 6]
+    assert attempts == {1: 3, 2: 3, 3: 3}
+    # Waits of 0.02s and 0.04s before the second and third attempts
+    assert time.monotonic() - start >= 0.06
+
+
+def test_items_failing_every_attempt_give_none(capsys):
+    def broken(item):
+        raise ValueError(f"bad {item}")
+
+    assert run_concurrent(broken, ["a", "b"], rate=1000.0, retries=1, backoff=0.0) == [None, None]
+    assert "a failed after 2 attempts: bad a" in capsys.readouterr().out
+
+
+def test_hung_calls_time_out():
+    release = threading.Event()
+
+    def hang(item):
+        release.wait(5)
+        return item
+
+    start = time.monotonic()
+    assert run_concurrent(hang, [1, 2], rate=1000.0, retries=0, timeout=0.05) == [None, None]
+    assert time.monotonic() - start < 1
+    release.set()
+
+
+def test_results_keep_the_order_of_the_items():
+    def slow(item):
+        time.sleep(0.05 - item / 100)
+        return item
+
+    assert run_concurrent(slow, list(range(5)), workers=5, rate=1000.0) == list(range(5))
+
+
+def test_call_with_timeout_passes_errors_through():
+    def fail():
+        raise KeyError("missing")
+
+    try:
+        call_with_timeout(fail, (), 1)
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("KeyError not raised")
+
+
+def test_yahoo_single_symbols_use_ticker_history(monkeypatch):
+    # yf.download is not thread-safe: single symbols must go through
+    # yf.Ticker(...).history() and batches must not overlap
+    index = pd.date_range("2024-01-02", periods=5, freq="B", tz="America/New_York", name="Date")
+    calls = {"history": 0, "download": 0, "active": 0, "overlap": False}
+    lock = threading.Lock()
+
+    class Ticker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, interval="1d", auto_adjust=True, period=None, start=None):
+            calls["history"] += 1
+            assert not auto_adjust
+            columns = FIELDS + ["Dividends", "Stock Splits"]
+            return pd.DataFrame(np.ones((len(index), len(columns))), index=index, columns=columns)
+
+    def download(tickers, **options):
+        with lock:
+            calls["download"] += 1
+            calls["active"] += 1
+            calls["overlap"] |= calls["active"] > 1
+        time.sleep(0.02)
+        with lock:
+            calls["active"] -= 1
+        return pd.DataFrame()
+
+    monkeypatch.setitem(sys.modules, "yfinance", types.SimpleNamespace(Ticker=Ticker, download=download))
+    provider = YahooProvider()
+
+    data = provider.download("AAA")
+    assert list(data.columns) == FIELDS
+    assert data.index.tz is None
+    assert run_concurrent(lambda t: provider.download([t]), ["A", "B", "C"], rate=1000.0)[0] is not None
+    assert calls["history"] == 4 and calls["download"] == 0
+
+    run_concurrent(lambda t: provider.download([t, t + "2"]), ["A", "B", "C", "D"], rate=1000.0)
+    assert calls["download"] == 4
+    assert not calls["overlap"]